@@ -0,0 +1,347 @@
+"""
+Benchmarks the knowledge graph build stages, the functions in queries/queries.py and the
+data preparation done by each page, and writes the timings to a JSON file.
+
+Run from the repository root (or point --data-root at a folder with the same data/ layout,
+e.g. a synthetic data set):
+
+    python knowledge-graph-app/benchmarks/benchmark.py --output bench.json
+    python knowledge-graph-app/benchmarks/benchmark.py --skip build --compare bench.json
+    python knowledge-graph-app/benchmarks/benchmark.py --dry-run
+    python knowledge-graph-app/benchmarks/benchmark.py --skip build queries pages --clear-scales 1 10 100
+
+The clear group compares deleting the graph in batches with dropping and recreating the database.
+For each of --clear-scales it generates a synthetic data set with synthetic_data.py and loads its
+businesses, boroughs and population before each method; it runs last as it empties the database.
+
+With --dry-run no Neo4j server is needed: queries go to an in-process stand-in that returns
+no records, so only the client side (CSV parsing, geometry, pandas) is measured.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+from connect import Neo4jConnection, NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from core.builder import build_stages
+from core.schema_setup import create_constraints_and_indexes
+from core.data_importer import import_business_data, import_population_density_data, import_business_survival_rate_data
+from core.create_relationships import connect_businesses_to_boroughs, connect_neighbouring_boroughs
+from core.clearing import clear_database, CLEAR_METHODS
+from core.geography import load_borough_shapes
+from queries import queries
+from metrics.metrics import ratio_table
+from metrics.cohorts import survival_trend, cohort_curves
+from metrics.loaders import (
+    load_metrics, load_ratio_distributions, load_survival_cube,
+    _load_metrics, _load_ratio_distributions, _load_survival_cube
+)
+from visualizations.greater_london_map import compute_ratio_dataframe
+from visualizations.knowledge_graph import to_plain_rows
+from synthetic_data import generate
+
+
+GROUPS = ["build", "queries", "pages", "clear"]
+
+# Sample arguments for the query functions, chosen to exist in the shipped data
+SAMPLE_BOROUGH = "Merton"
+SAMPLE_BOROUGHS = ["Merton", "Wandsworth", "Sutton", "Croydon", "Lambeth"]
+SAMPLE_YEAR = 2020
+SAMPLE_BUSINESS_TYPE = "pub"
+SAMPLE_SEARCH = "costa"
+
+# Businesses relative to the real data in the graphs the clear group empties
+CLEAR_SCALES = [1.0]
+
+
+class NullConnection:
+    """In-process stand-in for Neo4jConnection that accepts every query and returns no records."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def query(self, query, parameters=None, db=None):
+        self.queries += 1
+        return [], None, []
+
+    def query_df(self, query, parameters=None, db=None):
+        self.queries += 1
+        return pd.DataFrame()
+
+    def close(self):
+        pass
+
+
+def query_cases():
+    """(name, function) pairs calling each function of queries/queries.py with sample arguments."""
+    return [
+        ("get_all_boroughs", lambda conn: queries.get_all_boroughs(conn)),
+        ("get_all_business_types", lambda conn: queries.get_all_business_types(conn)),
+        ("get_borough_and_neighbours", lambda conn: queries.get_borough_and_neighbours(conn, SAMPLE_BOROUGH)),
+        ("get_similar_boroughs", lambda conn: queries.get_similar_boroughs(conn, SAMPLE_BOROUGH)),
+        ("get_population_for_boroughs", lambda conn: queries.get_population_for_boroughs(conn, SAMPLE_BOROUGHS, SAMPLE_YEAR)),
+        ("get_business_count_for_boroughs", lambda conn: queries.get_business_count_for_boroughs(conn, SAMPLE_BOROUGHS, SAMPLE_BUSINESS_TYPE)),
+        ("get_business_count_for_all_boroughs", lambda conn: queries.get_business_count_for_all_boroughs(conn, SAMPLE_BUSINESS_TYPE)),
+        ("get_areas_in_borough", lambda conn: queries.get_areas_in_borough(conn, SAMPLE_BOROUGH)),
+        ("get_business_count_for_areas", lambda conn: queries.get_business_count_for_areas(
+            conn, queries.get_areas_in_borough(conn, SAMPLE_BOROUGH)["code"].tolist(), SAMPLE_BUSINESS_TYPE)),
+        ("get_saturated_businesses", lambda conn: queries.get_saturated_businesses(conn, SAMPLE_BUSINESS_TYPE)),
+        ("get_competition_radii", lambda conn: queries.get_competition_radii(conn)),
+        ("get_densest_streets", lambda conn: queries.get_densest_streets(conn, SAMPLE_BUSINESS_TYPE, SAMPLE_BOROUGH)),
+        ("get_area_neighbour_pairs", lambda conn: queries.get_area_neighbour_pairs(conn, "Ward")),
+        ("get_colocated_business_types", lambda conn: queries.get_colocated_business_types(conn, SAMPLE_BUSINESS_TYPE)),
+        ("get_network_metrics", lambda conn: queries.get_network_metrics(conn)),
+        ("search_businesses", lambda conn: queries.search_businesses(conn, SAMPLE_SEARCH)),
+        ("get_business_names", lambda conn: queries.get_business_names(conn)),
+        ("get_business_types", lambda conn: queries.get_business_types(conn)),
+        ("get_years", lambda conn: queries.get_years(conn)),
+        ("get_population_for_boroughs_in_range", lambda conn: queries.get_population_for_boroughs_in_range(conn, SAMPLE_BOROUGHS)),
+        ("get_growth_rates_for_boroughs", lambda conn: queries.get_growth_rates_for_boroughs(conn, SAMPLE_BOROUGHS, 2006, 2011, 2016)),
+        ("get_business_survival_rates_for_boroughs", lambda conn: queries.get_business_survival_rates_for_boroughs(conn, SAMPLE_BOROUGHS, SAMPLE_YEAR)),
+        ("get_survival_years", lambda conn: queries.get_survival_years(conn)),
+        ("get_graph_version", lambda conn: queries.get_graph_version(conn)),
+        ("get_population_table", lambda conn: queries.get_population_table(conn)),
+        ("get_business_count_table", lambda conn: queries.get_business_count_table(conn)),
+        ("get_neighbour_pairs", lambda conn: queries.get_neighbour_pairs(conn)),
+        ("get_distribution_grid", lambda conn: queries.get_distribution_grid(conn)),
+        ("get_ratio_distributions", lambda conn: queries.get_ratio_distributions(conn)),
+        ("get_survival_table", lambda conn: queries.get_survival_table(conn)),
+        ("get_borough_rank_profile", lambda conn: queries.get_borough_rank_profile(conn, SAMPLE_BOROUGH)),
+    ]
+
+
+def clear_page_caches():
+    """Empties the Streamlit data caches, so page timings are for a cold cache."""
+    _load_metrics.clear()
+    _load_ratio_distributions.clear()
+    _load_survival_cube.clear()
+
+
+def prepare_business_by_borough(conn):
+    """Data loaded by pages/business-by-borough.py before plotting."""
+    all_boroughs = queries.get_all_boroughs(conn)
+    neighbours = queries.get_borough_and_neighbours(conn, SAMPLE_BOROUGH)
+    _, metrics = load_metrics(conn)
+    queries.get_graph_version(conn)
+    ratio_table(metrics, SAMPLE_BUSINESS_TYPE, SAMPLE_YEAR, all_boroughs)
+    ratio_table(metrics, SAMPLE_BUSINESS_TYPE, SAMPLE_YEAR, neighbours)
+    queries.get_years(conn)
+    queries.get_all_business_types(conn)
+    queries.get_growth_rates_for_boroughs(conn, neighbours, 2006, 2011, 2016)
+    queries.get_business_survival_rates_for_boroughs(conn, neighbours, 2011)
+    queries.get_competition_radii(conn)
+    queries.get_saturated_businesses(conn, SAMPLE_BUSINESS_TYPE)
+    queries.get_similar_boroughs(conn, SAMPLE_BOROUGH)
+    queries.get_colocated_business_types(conn, SAMPLE_BUSINESS_TYPE)
+    queries.get_densest_streets(conn, SAMPLE_BUSINESS_TYPE, SAMPLE_BOROUGH)
+
+
+def prepare_metric_density(conn):
+    """Data loaded by pages/metric-density-over-boroughs.py before plotting."""
+    all_boroughs = queries.get_all_boroughs(conn)
+    queries.get_all_business_types(conn)
+    queries.get_years(conn)
+    queries.get_survival_years(conn)
+    _, metrics = load_metrics(conn)
+    queries.get_graph_version(conn)
+    load_ratio_distributions(conn)
+    ratio_table(metrics, SAMPLE_BUSINESS_TYPE, SAMPLE_YEAR)
+    queries.get_business_survival_rates_for_boroughs(conn, all_boroughs, SAMPLE_YEAR)
+    queries.get_borough_rank_profile(conn, SAMPLE_BOROUGH, metric_prefix="survival:", year=SAMPLE_YEAR)
+    cube = load_survival_cube(conn)
+    survival_trend(cube, SAMPLE_BOROUGH)
+    cohort_curves(cube, SAMPLE_BOROUGH)
+
+
+def prepare_geovisualization(conn):
+    """Data loaded by pages/geovisualization.py before drawing the map."""
+    queries.get_business_types(conn)
+    queries.get_years(conn)
+    compute_ratio_dataframe(conn, load_borough_shapes(), SAMPLE_BUSINESS_TYPE, SAMPLE_YEAR)
+
+
+def prepare_graph(conn):
+    """Data loaded by pages/graph.py for the relationships preset."""
+    records, _, _ = conn.query("MATCH (a)-[r]->(b) RETURN a AS source, type(r) AS relation, b AS target LIMIT 25")
+    to_plain_rows(records or [])
+
+
+def page_cases():
+    return [
+        ("business-by-borough", prepare_business_by_borough),
+        ("metric-density-over-boroughs", prepare_metric_density),
+        ("geovisualization", prepare_geovisualization),
+        ("graph", prepare_graph),
+    ]
+
+
+def time_call(fn, conn, repeat, setup=None):
+    """Runs fn(conn) `repeat` times and returns timing statistics, or the error if it fails."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        try:
+            fn(conn)
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+        times.append(time.perf_counter() - start)
+    return {
+        "runs": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+        "max": max(times),
+    }
+
+
+def run_benchmarks(conn, groups, repeat, test_boroughs, clear_scales=CLEAR_SCALES):
+    results = []
+
+    def record(group, name, stats):
+        results.append({"group": group, "name": name, **stats})
+        if "error" in stats:
+            print(f"{group:8} {name:45} ERROR {stats['error']}")
+        else:
+            print(f"{group:8} {name:45} {stats['median']:10.4f}s")
+
+    if "build" in groups:
+        # the stages depend on each other, so the build runs once, in order
+        for name, stage in build_stages():
+            record("build", name, time_call(lambda c: stage(c, test_boroughs), conn, 1))
+    if "queries" in groups:
+        for name, fn in query_cases():
+            record("queries", name, time_call(fn, conn, repeat))
+    if "pages" in groups:
+        for name, fn in page_cases():
+            record("pages", name, time_call(fn, conn, repeat, setup=clear_page_caches))
+    if "clear" in groups:
+        # runs last as it empties the graph; the graph is loaded again before each method is timed
+        for scale in clear_scales:
+            with tempfile.TemporaryDirectory(prefix=f"clear-{scale:g}x-") as data_root:
+                generate(os.getcwd(), data_root, scale=scale)
+                for method in CLEAR_METHODS:
+                    name = f"{method} ({scale:g}x)"
+                    try:
+                        size = load_clear_graph(conn, data_root)
+                    except Exception as e:
+                        record("clear", name, {"error": f"loading the graph failed: {type(e).__name__}: {e}"})
+                        continue
+                    record("clear", name, {**size, **time_call(lambda c: clear_database(c, method=method), conn, 1)})
+    return results
+
+
+def load_clear_graph(conn, data_root):
+    """
+    Loads the businesses, boroughs and population of a synthetic data set, which make up most of the
+    nodes and relationships of a full graph, so there is a graph of known size to clear.
+    Returns its number of nodes and relationships.
+    """
+    cwd = os.getcwd()
+    # all data paths in the build are relative to the data root
+    os.chdir(data_root)
+    try:
+        create_constraints_and_indexes(conn)
+        for stage in (
+            import_business_data, import_population_density_data, import_business_survival_rate_data,
+            connect_businesses_to_boroughs, connect_neighbouring_boroughs
+        ):
+            stage(conn, [])
+    finally:
+        os.chdir(cwd)
+    records, _, _ = conn.query(
+        "CALL { MATCH (n) RETURN count(n) AS nodes } CALL { MATCH ()-[r]->() RETURN count(r) AS relationships } RETURN nodes, relationships"
+    )
+    return {"nodes": records[0]["nodes"], "relationships": records[0]["relationships"]} if records else {}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results, baseline_path):
+    """Prints the median time of each benchmark relative to a previous results file."""
+    with open(baseline_path) as f:
+        baseline = {(r["group"], r["name"]): r for r in json.load(f)["results"]}
+    print(f"\nCompared to {baseline_path}:")
+    for r in results:
+        old = baseline.get((r["group"], r["name"]))
+        if old is None or "median" not in old or "median" not in r:
+            continue
+        change = (r["median"] - old["median"]) / old["median"] * 100 if old["median"] else 0.0
+        print(f"{r['group']:8} {r['name']:45} {old['median']:10.4f}s -> {r['median']:10.4f}s ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the knowledge graph build, queries and pages.")
+    parser.add_argument("--data-root", default=".", help="folder containing data/raw and data/processed")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query and page benchmark")
+    parser.add_argument("--skip", nargs="*", default=[], choices=GROUPS, help="benchmark groups to skip")
+    parser.add_argument("--test-boroughs", nargs="*", default=[], help="limit the build to these boroughs")
+    parser.add_argument("--dry-run", action="store_true", help="use an in-process stand-in instead of Neo4j")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    parser.add_argument(
+        "--clear-scales", nargs="+", type=float, default=CLEAR_SCALES,
+        help="sizes of the synthetic graphs the clear group empties, as businesses relative to the real data"
+    )
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    baseline = os.path.abspath(args.compare) if args.compare else None
+    # all data paths in the app are relative to the repository root
+    os.chdir(args.data_root)
+
+    conn = NullConnection() if args.dry_run else Neo4jConnection(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
+    groups = [g for g in GROUPS if g not in args.skip]
+    if args.dry_run and "clear" in groups:
+        # there is no graph to clear without a server
+        groups.remove("clear")
+    try:
+        results = run_benchmarks(conn, groups, args.repeat, args.test_boroughs, args.clear_scales)
+    finally:
+        conn.close()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "data_root": os.getcwd(),
+            "dry_run": args.dry_run,
+            "repeat": args.repeat,
+            "test_boroughs": args.test_boroughs,
+            "clear_scales": args.clear_scales,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if baseline:
+        compare(results, baseline)
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
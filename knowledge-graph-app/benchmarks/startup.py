@@ -0,0 +1,112 @@
+"""
+Measures the cold-start cost of the Streamlit app: for app.py and every page, the time and memory
+it takes a fresh Python process to run the script's top-level imports.
+
+    python knowledge-graph-app/benchmarks/startup.py --output startup.json
+    python knowledge-graph-app/benchmarks/startup.py --compare startup.json
+
+Each page is measured in its own interpreter, so results do not depend on what earlier pages loaded.
+The 'streamlit' row is the floor every page pays.
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Runs in a fresh interpreter: executes the given imports and reports time, RSS and module count
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import psutil
+sys.path.insert(0, {src!r})
+process = psutil.Process()
+modules_before, rss_before = len(sys.modules), process.memory_info().rss
+start = time.perf_counter()
+exec(compile({code!r}, {name!r}, "exec"), {{}})
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": process.memory_info().rss / 2 ** 20,
+    "rss_added_mb": (process.memory_info().rss - rss_before) / 2 ** 20,
+    "modules": len(sys.modules) - modules_before,
+}}))
+"""
+
+
+def top_level_imports(path):
+    """Source of the import statements at the top level of a script, in order."""
+    with open(path) as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return "\n".join(
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def page_scripts():
+    pages = sorted(glob.glob(os.path.join(SRC_DIR, "pages", "*.py")))
+    return [os.path.join(SRC_DIR, "app.py"), *[p for p in pages if not p.endswith("__init__.py")]]
+
+
+def measure(name, code, repeat):
+    runs = []
+    for _ in range(repeat):
+        probe = PROBE.format(src=SRC_DIR, code=code, name=name)
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=SRC_DIR)
+        if out.returncode != 0:
+            return {"name": name, "error": out.stderr.strip().splitlines()[-1]}
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "name": name,
+        "runs": repeat,
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "rss_mb": statistics.median(r["rss_mb"] for r in runs),
+        "rss_added_mb": statistics.median(r["rss_added_mb"] for r in runs),
+        "modules": runs[0]["modules"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time and memory of the app and each page.")
+    parser.add_argument("--output", default="startup_results.json")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    cases = [("streamlit", "import streamlit")]
+    cases += [(os.path.relpath(p, SRC_DIR), top_level_imports(p)) for p in page_scripts()]
+
+    results = []
+    for name, code in cases:
+        result = measure(name, code, args.repeat)
+        results.append(result)
+        if "error" in result:
+            print(f"{name:40} ERROR {result['error']}")
+        else:
+            print(f"{name:40} {result['seconds']:7.3f}s {result['rss_mb']:8.1f} MB {result['modules']:6d} modules")
+
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {r["name"]: r for r in json.load(f)["results"]}
+        print(f"\nCompared to {args.compare}:")
+        for r in results:
+            old = baseline.get(r["name"])
+            if old and "seconds" in old and "seconds" in r:
+                print(f"{r['name']:40} {old['seconds']:7.3f}s -> {r['seconds']:7.3f}s  "
+                      f"{old['rss_mb']:8.1f} -> {r['rss_mb']:8.1f} MB")
+    return 1 if any("error" in r for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Generates a synthetic, larger version of the input data of the knowledge graph build for load testing.
+
+The output folder has the same data/ layout as the repository, so it can be passed as --data-root
+to the benchmark (or used as working directory for a build):
+
+    python knowledge-graph-app/benchmarks/synthetic_data.py --scale 100 --tiles 10 --output synthetic-100x
+    python knowledge-graph-app/benchmarks/benchmark.py --data-root synthetic-100x --dry-run
+
+- More areas: the boundary layers are copied `--tiles` times, each copy shifted next to the previous
+  one, with suffixed names and codes ("Merton (1)", "E09000024-1"). The copies are not neighbours
+  of each other, while neighbour and containment relations within a copy are kept.
+- More businesses: every copy receives `scale / tiles` times the original number of businesses,
+  resampled from the real ones (so the mix of business types per borough is preserved) and
+  jittered around the original position.
+- More years: `--extra-years` years are added before the first year of the population and survival
+  data, extrapolated with each borough's own early growth and a little noise.
+
+The output is fully determined by the input data and --seed.
+"""
+import argparse
+import math
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+BOUNDARY_DIR = os.path.join("data", "raw", "gis-boundaries-london", "ESRI")
+PROCESSED_DIR = os.path.join("data", "processed")
+BRITISH_NATIONAL_GRID = "EPSG:27700"
+AGGREGATE_BOROUGHS = ["Inner London", "Outer London", "Greater London"]
+
+# Shapefiles to copy with the columns holding area names and area codes
+BOUNDARY_FILES = {
+    "London_Borough_Excluding_MHW": {"names": ["NAME"], "codes": ["GSS_CODE"]},
+    "London_Ward_CityMerged": {"names": ["NAME", "BOROUGH"], "codes": ["GSS_CODE", "LB_GSS_CD"]},
+    "LSOA_2011_London_gen_MHW": {
+        "names": ["LSOA11NM", "MSOA11NM", "LAD11NM"],
+        "codes": ["LSOA11CD", "MSOA11CD", "LAD11CD"],
+    },
+}
+BOROUGH_FILE = "London_Borough_Excluding_MHW"
+
+# Space between copies of the city, in metres
+TILE_GAP = 5000.0
+# Standard deviation of the displacement of resampled businesses, in metres
+JITTER = 30.0
+
+
+def tile_name(name, tile):
+    """Name of an area in a copy of the city; the first copy keeps the real names."""
+    if tile == 0 or not isinstance(name, str) or name in AGGREGATE_BOROUGHS:
+        return name
+    return f"{name} ({tile})"
+
+
+def tile_code(code, tile):
+    if tile == 0 or not isinstance(code, str):
+        return code
+    return f"{code}-{tile}"
+
+
+def tile_offsets(bounds, tiles):
+    """(dx, dy) shift of every copy, laid out on a square grid next to the original."""
+    width = bounds[2] - bounds[0] + TILE_GAP
+    height = bounds[3] - bounds[1] + TILE_GAP
+    columns = math.ceil(math.sqrt(tiles))
+    return [((t % columns) * width, (t // columns) * height) for t in range(tiles)]
+
+
+def tile_boundaries(source_root, output_root, tiles):
+    """Writes the tiled copies of all boundary layers and returns the grid offsets."""
+    offsets = None
+    for file_name, columns in BOUNDARY_FILES.items():
+        gdf = gpd.read_file(os.path.join(source_root, BOUNDARY_DIR, f"{file_name}.shp")).to_crs(BRITISH_NATIONAL_GRID)
+        if offsets is None:
+            offsets = tile_offsets(gdf.total_bounds, tiles)
+        copies = []
+        for t, (dx, dy) in enumerate(offsets):
+            copy = gdf.copy()
+            copy["geometry"] = copy.geometry.translate(dx, dy)
+            for col in columns["names"]:
+                copy[col] = copy[col].map(lambda v: tile_name(v, t))
+            for col in columns["codes"]:
+                copy[col] = copy[col].map(lambda v: tile_code(v, t))
+            copies.append(copy)
+        tiled = gpd.GeoDataFrame(pd.concat(copies, ignore_index=True), crs=gdf.crs)
+        tiled.to_file(os.path.join(output_root, BOUNDARY_DIR, f"{file_name}.shp"))
+        print(f"{file_name}: {len(tiled)} areas")
+    return offsets
+
+
+def load_source_businesses(source_root):
+    """
+    Reads the real businesses with their borough. When businesses_with_boroughs.csv has not been
+    generated by the preprocessing notebook yet, the borough is added here with the same spatial join.
+    """
+    path = os.path.join(source_root, PROCESSED_DIR, "businesses_with_boroughs.csv")
+    if os.path.exists(path):
+        return pd.read_csv(path).dropna(subset=["area"])
+
+    df = pd.read_csv(os.path.join(source_root, PROCESSED_DIR, "businesses_with_streets.csv"))
+    points = gpd.GeoDataFrame(df, geometry=gpd.GeoSeries.from_wkt(df["geometry"]), crs="EPSG:4326")
+    boroughs = gpd.read_file(os.path.join(source_root, BOUNDARY_DIR, f"{BOROUGH_FILE}.shp")).to_crs("EPSG:4326")
+    boroughs = boroughs.rename(columns={"NAME": "area"})
+    joined = gpd.sjoin(points, boroughs[["geometry", "area"]], how="left", predicate="intersects")
+    joined = joined[~joined.index.duplicated(keep="first")].rename(columns={"index_right": "index_borough"})
+    joined = joined.dropna(subset=["area"])
+    result = pd.DataFrame(joined[[*df.columns.drop("geometry"), "index_borough", "area"]])
+    result.insert(df.columns.get_loc("geometry"), "geometry", joined.geometry.to_wkt().values)
+    result["index_borough"] = result["index_borough"].astype(int)
+    result["name_business"] = result["name_business"].fillna("unknown")
+    return result
+
+
+def generate_businesses(source, offsets, per_tile_factor, n_boroughs, rng, output_path):
+    """
+    Writes per_tile_factor times the source businesses for every copy of the city, one copy at a time
+    so memory use does not grow with the number of copies. Returns the number of rows written.
+    """
+    source = source.reset_index(drop=True)
+    points = gpd.GeoSeries.from_wkt(source["geometry"], crs="EPSG:4326").to_crs(BRITISH_NATIONAL_GRID)
+    x, y = points.x.to_numpy(), points.y.to_numpy()
+    n_per_tile = int(round(len(source) * per_tile_factor))
+
+    written = 0
+    for t, (dx, dy) in enumerate(offsets):
+        idx = rng.integers(0, len(source), n_per_tile)
+        jitter = rng.normal(0.0, JITTER, (2, n_per_tile)) if per_tile_factor != 1 or t > 0 else np.zeros((2, n_per_tile))
+        geometry = gpd.GeoSeries(
+            gpd.points_from_xy(x[idx] + dx + jitter[0], y[idx] + dy + jitter[1]), crs=BRITISH_NATIONAL_GRID
+        ).to_crs("EPSG:4326")
+
+        chunk = source.iloc[idx].reset_index(drop=True)
+        chunk["osm_id"] = np.arange(written, written + n_per_tile) + 1
+        chunk["geometry"] = geometry.to_wkt().values
+        chunk["area"] = chunk["area"].map(lambda v: tile_name(v, t))
+        chunk["index_borough"] = chunk["index_borough"] + t * n_boroughs
+        chunk.to_csv(output_path, mode="w" if t == 0 else "a", header=t == 0, index=False)
+        written += n_per_tile
+    return written
+
+
+def extend_population(df, extra_years, rng):
+    """Adds extra_years years before the first year, shrinking each borough with its early growth rate."""
+    if extra_years <= 0:
+        return df
+    first_year = df["Year"].min()
+    rows = []
+    for name, group in df.sort_values("Year").groupby("Name"):
+        early = group.head(6)["Population"].to_numpy(dtype=float)
+        growth = (early[-1] / early[0]) ** (1 / (len(early) - 1)) - 1 if len(early) > 1 and early[0] > 0 else 0.0
+        first = group.iloc[0]
+        population = float(first["Population"])
+        for year in range(first_year - 1, first_year - extra_years - 1, -1):
+            population = population / (1 + growth) * rng.normal(1.0, 0.002)
+            rows.append({
+                "Name": name,
+                "Year": year,
+                "Source": "Synthetic",
+                "Population": int(round(population)),
+                "Square_Kilometres": first["Square_Kilometres"],
+                "Population_per_square_kilometre": round(population / first["Square_Kilometres"], 1),
+            })
+    return pd.concat([pd.DataFrame(rows), df], ignore_index=True).sort_values(["Name", "Year"], kind="stable")
+
+
+def extend_survival(df, extra_years, rng):
+    """Adds extra_years cohorts before the first one, resampled from the first cohort with noise."""
+    if extra_years <= 0:
+        return df
+    rate_columns = [c for c in df.columns if c.endswith("_survival_rate")]
+    first_year = df["year"].min()
+    first = df[df["year"] == first_year]
+    rows = []
+    for year in range(first_year - 1, first_year - extra_years - 1, -1):
+        cohort = first.copy()
+        cohort["year"] = year
+        cohort["births"] = (cohort["births"] * rng.normal(1.0, 0.05, len(cohort))).round().astype(int)
+        rates = cohort[rate_columns].to_numpy() + rng.normal(0.0, 1.0, (len(cohort), len(rate_columns)))
+        # survival can only go down with the age of the cohort
+        rates = np.clip(np.fmin.accumulate(rates, axis=1), 0, 100).round(1)
+        cohort[rate_columns] = np.where(cohort[rate_columns].isna(), np.nan, rates)
+        rows.append(cohort)
+    return pd.concat([*rows, df], ignore_index=True)
+
+
+def tile_borough_table(df, column, tiles, rng, noise_columns=()):
+    """Copies the rows of every real borough for each copy of the city, aggregates are kept once."""
+    copies = [df]
+    boroughs = df[~df[column].isin(AGGREGATE_BOROUGHS)]
+    for t in range(1, tiles):
+        copy = boroughs.copy()
+        copy[column] = copy[column].map(lambda v: tile_name(v, t))
+        for col in noise_columns:
+            values = copy[col] * rng.normal(1.0, 0.02, len(copy))
+            copy[col] = values.round().astype(copy[col].dtype) if copy[col].dtype.kind == "i" else values.round(1)
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def generate(source_root, output_root, scale=10.0, tiles=1, extra_years=0, seed=0):
+    """Writes a complete synthetic data folder. Returns the number of rows per generated file."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.join(output_root, BOUNDARY_DIR), exist_ok=True)
+    os.makedirs(os.path.join(output_root, PROCESSED_DIR), exist_ok=True)
+
+    def processed(root, name):
+        return os.path.join(root, PROCESSED_DIR, name)
+
+    offsets = tile_boundaries(source_root, output_root, tiles)
+    n_boroughs = len(gpd.read_file(os.path.join(source_root, BOUNDARY_DIR, f"{BOROUGH_FILE}.shp")))
+
+    sizes = {}
+    sizes["businesses_with_boroughs.csv"] = generate_businesses(
+        load_source_businesses(source_root), offsets, scale / tiles, n_boroughs, rng,
+        processed(output_root, "businesses_with_boroughs.csv")
+    )
+
+    population = pd.read_csv(processed(source_root, "housing_density_borough.csv"))
+    population = extend_population(population, extra_years, rng)
+    population = tile_borough_table(population, "Name", tiles, rng, noise_columns=["Population"])
+    population.to_csv(processed(output_root, "housing_density_borough.csv"), index=False)
+    sizes["housing_density_borough.csv"] = len(population)
+
+    survival = pd.read_csv(processed(source_root, "boroughs_business_survival_rate.csv"))
+    survival = extend_survival(survival, extra_years, rng)
+    survival = tile_borough_table(survival, "area", tiles, rng, noise_columns=["births"])
+    survival.to_csv(processed(output_root, "boroughs_business_survival_rate.csv"), index=False)
+    sizes["boroughs_business_survival_rate.csv"] = len(survival)
+
+    neighbours = pd.read_csv(processed(source_root, "neighbouring_boroughs.csv"))
+    neighbours = pd.concat([
+        neighbours.apply(lambda col: col.map(lambda v: tile_name(v, t))) for t in range(tiles)
+    ], ignore_index=True)
+    neighbours.to_csv(processed(output_root, "neighbouring_boroughs.csv"), index=False)
+    sizes["neighbouring_boroughs.csv"] = len(neighbours)
+
+    containment = pd.read_csv(processed(source_root, "boroughs_containment.csv"))
+    containment = tile_borough_table(containment, "borough", tiles, rng)
+    containment.to_csv(processed(output_root, "boroughs_containment.csv"), index=False)
+    sizes["boroughs_containment.csv"] = len(containment)
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate scaled synthetic input data for load testing.")
+    parser.add_argument("--output", required=True, help="folder to write the synthetic data/ tree to")
+    parser.add_argument("--source", default=".", help="repository root holding the real data/ folder")
+    parser.add_argument("--scale", type=float, default=10.0, help="total number of businesses relative to the real data")
+    parser.add_argument("--tiles", type=int, default=1, help="number of copies of the boundary layers")
+    parser.add_argument("--extra-years", type=int, default=0, help="years added before the first year of data")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sizes = generate(args.source, args.output, args.scale, args.tiles, args.extra_years, args.seed)
+    for name, rows in sizes.items():
+        print(f"{name}: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
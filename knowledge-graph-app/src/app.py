@@ -1,6 +1,6 @@
 import streamlit as st
 from connect import get_connection
-from core.builder import build_knowledge_graph
+from core.telemetry import load_build_report
 
 
 if "conn" not in st.session_state:
@@ -8,47 +8,74 @@ if "conn" not in st.session_state:
 conn = st.session_state.conn
 st.title("Bank Loan-Officer's Knowledge Graph - London Boroughs")
 
+resume_build = st.sidebar.checkbox("Resume last failed build", help="Continue at the first stage that did not complete.")
+blue_green = st.sidebar.checkbox("Build into staging database", help="Keep serving the current graph until the new one is built and validated (Neo4j Enterprise).")
 if st.sidebar.button("Build Knowledge Graph"):
     try:
         test_boroughs = []
         st.info("Building knowledge graph, this may take a while...")
-        build_knowledge_graph(conn, test_boroughs)
-        st.success("Knowledge graph build completed successfully!")
+        # the build pulls in geopandas and shapely, so it is only imported when a build is started
+        from core.builder import build_knowledge_graph
+        from core.deployment import build_blue_green
+
+        build = build_blue_green if blue_green else build_knowledge_graph
+        report = build(conn, test_boroughs, resume=resume_build, progress=st.info)
+        st.success(f"Knowledge graph build completed successfully in {report['totals']['seconds']:.1f}s!")
     except Exception as e:
         st.error(f"An error occurred during graph build: {e}")
 
+build_report = load_build_report()
+if build_report:
+    with st.expander(f"Last build report ({build_report['finished_at'][:19].replace('T', ' ')} UTC)"):
+        totals = build_report["totals"]
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Build time", f"{totals['seconds']:.1f}s")
+        col2.metric("Nodes created", f"{totals['nodes_created']:,}")
+        col3.metric("Relationships created", f"{totals['relationships_created']:,}")
+        col4.metric("Peak client memory", f"{totals['peak_rss_mb']} MB")
+        if not build_report["succeeded"]:
+            st.warning("The last build failed, the report covers the stages up to the failure.")
+        import pandas as pd
+        st.dataframe(pd.DataFrame(build_report["stages"]).set_index("stage"))
+
 st.sidebar.markdown("---")
 
+st.subheader("Find a Business")
+search_text = st.text_input("Business name", placeholder="e.g. Pret A Manger")
+if search_text.strip():
+    from queries.queries import search_businesses
+    from queries.search import load_name_index
+    # names starting with the text come from the in-memory index, so they show up while typing
+    suggestions = load_name_index(conn).search(search_text, limit=8)
+    if suggestions:
+        st.caption("Names starting with it: " + ", ".join(dict.fromkeys(name for name, _ in suggestions)))
+    results = search_businesses(conn, search_text)
+    if not results.empty:
+        st.dataframe(results, use_container_width=True, hide_index=True)
+    else:
+        st.info("No business matches that name.")
+
+# Each preset projects only the properties shown in its table
 preset_queries = {
-    "Boroughs": "MATCH (b:Borough) RETURN b LIMIT 25",
-    "Businesses": "MATCH (b:Business) RETURN b LIMIT 25",
-    "Relationships": "MATCH (a)-[r]->(b)  RETURN a AS source, type(r) AS relation, b AS target  LIMIT 25"
+    "Boroughs": ("MATCH (b:Borough) WITH b.name AS name, b.business_count AS business_count LIMIT 25",
+                 {"name": "object", "business_count": "float64"}),
+    "Businesses": ("MATCH (b:Business) WITH b.name AS name, b.osmId AS osmId LIMIT 25",
+                   {"name": "object", "osmId": "object"}),
+    "Borough network": ("MATCH (b:Borough) WHERE b.community IS NOT NULL "
+                        "WITH b.name AS name, b.community AS community, b.degree AS neighbours, "
+                        "b.betweenness AS betweenness, b.eigenvector AS eigenvector ORDER BY community, name",
+                        {"name": "object", "community": "int64", "neighbours": "int64", "betweenness": "float64", "eigenvector": "float64"}),
+    "Relationships": ("MATCH (a)-[r]->(b) WITH a.name AS source, type(r) AS relation, b.name AS target LIMIT 25",
+                      {"source": "object", "relation": "object", "target": "object"})
 }
 selection = st.sidebar.selectbox("Choose a table", list(preset_queries.keys()))
 
 if st.sidebar.button("Show"):
-    query = preset_queries[selection]
-    records, summary, keys = conn.query(query)
+    from queries.queries import query_frame
+    query, columns = preset_queries[selection]
+    df = query_frame(conn, query, columns)
 
-    if records:
-        import pandas as pd
-        data = [record.data() for record in records]
-        flattened_data = []
-        first_row = data[0] if data else {}
-
-        if "source" in first_row and "target" in first_row and "relation" in first_row:
-            for row in data:
-                flat_row = {
-                    "source": row["source"].get("name"),
-                    "relation": row.get("relation"),
-                    "target": row["target"].get("name")
-                }
-                flattened_data.append(flat_row)
-        else:
-            for row in data:
-                for key, entity in row.items():
-                    flattened_data.append(entity)
-        df = pd.DataFrame(flattened_data)
+    if not df.empty:
         df = df.fillna("N/A")
         st.dataframe(df)
     else:
@@ -0,0 +1,108 @@
+"""
+Builds the knowledge graph without the Streamlit app, e.g. from a scheduled batch job.
+Run from the repository root, or pass --data-dir pointing to a folder with the same data/ layout:
+
+    python knowledge-graph-app/src/build_graph.py --log-file build.log
+    python knowledge-graph-app/src/build_graph.py --test-boroughs Merton Sutton --batch-size 5000
+    python knowledge-graph-app/src/build_graph.py --resume
+    python knowledge-graph-app/src/build_graph.py --blue-green
+    python knowledge-graph-app/src/build_graph.py --rollback
+
+The connection defaults to NEO4J_URI, NEO4J_USER and NEO4J_PASSWORD from the environment (.env).
+Exit codes: 0 when the build succeeded, 1 when a build stage failed, 2 for invalid arguments,
+3 when Neo4j cannot be reached.
+"""
+import argparse
+import logging
+import os
+import sys
+
+from connect import Neo4jConnection, NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from core.batching import WRITE_BATCH_SIZE, set_batch_size
+from core.builder import build_knowledge_graph
+from core.competition import COMPETITION_RADII, set_competition_radii
+from core.deployment import build_blue_green, rollback
+from core.telemetry import BUILD_REPORT_PATH
+
+
+EXIT_OK = 0
+EXIT_BUILD_FAILED = 1
+EXIT_CONNECTION_FAILED = 3
+
+logger = logging.getLogger("knowledge_graph.build")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the London boroughs knowledge graph in Neo4j.")
+    parser.add_argument("--data-dir", default=".", help="folder containing data/raw and data/processed")
+    parser.add_argument("--test-boroughs", nargs="*", default=[], help="only import these boroughs")
+    parser.add_argument("--resume", action="store_true", help="continue the last failed build at its first incomplete stage")
+    parser.add_argument("--blue-green", action="store_true", help="build into the staging database and switch the live alias when it validates")
+    parser.add_argument("--rollback", action="store_true", help="switch the live alias back to the previous database and exit")
+    parser.add_argument("--batch-size", type=int, default=WRITE_BATCH_SIZE, help="rows sent per UNWIND query")
+    parser.add_argument("--radii", type=int, nargs="+", default=COMPETITION_RADII, help="metres within which competitors of every business are counted")
+    parser.add_argument("--report", default=BUILD_REPORT_PATH, help="where to write the build report, relative to --data-dir")
+    parser.add_argument("--uri", default=NEO4J_URI)
+    parser.add_argument("--user", default=NEO4J_USER)
+    parser.add_argument("--password", default=NEO4J_PASSWORD)
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    parser.add_argument("--log-file", help="also write the log to this file")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
+    if min(args.radii) < 1:
+        parser.error("--radii must be at least 1")
+    return args
+
+
+def configure_logging(level, log_file=None):
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=level,
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        handlers=handlers
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    log_file = os.path.abspath(args.log_file) if args.log_file else None
+    configure_logging(args.log_level, log_file)
+    set_batch_size(args.batch_size)
+    set_competition_radii(args.radii)
+    # all data paths of the build are relative to the repository root
+    os.chdir(args.data_dir)
+
+    conn = Neo4jConnection(args.uri, args.user, args.password)
+    result = conn.query("RETURN 1")
+    if result is None or result[0] is None:
+        logger.error(f"Cannot connect to Neo4j at {args.uri}.")
+        return EXIT_CONNECTION_FAILED
+
+    if args.rollback:
+        try:
+            logger.info(f"Rolled back to database '{rollback(conn)}'.")
+            return EXIT_OK
+        except Exception:
+            logger.exception("Rollback failed.")
+            return EXIT_BUILD_FAILED
+        finally:
+            conn.close()
+
+    build = build_blue_green if args.blue_green else build_knowledge_graph
+    try:
+        report = build(conn, args.test_boroughs, report_path=args.report, resume=args.resume)
+    except Exception:
+        logger.exception(f"Build failed, see {args.report} for the completed stages. Run again with --resume to continue.")
+        return EXIT_BUILD_FAILED
+    finally:
+        conn.close()
+
+    logger.info(f"Build completed in {report['totals']['seconds']:.1f}s, report written to {args.report}.")
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, Query, Result, RoutingControl
 import os
+import time
 from dotenv import load_dotenv
-import streamlit as st
 
 # Load environment variables from .env file
 load_dotenv()
@@ -9,6 +9,13 @@ load_dotenv()
 NEO4J_URI = os.getenv("NEO4J_URI")
 NEO4J_USER = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+# Alias that blue/green builds point at the live graph (see core/deployment.py)
+LIVE_ALIAS = "kg"
+# Database (or alias) that queries use unless they name one. When unset, queries use LIVE_ALIAS
+# once a blue/green build has created it, and the server's default database before that.
+NEO4J_DATABASE = os.getenv("NEO4J_DATABASE")
+# Seconds between checks whether LIVE_ALIAS exists yet, for connections opened before the first blue/green build
+ALIAS_CHECK_SECONDS = 30
 
 class Neo4jConnection:
     def __init__(self, uri, user, password):
@@ -16,6 +23,8 @@ class Neo4jConnection:
         self.__user = user
         self.__password = password
         self.__driver = None
+        self.database = NEO4J_DATABASE
+        self.__alias_checked_at = None
 
         try:
             self.__driver = GraphDatabase.driver(self.__uri, auth=(self.__user, self.__password))
@@ -23,6 +32,37 @@ class Neo4jConnection:
         except Exception as e:
             print(f"Failed to create the driver: {e}")
 
+    def alias_exists(self, alias):
+        """Aliases need Enterprise Edition, so this is False on Community Edition."""
+        try:
+            records, _, _ = self.__driver.execute_query(
+                "SHOW ALIASES FOR DATABASE YIELD name WHERE name = $alias RETURN name",
+                {"alias": alias}, database_="system"
+            )
+            return bool(records)
+        except Exception:
+            return False
+
+    def current_database(self):
+        """
+        Database that queries without a db use: NEO4J_DATABASE or the one set by use_database, otherwise
+        LIVE_ALIAS once it exists. A missing alias is looked up again after ALIAS_CHECK_SECONDS, so a connection
+        kept open in a session starts reading the live graph after the first blue/green build of any session.
+        None means the server's default database.
+        """
+        if self.database is None and self.__driver is not None:
+            now = time.monotonic()
+            if self.__alias_checked_at is None or now - self.__alias_checked_at > ALIAS_CHECK_SECONDS:
+                self.__alias_checked_at = now
+                if self.alias_exists(LIVE_ALIAS):
+                    # aliases are switched, never dropped, so it does not have to be checked again
+                    self.database = LIVE_ALIAS
+        return self.database
+
+    def use_database(self, database):
+        """Sends the queries that do not name a database to database from now on."""
+        self.database = database
+
     def close(self):
         if self.__driver is not None:
             self.__driver.close()
@@ -35,15 +75,45 @@ class Neo4jConnection:
 
         try:
             records, summary, keys = self.__driver.execute_query(
-                query, parameters, database_=db if db else "neo4j"
+                query, parameters, database_=db if db else self.current_database()
             )
             return records, summary, keys
         except Exception as e:
             print(f"Query failed: {e}")
             return None, None, None
 
+    def query_df(self, query, parameters=None, db=None):
+        """Runs a query and returns its records as a DataFrame built by the driver, or None when it fails."""
+        if self.__driver is None:
+            print("Driver not initialized.")
+            return None
+
+        try:
+            return self.__driver.execute_query(
+                query, parameters, database_=db if db else self.current_database(),
+                result_transformer_=Result.to_df
+            )
+        except Exception as e:
+            print(f"Query failed: {e}")
+            return None
+
+    def read_query(self, query, parameters=None, db=None, timeout=None):
+        """
+        Runs a query in a read transaction, which the server refuses to write in, cancelled
+        after timeout seconds. Unlike query(), errors are raised so callers can report them.
+        """
+        if self.__driver is None:
+            raise RuntimeError("Driver not initialized.")
+        return self.__driver.execute_query(
+            Query(query, timeout=timeout), parameters,
+            routing_=RoutingControl.READ, database_=db if db else self.current_database()
+        )
+
 
 def get_connection():
+    # imported here so the headless build does not need Streamlit
+    import streamlit as st
+
     try:
         conn = Neo4jConnection(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD)
         st.success("Successfully connected to Neo4j!")
@@ -0,0 +1,32 @@
+from .checkpoints import get_active_checkpoint
+
+
+# Rows sent per UNWIND $rows query, so large imports do not have to fit in a single transaction
+WRITE_BATCH_SIZE = 10_000
+
+
+def set_batch_size(batch_size):
+    global WRITE_BATCH_SIZE
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least 1.")
+    WRITE_BATCH_SIZE = batch_size
+
+
+def write_in_batches(conn, query, rows, batch_size=None):
+    """
+    Runs an UNWIND $rows query over consecutive slices of rows.
+    Each batch is committed on its own; during a build, completed batches are checkpointed so a
+    resumed build continues after the last one. Raises when a batch fails, so the stage is not
+    recorded as complete.
+    """
+    batch_size = batch_size or WRITE_BATCH_SIZE
+    checkpoint = get_active_checkpoint()
+    key = checkpoint.next_batch_call() if checkpoint else None
+    first = checkpoint.completed_rows(key) if checkpoint else 0
+    for start in range(first, len(rows), batch_size):
+        end = min(start + batch_size, len(rows))
+        result = conn.query(query, parameters={"rows": rows[start:end]})
+        if result is None or result[0] is None:
+            raise RuntimeError(f"Writing rows {start} to {end} of {len(rows)} failed.")
+        if checkpoint:
+            checkpoint.batch_done(key, end)
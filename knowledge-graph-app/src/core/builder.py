@@ -1,53 +1,152 @@
-import streamlit as st
+from datetime import datetime, timezone
 from .schema_setup import create_constraints_and_indexes
+from .clearing import clear_database
 from .data_importer import (
     import_business_data, 
     import_population_density_data,
-    import_business_survival_rate_data
+    import_business_survival_rate_data,
+    import_ward_data,
+    import_lsoa_data,
+    import_street_data
 )
 from .create_relationships import (
     connect_businesses_to_boroughs, 
     connect_boroughs_to_aggregate, 
-    connect_neighbouring_boroughs
+    connect_neighbouring_boroughs,
+    connect_wards_to_boroughs,
+    connect_lsoas_to_wards,
+    connect_businesses_to_lsoas,
+    connect_neighbouring_areas,
+    connect_streets_to_boroughs,
+    connect_businesses_to_streets
 )
+from .geography import assign_businesses_to_areas
+from .adjacency import build_adjacency
+from .rollups import rollup_business_counts, rollup_street_business_counts
+from . import competition
+from .competition import store_competition_density
+from .precompute import (
+    store_ratio_distributions,
+    store_borough_ranks,
+    store_population_series,
+    store_borough_similarity,
+    store_colocation_analytics,
+    store_network_analytics
+)
+from .telemetry import (
+    BUILD_REPORT_PATH,
+    InstrumentedConnection,
+    run_stage,
+    summarize_build,
+    save_build_report
+)
+from .progress import report_progress, reporting_to
+from .checkpoints import BUILD_STATE_PATH, BuildCheckpoint, set_active_checkpoint
+
+
+def build_stages():
+    """
+    Returns the ordered stages of a build as (name, function) pairs.
+    Every function takes (conn, test_boroughs), so stages can be run, timed or resumed one by one.
+    """
+    return [
+        # reset the database
+        ("clear_database", lambda conn, test_boroughs: clear_database(conn)),
+
+        # populate KG with nodes
+        ("create_constraints_and_indexes", lambda conn, test_boroughs: create_constraints_and_indexes(conn)),
+        ("import_business_data", import_business_data),
+        ("import_population_density_data", import_population_density_data),
+        ("import_business_survival_rate_data", import_business_survival_rate_data),
+        ("import_ward_data", import_ward_data),
+        ("import_lsoa_data", import_lsoa_data),
+        ("import_street_data", import_street_data),
+
+        # create relationships in KG
+        ("connect_businesses_to_boroughs", connect_businesses_to_boroughs),
+        ("connect_neighbouring_boroughs", connect_neighbouring_boroughs),
+        ("connect_boroughs_to_aggregate", connect_boroughs_to_aggregate),
+        ("connect_wards_to_boroughs", connect_wards_to_boroughs),
+        ("connect_lsoas_to_wards", connect_lsoas_to_wards),
+        ("connect_streets_to_boroughs", connect_streets_to_boroughs),
+        ("connect_businesses_to_streets", connect_businesses_to_streets),
+
+        # boroughs use the shipped neighbouring_boroughs.csv, finer layers are computed per build
+        ("build_adjacency", lambda conn, test_boroughs: build_adjacency(["Ward", "LSOA"])),
+        ("connect_neighbouring_wards", lambda conn, test_boroughs: connect_neighbouring_areas(conn, "Ward", test_boroughs)),
+        ("connect_neighbouring_lsoas", lambda conn, test_boroughs: connect_neighbouring_areas(conn, "LSOA", test_boroughs)),
 
+        # place businesses at the finest level and roll counts up the hierarchy
+        ("assign_businesses_to_areas", lambda conn, test_boroughs: assign_businesses_to_areas()),
+        ("connect_businesses_to_lsoas", connect_businesses_to_lsoas),
+        ("rollup_business_counts", rollup_business_counts),
+        ("rollup_street_business_counts", rollup_street_business_counts),
+        ("store_competition_density", store_competition_density),
 
-def build_knowledge_graph(conn, test_boroughs=[]):
+        # precompute statistics served by the pages
+        ("store_ratio_distributions", lambda conn, test_boroughs: store_ratio_distributions(conn)),
+        ("store_borough_ranks", lambda conn, test_boroughs: store_borough_ranks(conn)),
+        ("store_population_series", lambda conn, test_boroughs: store_population_series(conn)),
+        ("store_borough_similarity", lambda conn, test_boroughs: store_borough_similarity(conn)),
+        ("store_colocation_analytics", lambda conn, test_boroughs: store_colocation_analytics(conn)),
+        ("store_network_analytics", lambda conn, test_boroughs: store_network_analytics(conn)),
+
+        # stamp the build so cached metrics and figures are invalidated
+        ("record_graph_version", lambda conn, test_boroughs: record_graph_version(conn)),
+    ]
+
+
+def build_knowledge_graph(conn, test_boroughs=[], report_path=BUILD_REPORT_PATH, resume=False, state_path=BUILD_STATE_PATH, progress=None):
+    """
+    Runs all build stages in order and records their telemetry.
+    Completed stages and batches are checkpointed in state_path; with resume=True an unfinished
+    build with the same test boroughs continues at its first incomplete stage instead of clearing
+    the database again.
+    The build report is written to report_path also when a stage fails; the error is then raised again.
+    Progress messages go to progress, e.g. st.info, and are logged when it is None.
+    """
     # TODO: when necessary, add more edges to make strongly connected graph for improved query runtimes  
-    # reset the database
-    clear_database(conn)
-
-    # populate KG with nodes
-    create_constraints_and_indexes(conn)
-
-    import_business_data(conn, test_boroughs)
-    import_population_density_data(conn, test_boroughs)
-    import_business_survival_rate_data(conn, test_boroughs)
-
-    # create relationships in KG
-    connect_businesses_to_boroughs(conn, test_boroughs)
-    connect_neighbouring_boroughs(conn, test_boroughs)
-    connect_boroughs_to_aggregate(conn, test_boroughs)
-
-
-def clear_database(conn):
-    st.info("Clearing the database (detaching and deleting all nodes and relationships)...")
-    query_delete_all = "MATCH (n) DETACH DELETE n"
-    conn.query(query_delete_all)
-
-    constraints = conn.query("SHOW CONSTRAINTS")
-    for constraint in constraints[0]:
-        name = constraint.get('name')
-        drop_query = f"DROP CONSTRAINT {name} IF EXISTS"
-        st.info(f"Dropping constraint: {name}")
-        conn.query(drop_query)
-
-    indexes = conn.query("SHOW INDEXES")
-    for index in indexes[0]:
-        name = index.get('name')
-        drop_query = f"DROP INDEX {name} IF EXISTS"
-        st.info(f"Dropping index: {name}")
-        conn.query(drop_query)
-
-    st.info("Database cleared.")
-    
\ No newline at end of file
+    with reporting_to(progress):
+        started_at = datetime.now(timezone.utc).isoformat()
+        checkpoint = BuildCheckpoint.load(state_path, test_boroughs) if resume else None
+        if checkpoint is None:
+            checkpoint = BuildCheckpoint(state_path, test_boroughs)
+            checkpoint.save()
+        skipped = list(checkpoint.completed_stages)
+        if skipped:
+            report_progress(f"Resuming build after {len(skipped)} completed stages.")
+
+        instrumented = InstrumentedConnection(conn)
+        set_active_checkpoint(checkpoint)
+        stages = []
+        try:
+            for name, stage in build_stages():
+                if checkpoint.is_complete(name):
+                    continue
+                checkpoint.start_stage(name)
+                record, error = run_stage(instrumented, name, stage, test_boroughs)
+                stages.append(record)
+                if error is not None:
+                    raise error
+                checkpoint.stage_done(name)
+            checkpoint.finish()
+        finally:
+            set_active_checkpoint(None)
+            report = summarize_build(stages, started_at, test_boroughs, skipped)
+            save_build_report(report, report_path)
+        return report
+
+
+def record_graph_version(conn):
+    """
+    Stores a new version id on the single GraphVersion node.
+    Pages use it as cache key for everything derived from the graph.
+    Also records build settings the pages depend on, e.g. the radii competitor density was stored for.
+    """
+    query = """
+    MERGE (v:GraphVersion {name: 'current'})
+    SET v.version = randomUUID(), v.built_at = datetime(), v.competition_radii = $competition_radii
+    """
+    # read through the module, set_competition_radii rebinds the list after import
+    conn.query(query, parameters={"competition_radii": competition.COMPETITION_RADII})
+    report_progress("Graph version recorded.")
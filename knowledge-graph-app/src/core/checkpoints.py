@@ -0,0 +1,97 @@
+import json
+import os
+
+
+BUILD_STATE_PATH = "data/processed/build_state.json"
+
+
+def state_path_for(database, path=BUILD_STATE_PATH):
+    """State file of builds into one database, e.g. data/processed/build_state_kg-blue.json."""
+    root, ext = os.path.splitext(path)
+    return f"{root}_{database}{ext}"
+
+# Checkpoint of the running build, used by write_in_batches to record and skip completed batches
+_active_checkpoint = None
+
+
+class BuildCheckpoint:
+    """
+    Progress of a build saved to a local state file after every completed stage and batch,
+    so a failed build can resume at the first incomplete stage (and batch) instead of starting over.
+    Batches are identified by the order of write_in_batches calls within their stage, which assumes
+    the input files did not change between the failed attempt and the retry.
+    """
+
+    def __init__(self, path=BUILD_STATE_PATH, test_boroughs=()):
+        self.path = path
+        self.state = {
+            "test_boroughs": sorted(test_boroughs),
+            "completed_stages": [],
+            "batches": {},
+            "finished": False,
+        }
+        self.stage = None
+        self._calls = 0
+
+    @classmethod
+    def load(cls, path=BUILD_STATE_PATH, test_boroughs=()):
+        """Returns the checkpoint of an unfinished build with the same test boroughs, or None."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("finished") or state.get("test_boroughs") != sorted(test_boroughs):
+            return None
+        checkpoint = cls(path, test_boroughs)
+        checkpoint.state.update(state)
+        return checkpoint
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def completed_stages(self):
+        return self.state["completed_stages"]
+
+    def is_complete(self, stage):
+        return stage in self.state["completed_stages"]
+
+    def start_stage(self, stage):
+        self.stage = stage
+        self._calls = 0
+
+    def next_batch_call(self):
+        """Key of the next write_in_batches call of the current stage."""
+        key = f"{self.stage}:{self._calls}"
+        self._calls += 1
+        return key
+
+    def completed_rows(self, key):
+        return self.state["batches"].get(key, 0)
+
+    def batch_done(self, key, rows_done):
+        self.state["batches"][key] = rows_done
+        self.save()
+
+    def stage_done(self, stage):
+        self.state["completed_stages"].append(stage)
+        self.state["batches"] = {k: v for k, v in self.state["batches"].items() if not k.startswith(f"{stage}:")}
+        self.stage = None
+        self.save()
+
+    def finish(self):
+        self.state["finished"] = True
+        self.save()
+
+
+def set_active_checkpoint(checkpoint):
+    global _active_checkpoint
+    _active_checkpoint = checkpoint
+
+
+def get_active_checkpoint():
+    return _active_checkpoint
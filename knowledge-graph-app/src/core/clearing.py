@@ -0,0 +1,107 @@
+import time
+
+from .progress import report_progress
+
+
+# Relationships or nodes deleted per transaction, so clearing needs bounded transaction memory
+DELETE_BATCH_SIZE = 10_000
+
+CLEAR_METHODS = ["batched", "recreate"]
+
+
+def query_records(conn, query, parameters=None, db=None):
+    """
+    Returns the records of a query. Raises instead of returning None when it failed or the
+    connection has no driver, so clearing stops with a clear error.
+    """
+    result = conn.query(query, parameters, db)
+    if result is None or result[0] is None:
+        raise RuntimeError(f"Query failed while clearing the database: {query.strip().splitlines()[0]}")
+    return result[0]
+
+
+def is_enterprise_edition(conn):
+    records = query_records(conn, "CALL dbms.components() YIELD edition RETURN edition", db="system")
+    return bool(records) and records[0]["edition"] == "enterprise"
+
+
+def recreate_database(conn):
+    """
+    Drops and recreates the database the connection writes to, which removes all data, constraints
+    and indexes in one step. Needs Enterprise Edition and the CREATE/DROP DATABASE privilege.
+    Returns True when the database was recreated.
+    """
+    if not is_enterprise_edition(conn):
+        return False
+    result = conn.query("CALL db.info() YIELD name RETURN name")
+    if not result or not result[0]:
+        return False
+    name = result[0][0]["name"]
+    # without the privilege the server refuses, and clearing falls back to batches
+    result = conn.query(f"CREATE OR REPLACE DATABASE `{name}` WAIT", db="system")
+    if not result or result[0] is None:
+        return False
+    report_progress(f"Recreated database '{name}'.")
+    return True
+
+
+def delete_in_batches(conn, match, what, batch_size=DELETE_BATCH_SIZE):
+    """
+    Repeats a bounded delete until nothing is left, reporting progress after each transaction.
+    match must bind the items to delete to x, e.g. 'MATCH ()-[x]->()'.
+    """
+    total = query_records(conn, f"{match} RETURN count(x) AS count")
+    remaining = total[0]["count"] if total else 0
+    deleted = 0
+    while remaining > deleted:
+        result = conn.query(
+            f"{match} WITH x LIMIT $batch_size DETACH DELETE x RETURN count(*) AS deleted",
+            parameters={"batch_size": batch_size}
+        )
+        if result is None or result[0] is None:
+            raise RuntimeError(f"Deleting {what} failed after {deleted} of {remaining}.")
+        records = result[0]
+        if not records or records[0]["deleted"] == 0:
+            break
+        deleted += records[0]["deleted"]
+        report_progress(f"Deleted {deleted} of {remaining} {what}.")
+    return deleted
+
+
+def drop_schema(conn):
+    """Drops all constraints and all indexes except the token lookup indexes Neo4j uses for label scans."""
+    constraints = query_records(conn, "SHOW CONSTRAINTS YIELD name RETURN name")
+    for constraint in constraints:
+        report_progress(f"Dropping constraint: {constraint['name']}")
+        conn.query(f"DROP CONSTRAINT `{constraint['name']}` IF EXISTS")
+
+    # indexes backing constraints went with them
+    indexes = query_records(conn, "SHOW INDEXES YIELD name, type WHERE type <> 'LOOKUP' RETURN name")
+    for index in indexes:
+        report_progress(f"Dropping index: {index['name']}")
+        conn.query(f"DROP INDEX `{index['name']}` IF EXISTS")
+
+
+def clear_database(conn, method="auto", batch_size=DELETE_BATCH_SIZE):
+    """
+    Removes all nodes, relationships, constraints and indexes.
+    method 'recreate' drops and recreates the database, 'batched' deletes relationships and then
+    nodes in transactions of batch_size, and 'auto' tries recreating first and falls back to batches
+    when the server does not allow it. Returns the method used and the time it took.
+    """
+    report_progress("Clearing the database (detaching and deleting all nodes and relationships)...")
+    start = time.perf_counter()
+    used = "batched"
+    if method in ("auto", "recreate") and recreate_database(conn):
+        used = "recreate"
+    elif method == "recreate":
+        raise RuntimeError("The database cannot be recreated, this needs Enterprise Edition and admin privileges.")
+    else:
+        # relationships first, so no single transaction has to detach a node with many relationships
+        delete_in_batches(conn, "MATCH ()-[x]->()", "relationships", batch_size)
+        delete_in_batches(conn, "MATCH (x)", "nodes", batch_size)
+        drop_schema(conn)
+
+    seconds = time.perf_counter() - start
+    report_progress(f"Database cleared ({used}) in {seconds:.1f}s.")
+    return used, seconds
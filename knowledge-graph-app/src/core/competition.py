@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+from .progress import report_progress
+from .batching import write_in_batches
+
+
+# Radii (metres) within which surrounding businesses are counted for every business
+COMPETITION_RADII = [250, 500, 1000]
+
+# Businesses whose candidate pairs are expanded at once, bounds the memory of the counting
+POINT_CHUNK_SIZE = 2_000
+
+
+def set_competition_radii(radii):
+    global COMPETITION_RADII
+    if not radii or min(radii) <= 0:
+        raise ValueError("Competition radii must be positive.")
+    COMPETITION_RADII = sorted(set(int(r) for r in radii))
+
+
+def competition_properties(radii=None):
+    """Business properties written by store_competition_density, e.g. competitors_500m and businesses_500m."""
+    radii = COMPETITION_RADII if radii is None else radii
+    return [f"{kind}_{radius}m" for radius in radii for kind in ("competitors", "businesses")]
+
+
+def count_neighbours(x, y, types, radii, chunk_size=POINT_CHUNK_SIZE):
+    """
+    Counts, for every point, the other points within each radius (any type) and those of the same type,
+    using a grid hash with cells as wide as the largest radius: only the 3 x 3 cells around a point
+    can hold points within range, so each point is compared with its neighbourhood instead of all points.
+
+    Parameters:
+        x, y: projected coordinates in metres
+        types: type code of every point (any comparable values)
+        radii: radii in metres
+
+    Returns:
+        (same_type, any_type): dicts {radius: integer array aligned with the points}
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    _, types = np.unique(np.asarray(types), return_inverse=True)
+    n = len(x)
+    same_type_counts = {r: np.zeros(n, dtype=np.int64) for r in radii}
+    any_type_counts = {r: np.zeros(n, dtype=np.int64) for r in radii}
+    if n == 0:
+        return same_type_counts, any_type_counts
+
+    cell_size = max(radii)
+    cx = np.floor((x - x.min()) / cell_size).astype(np.int64)
+    cy = np.floor((y - y.min()) / cell_size).astype(np.int64)
+    width = cy.max() + 3
+    # points sorted by cell, so the points of a cell are one contiguous slice
+    cell = cx * width + cy
+    order = np.argsort(cell, kind="stable")
+    sorted_cell = cell[order]
+
+    offsets = [dx * width + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+    squared_radii = {r: r * r for r in radii}
+    for chunk_start in range(0, n, chunk_size):
+        points = np.arange(chunk_start, min(chunk_start + chunk_size, n))
+        for offset in offsets:
+            lo = np.searchsorted(sorted_cell, cell[points] + offset, side="left")
+            hi = np.searchsorted(sorted_cell, cell[points] + offset, side="right")
+            sizes = hi - lo
+            if sizes.sum() == 0:
+                continue
+            # expand (point, candidate) pairs: every point against each point of the neighbouring cell
+            source = np.repeat(points, sizes)
+            starts = np.repeat(lo - np.cumsum(sizes) + sizes, sizes)
+            candidate = order[starts + np.arange(len(source))]
+            keep = candidate != source
+            source, candidate = source[keep], candidate[keep]
+            distance = (x[source] - x[candidate]) ** 2 + (y[source] - y[candidate]) ** 2
+            same_type = types[source] == types[candidate]
+            local = source - chunk_start
+            for r in radii:
+                within = distance <= squared_radii[r]
+                same_type_counts[r][points] += np.bincount(local[within & same_type], minlength=len(points))
+                any_type_counts[r][points] += np.bincount(local[within], minlength=len(points))
+    return same_type_counts, any_type_counts
+
+
+def compute_competition_density(df, radii=None):
+    """
+    Adds competitors_<r>m (same business type) and businesses_<r>m (any type) columns to a frame
+    with columns osm_id, fclass, x and y. The business itself is not counted.
+    """
+    radii = COMPETITION_RADII if radii is None else radii
+    same_type, any_type = count_neighbours(df["x"].to_numpy(), df["y"].to_numpy(), df["fclass"].to_numpy(), radii)
+    df = df.copy()
+    for r in radii:
+        df[f"competitors_{r}m"] = same_type[r]
+        df[f"businesses_{r}m"] = any_type[r]
+    return df
+
+
+def store_competition_density(conn, test_boroughs=[], input_path="data/processed/businesses_with_areas.csv"):
+    """
+    Counts the same-type and any-type businesses around every business within each of COMPETITION_RADII,
+    stores them as Business properties and indexes them, so saturation filters and rankings are index lookups.
+    Reads the projected coordinates written by assign_businesses_to_areas.
+    """
+    report_progress(f"Computing competitor density within {', '.join(f'{r}m' for r in COMPETITION_RADII)}...")
+    df = pd.read_csv(input_path).dropna(subset=["fclass", "x", "y"])
+    if test_boroughs:
+        df = df[df["area"].isin(test_boroughs)]
+    df = compute_competition_density(df[["osm_id", "fclass", "x", "y"]].drop_duplicates("osm_id"))
+
+    properties = competition_properties()
+    query = f"""
+    UNWIND $rows AS row
+    MATCH (b:Business {{osmId: row.osm_id}})
+    SET {", ".join(f"b.{p} = row.{p}" for p in properties)}
+    """
+    write_in_batches(conn, query, df[["osm_id", *properties]].to_dict(orient="records"))
+
+    for p in properties:
+        conn.query(f"CREATE INDEX business_{p} IF NOT EXISTS FOR (b:Business) ON (b.{p})")
+    report_progress(f"Stored competitor density of {len(df)} businesses.")
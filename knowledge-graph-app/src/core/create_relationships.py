@@ -1,5 +1,9 @@
-import streamlit as st
 import pandas as pd
+from .geography import load_boundary_layer, lsoa_ward_lookup
+from .data_importer import load_business_streets
+from .adjacency import NODE_KEYS, adjacency_path
+from .progress import report_progress
+from .batching import write_in_batches
 
 
 def connect_businesses_to_boroughs(conn, test_boroughs=[]):
@@ -7,7 +11,7 @@ def connect_businesses_to_boroughs(conn, test_boroughs=[]):
     Efficiently creates 'LOCATED_IN' relationships between Business and Borough nodes.
     If test=True, only creates relationships for two boroughs.
     """
-    st.info("Creating relationships between businesses and boroughs...")
+    report_progress("Creating relationships between businesses and boroughs...")
     df = pd.read_csv("data/processed/businesses_with_boroughs.csv")
     if test_boroughs:
         df = df[df["area"].isin(test_boroughs)]
@@ -19,8 +23,8 @@ def connect_businesses_to_boroughs(conn, test_boroughs=[]):
     MATCH (br:Borough {name: row.area})
     MERGE (b)-[:LOCATED_IN]->(br)
     """
-    conn.query(query, parameters={"rows": data})
-    st.info("Business-Borough relationships created.")
+    write_in_batches(conn, query, data)
+    report_progress("Business-Borough relationships created.")
 
 
 def connect_neighbouring_boroughs(conn, test_boroughs=[]):
@@ -28,7 +32,7 @@ def connect_neighbouring_boroughs(conn, test_boroughs=[]):
     Creates symmetric NEIGHBOURS relationships between Borough nodes.
     If test_boroughs is provided, only creates relationships where both boroughs are in test_boroughs.
     """
-    st.info("Creating neighbouring borough relationships...")
+    report_progress("Creating neighbouring borough relationships...")
     df = pd.read_csv("data/processed/neighbouring_boroughs.csv")
     if test_boroughs:
         df = df[df["borough1"].isin(test_boroughs) & df["borough2"].isin(test_boroughs)]
@@ -41,8 +45,31 @@ def connect_neighbouring_boroughs(conn, test_boroughs=[]):
     MERGE (b1)-[:NEIGHBOURS]->(b2)
     MERGE (b2)-[:NEIGHBOURS]->(b1)
     """
-    conn.query(query, parameters={"rows": data})
-    st.info("Neighbouring borough relationships created.")
+    write_in_batches(conn, query, data)
+    report_progress("Neighbouring borough relationships created.")
+
+
+def connect_neighbouring_areas(conn, level, test_boroughs=[]):
+    """
+    Creates symmetric NEIGHBOURS relationships between Ward or LSOA nodes
+    from the pairs written by adjacency.build_adjacency.
+    Areas outside test_boroughs were never imported, so their pairs are skipped by the MATCH.
+    """
+    report_progress(f"Creating neighbouring {level} relationships...")
+    prefix = level.lower()
+    df = pd.read_csv(adjacency_path(level))
+    data = df.rename(columns={f"{prefix}1": "area1", f"{prefix}2": "area2"}).to_dict(orient="records")
+
+    key = NODE_KEYS[level]
+    query = f"""
+    UNWIND $rows AS row
+    MATCH (a1:{level} {{{key}: row.area1}})
+    MATCH (a2:{level} {{{key}: row.area2}})
+    MERGE (a1)-[:NEIGHBOURS]->(a2)
+    MERGE (a2)-[:NEIGHBOURS]->(a1)
+    """
+    write_in_batches(conn, query, data)
+    report_progress(f"Neighbouring {level} relationships created.")
 
 
 def connect_boroughs_to_aggregate(conn, test_boroughs=[]):
@@ -52,7 +79,7 @@ def connect_boroughs_to_aggregate(conn, test_boroughs=[]):
     - Boroughs -> Inner London or Outer London (from CSV)
     If test_boroughs is provided, only creates relationships for those boroughs.
     """
-    st.info("Creating relationships between boroughs and aggregate boroughs...")
+    report_progress("Creating relationships between boroughs and aggregate boroughs...")
 
     # Only Inner London and Outer London to Greater London
     query_greater = """
@@ -75,6 +102,107 @@ def connect_boroughs_to_aggregate(conn, test_boroughs=[]):
     MATCH (a:Borough {name: row.aggregate})
     MERGE (b)-[:PART_OF]->(a)
     """
-    conn.query(query_agg, parameters={"rows": data})
+    write_in_batches(conn, query_agg, data)
 
-    st.info("Borough-aggregate relationships created.")
+    report_progress("Borough-aggregate relationships created.")
+
+
+def connect_wards_to_boroughs(conn, test_boroughs=[]):
+    """
+    Creates PART_OF relationships from Ward nodes to the Borough they lie in.
+    """
+    report_progress("Creating relationships between wards and boroughs...")
+    query = """
+    MATCH (w:Ward)
+    WHERE size($boroughs) = 0 OR w.borough IN $boroughs
+    MATCH (b:Borough {name: w.borough})
+    MERGE (w)-[:PART_OF]->(b)
+    """
+    conn.query(query, parameters={"boroughs": test_boroughs})
+    report_progress("Ward-Borough relationships created.")
+
+
+def connect_streets_to_boroughs(conn, test_boroughs=[]):
+    """
+    Creates PART_OF relationships from Street nodes to the Borough they lie in.
+    """
+    report_progress("Creating relationships between streets and boroughs...")
+    query = """
+    MATCH (s:Street)
+    WHERE size($boroughs) = 0 OR s.borough IN $boroughs
+    MATCH (b:Borough {name: s.borough})
+    MERGE (s)-[:PART_OF]->(b)
+    """
+    conn.query(query, parameters={"boroughs": test_boroughs})
+    report_progress("Street-Borough relationships created.")
+
+
+def connect_businesses_to_streets(conn, test_boroughs=[]):
+    """
+    Creates 'ON_STREET' relationships between Business nodes and the Street they are on.
+    """
+    report_progress("Creating relationships between businesses and streets...")
+    data = load_business_streets(test_boroughs)[["osm_id", "street", "borough"]].to_dict(orient="records")
+
+    query = """
+    UNWIND $rows AS row
+    MATCH (b:Business {osmId: row.osm_id})
+    MATCH (s:Street {name: row.street, borough: row.borough})
+    MERGE (b)-[:ON_STREET]->(s)
+    """
+    write_in_batches(conn, query, data)
+    report_progress("Business-Street relationships created.")
+
+
+def connect_lsoas_to_wards(conn, test_boroughs=[]):
+    """
+    Creates PART_OF relationships from LSOA nodes to the Ward containing them.
+    LSOAs that cannot be placed in a ward are linked to their Borough directly,
+    so every LSOA still reaches Greater London through the PART_OF hierarchy.
+    """
+    report_progress("Creating relationships between LSOAs and wards...")
+    lsoas = load_boundary_layer("LSOA", test_boroughs)
+    wards = load_boundary_layer("Ward", test_boroughs)
+    lookup = lsoa_ward_lookup(lsoas, wards)
+    df = pd.DataFrame({"lsoa_code": lookup.index, "ward_code": lookup.values})
+    placed = df.dropna(subset=["ward_code"])
+
+    query = """
+    UNWIND $rows AS row
+    MATCH (l:LSOA {code: row.lsoa_code})
+    MATCH (w:Ward {code: row.ward_code})
+    MERGE (l)-[:PART_OF]->(w)
+    """
+    write_in_batches(conn, query, placed.to_dict(orient="records"))
+
+    query_unplaced = """
+    UNWIND $codes AS code
+    MATCH (l:LSOA {code: code})
+    MATCH (b:Borough {name: l.borough})
+    MERGE (l)-[:PART_OF]->(b)
+    """
+    unplaced = df[df["ward_code"].isna()]["lsoa_code"].tolist()
+    conn.query(query_unplaced, parameters={"codes": unplaced})
+    report_progress("LSOA-Ward relationships created.")
+
+
+def connect_businesses_to_lsoas(conn, test_boroughs=[]):
+    """
+    Creates 'LOCATED_IN' relationships between Business nodes and the LSOA they were assigned to.
+    Reads the assignment written by geography.assign_businesses_to_areas.
+    """
+    report_progress("Creating relationships between businesses and LSOAs...")
+    df = pd.read_csv("data/processed/businesses_with_areas.csv")
+    if test_boroughs:
+        df = df[df["area"].isin(test_boroughs)]
+    df = df.dropna(subset=["lsoa_code"])
+    data = df[["osm_id", "lsoa_code"]].to_dict(orient="records")
+
+    query = """
+    UNWIND $rows AS row
+    MATCH (b:Business {osmId: row.osm_id})
+    MATCH (l:LSOA {code: row.lsoa_code})
+    MERGE (b)-[:LOCATED_IN]->(l)
+    """
+    write_in_batches(conn, query, data)
+    report_progress("Business-LSOA relationships created.")
@@ -1,7 +1,8 @@
-import streamlit as st
 import pandas as pd
 import numpy as np
-import geopandas as gpd
+from .geography import load_boundary_layer
+from .progress import report_progress
+from .batching import write_in_batches
 
 
 # Why separate BusinessType nodes?
@@ -12,7 +13,7 @@ def import_business_data(conn, test_boroughs=[]):
     """
     Efficiently imports business data and business types.
     """
-    st.info("Importing business data...")
+    report_progress("Importing business data...")
     df = pd.read_csv("data/processed/businesses_with_boroughs.csv")
     if test_boroughs:
         df = df[df["area"].isin(test_boroughs)]
@@ -24,7 +25,7 @@ def import_business_data(conn, test_boroughs=[]):
     UNWIND $rows AS row
     MERGE (:BusinessType {type: row.type})
     """
-    conn.query(type_query, parameters={"rows": unique_types})
+    write_in_batches(conn, type_query, unique_types)
 
     # Step 2: Create businesses and relationships
     business_query = """
@@ -37,8 +38,8 @@ def import_business_data(conn, test_boroughs=[]):
     MERGE (b)-[:OF_TYPE]->(bt)
     MERGE (bt)-[:TYPE_FOR]->(b)
     """
-    conn.query(business_query, parameters={"rows": data})
-    st.info("Business data import complete.")
+    write_in_batches(conn, business_query, data)
+    report_progress("Business data import complete.")
 
 
 # Why choose node per borough-year?
@@ -52,7 +53,7 @@ def import_population_density_data(conn, test_boroughs=[]):
     Creates a Population node for each borough-year and links it to the Borough node.
     If test_boroughs is set, only imports population data for those boroughs.
     """
-    st.info("Importing population density data...")
+    report_progress("Importing population density data...")
     df = pd.read_csv("data/processed/housing_density_borough.csv")
     if test_boroughs:
         df = df[df["Name"].isin(test_boroughs)]
@@ -64,7 +65,7 @@ def import_population_density_data(conn, test_boroughs=[]):
     UNWIND $rows AS row
     MERGE (:Borough {name: row.name})
     """
-    conn.query(borough_query, parameters={"rows": unique_boroughs})
+    write_in_batches(conn, borough_query, unique_boroughs)
 
     # Step 2: Create Population nodes and relationships
     query = """
@@ -78,8 +79,8 @@ def import_population_density_data(conn, test_boroughs=[]):
     })
     MERGE (b)-[:HAS_POPULATION {year: toInteger(row.Year)}]->(p)
     """
-    conn.query(query, parameters={"rows": data})
-    st.info("Population density data import complete.")
+    write_in_batches(conn, query, data)
+    report_progress("Population density data import complete.")
 
 
 def import_business_survival_rate_data(conn, test_boroughs=[]):
@@ -89,7 +90,7 @@ def import_business_survival_rate_data(conn, test_boroughs=[]):
     Only sets properties for non-null values in the dataframe.
     If test_boroughs is set, only imports data for those boroughs.
     """
-    st.info("Importing business survival rate data...")
+    report_progress("Importing business survival rate data...")
     df = pd.read_csv("data/processed/boroughs_business_survival_rate.csv")
     if test_boroughs:
         df = df[df["area"].isin(test_boroughs)]
@@ -126,12 +127,88 @@ def import_business_survival_rate_data(conn, test_boroughs=[]):
         bs.five_year_rate = row.props.five_year_rate
     MERGE (b)-[:HAS_SURVIVAL_RATE]->(bs)
     """
-    conn.query(query, parameters={"rows": data})
-    st.info("Business survival rate data import complete.")
+    write_in_batches(conn, query, data)
+    report_progress("Business survival rate data import complete.")
 
 
-def import_borough_shapes():
-    return gpd.read_file("data/raw/gis-boundaries-london/ESRI/London_Borough_Excluding_MHW.shp")
+def import_ward_data(conn, test_boroughs=[]):
+    """
+    Imports a Ward node for every ward in the ward boundary layer.
+    If test_boroughs is set, only imports wards inside those boroughs.
+    """
+    report_progress("Importing ward data...")
+    gdf = load_boundary_layer("Ward", test_boroughs)
+    data = gdf[["code", "name", "borough"]].to_dict(orient="records")
+
+    query = """
+    UNWIND $rows AS row
+    MERGE (w:Ward {code: row.code})
+    SET w.name = row.name,
+        w.borough = row.borough
+    """
+    write_in_batches(conn, query, data)
+    report_progress("Ward data import complete.")
+
+
+def import_lsoa_data(conn, test_boroughs=[]):
+    """
+    Imports an LSOA node for every 2011 LSOA, including its census 2011 residents and households.
+    If test_boroughs is set, only imports LSOAs inside those boroughs.
+    """
+    report_progress("Importing LSOA data...")
+    gdf = load_boundary_layer("LSOA", test_boroughs)
+    df = pd.DataFrame({
+        "code": gdf["code"],
+        "name": gdf["name"],
+        "borough": gdf["borough"],
+        "usual_residents": pd.to_numeric(gdf["USUALRES"], errors="coerce"),
+        "households": pd.to_numeric(gdf["HHOLDS"], errors="coerce"),
+    })
+    df = df.replace({np.nan: None})
+    data = df.to_dict(orient="records")
+
+    query = """
+    UNWIND $rows AS row
+    MERGE (l:LSOA {code: row.code})
+    SET l.name = row.name,
+        l.borough = row.borough,
+        l.usual_residents = toInteger(row.usual_residents),
+        l.households = toInteger(row.households)
+    """
+    write_in_batches(conn, query, data)
+    report_progress("LSOA data import complete.")
+
+
+def load_business_streets(test_boroughs=[]):
+    """
+    Returns one row per business with its street and borough (columns osm_id, fclass, street, borough).
+    Street names repeat across London, so a street is identified by its name and borough.
+    Businesses matched to more than one street keep the first; those without a street are left out.
+    """
+    df = pd.read_csv("data/processed/businesses_with_streets.csv", usecols=["osm_id", "fclass", "street_name"])
+    df = df.dropna(subset=["street_name"]).drop_duplicates("osm_id")
+    boroughs = pd.read_csv("data/processed/businesses_with_boroughs.csv", usecols=["osm_id", "area"]).drop_duplicates("osm_id")
+    df = df.merge(boroughs, on="osm_id").dropna(subset=["area"])
+    if test_boroughs:
+        df = df[df["area"].isin(test_boroughs)]
+    return df.rename(columns={"street_name": "street", "area": "borough"})[["osm_id", "fclass", "street", "borough"]]
+
+
+def import_street_data(conn, test_boroughs=[]):
+    """
+    Imports a Street node for every street with at least one business, per borough.
+    If test_boroughs is set, only imports streets inside those boroughs.
+    """
+    report_progress("Importing street data...")
+    df = load_business_streets(test_boroughs)
+    data = df[["street", "borough"]].drop_duplicates().to_dict(orient="records")
+
+    query = """
+    UNWIND $rows AS row
+    MERGE (:Street {name: row.street, borough: row.borough})
+    """
+    write_in_batches(conn, query, data)
+    report_progress("Street data import complete.")
 
 
 # # old population data import
@@ -0,0 +1,130 @@
+from connect import LIVE_ALIAS
+from .builder import build_knowledge_graph
+from .checkpoints import state_path_for
+from .clearing import is_enterprise_edition
+from .progress import report_progress, reporting_to
+from .telemetry import BUILD_REPORT_PATH, save_build_report
+
+
+# The two databases the live alias (LIVE_ALIAS, which the app reads from) alternates between.
+# Builds load into the database the alias does not point to, so the dashboards keep
+# serving the previous graph until the new one is validated and the alias is switched.
+DEPLOYMENT_DATABASES = ("kg-blue", "kg-green")
+
+# Labels every complete build contains at least one node of
+REQUIRED_LABELS = ["Borough", "BusinessType", "Business", "Population", "BusinessSurvival", "GraphVersion"]
+
+
+class DatabaseConnection:
+    """Sends every query of a wrapped connection to one database, e.g. the staging database of a build."""
+
+    def __init__(self, conn, db):
+        self.conn = conn
+        self.db = db
+
+    def query(self, query, parameters=None, db=None):
+        return self.conn.query(query, parameters, db or self.db)
+
+    def query_df(self, query, parameters=None, db=None):
+        return self.conn.query_df(query, parameters, db or self.db)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def supports_blue_green(conn):
+    """Aliases and several user databases need Neo4j Enterprise Edition."""
+    return is_enterprise_edition(conn)
+
+
+def get_live_database(conn, alias=LIVE_ALIAS):
+    """Returns the database the alias points to, or None before the first blue/green build."""
+    records, _, _ = conn.query(
+        "SHOW ALIASES FOR DATABASE YIELD name, database WHERE name = $alias RETURN database",
+        parameters={"alias": alias}, db="system"
+    )
+    return records[0]["database"] if records else None
+
+
+def get_staging_database(conn, alias=LIVE_ALIAS):
+    live = get_live_database(conn, alias)
+    return DEPLOYMENT_DATABASES[1] if live == DEPLOYMENT_DATABASES[0] else DEPLOYMENT_DATABASES[0]
+
+
+def validate_graph(conn):
+    """Returns a list of problems that should stop a build from going live; empty when the graph looks complete."""
+    problems = []
+    for label in REQUIRED_LABELS:
+        records, _, _ = conn.query(f"MATCH (n:{label}) RETURN count(n) AS count")
+        if records is None:
+            problems.append(f"Counting {label} nodes failed.")
+        elif records[0]["count"] == 0:
+            problems.append(f"No {label} nodes.")
+    records, _, _ = conn.query("MATCH (:Business)-[r:LOCATED_IN]->(:Borough) RETURN count(r) AS count")
+    if not records or records[0]["count"] == 0:
+        problems.append("No businesses are located in a borough.")
+    return problems
+
+
+def switch_alias(conn, database, alias=LIVE_ALIAS):
+    """Points the alias at database. Queries already running finish on the old database, new ones use the new one."""
+    conn.query(f"CREATE OR REPLACE ALIAS `{alias}` FOR DATABASE `{database}`", db="system")
+    # the connection that ran the build reads the live graph from now on, also after the first switch
+    use_database = getattr(conn, "use_database", None)
+    if use_database is not None:
+        use_database(alias)
+    report_progress(f"'{alias}' now serves database '{database}'.")
+
+
+def build_blue_green(conn, test_boroughs=[], alias=LIVE_ALIAS, resume=False, report_path=BUILD_REPORT_PATH, progress=None):
+    """
+    Builds the knowledge graph into the staging database, validates it and switches the alias
+    to it. The previously live database is kept, so rollback() can switch back instantly.
+    Without Enterprise Edition the graph is rebuilt in place, as before.
+    Returns the build report with the deployment outcome added.
+    Progress messages go to progress, e.g. st.info, and are logged when it is None.
+    """
+    with reporting_to(progress):
+        if not supports_blue_green(conn):
+            report_progress("Blue/green builds need Neo4j Enterprise Edition, rebuilding the default database in place.")
+            report = build_knowledge_graph(conn, test_boroughs, report_path=report_path, resume=resume)
+            report["deployment"] = {"mode": "in_place"}
+            save_build_report(report, report_path)
+            return report
+
+        previous = get_live_database(conn, alias)
+        staging = get_staging_database(conn, alias)
+        # the build's clear stage recreates the database, it only has to exist for that
+        conn.query(f"CREATE DATABASE `{staging}` IF NOT EXISTS WAIT", db="system")
+
+        staging_conn = DatabaseConnection(conn, staging)
+        # progress is kept per database, so resuming never skips stages completed against the other one
+        report = build_knowledge_graph(
+            staging_conn, test_boroughs, report_path=report_path, resume=resume, state_path=state_path_for(staging)
+        )
+
+        problems = validate_graph(staging_conn)
+        report["deployment"] = {"mode": "blue_green", "staging": staging, "previous": previous, "problems": problems}
+        if problems:
+            save_build_report(report, report_path)
+            raise RuntimeError(f"Staging database '{staging}' failed validation, '{alias}' was not switched: {' '.join(problems)}")
+        switch_alias(conn, staging, alias)
+        report["deployment"]["live"] = staging
+        save_build_report(report, report_path)
+        return report
+
+
+def rollback(conn, alias=LIVE_ALIAS):
+    """Switches the alias back to the other deployment database, i.e. the graph that was live before the last build."""
+    live = get_live_database(conn, alias)
+    if live is None:
+        raise RuntimeError(f"'{alias}' does not exist, nothing to roll back.")
+    previous = DEPLOYMENT_DATABASES[1] if live == DEPLOYMENT_DATABASES[0] else DEPLOYMENT_DATABASES[0]
+    records, _, _ = conn.query(
+        "SHOW DATABASES YIELD name, currentStatus WHERE name = $name RETURN currentStatus",
+        parameters={"name": previous}, db="system"
+    )
+    if not records or records[0]["currentStatus"] != "online":
+        raise RuntimeError(f"The previous database '{previous}' is not available.")
+    switch_alias(conn, previous, alias)
+    return previous
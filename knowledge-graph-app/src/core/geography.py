@@ -0,0 +1,112 @@
+import pandas as pd
+from .progress import report_progress
+
+
+BOUNDARY_DIR = "data/raw/gis-boundaries-london/ESRI"
+BRITISH_NATIONAL_GRID = "EPSG:27700"
+
+# Boundary layers shipped with the repo, keyed by the node label they populate.
+# Each entry maps the shapefile columns onto a common code/name/borough schema.
+BOUNDARY_LAYERS = {
+    "Borough": {
+        "path": f"{BOUNDARY_DIR}/London_Borough_Excluding_MHW.shp",
+        "code": "GSS_CODE",
+        "name": "NAME",
+        "borough": "NAME",
+    },
+    "Ward": {
+        "path": f"{BOUNDARY_DIR}/London_Ward_CityMerged.shp",
+        "code": "GSS_CODE",
+        "name": "NAME",
+        "borough": "BOROUGH",
+    },
+    "LSOA": {
+        "path": f"{BOUNDARY_DIR}/LSOA_2011_London_gen_MHW.shp",
+        "code": "LSOA11CD",
+        "name": "LSOA11NM",
+        "borough": "LAD11NM",
+    },
+}
+
+
+def load_boundary_layer(level, test_boroughs=[]):
+    """
+    Loads a boundary layer as a GeoDataFrame in British National Grid with
+    standardised 'code', 'name' and 'borough' columns (plus the layer's own columns).
+    If test_boroughs is set, only keeps areas inside those boroughs.
+    """
+    import geopandas as gpd
+
+    layer = BOUNDARY_LAYERS[level]
+    gdf = gpd.read_file(layer["path"]).to_crs(BRITISH_NATIONAL_GRID)
+    gdf["code"] = gdf[layer["code"]]
+    gdf["name"] = gdf[layer["name"]]
+    gdf["borough"] = gdf[layer["borough"]]
+    if test_boroughs:
+        gdf = gdf[gdf["borough"].isin(test_boroughs)]
+    return gdf
+
+
+def lsoa_ward_lookup(lsoas, wards):
+    """
+    Maps each LSOA to the ward containing its representative point.
+    2011 LSOAs are built from output areas that nest in wards, so a single
+    interior point is enough to place them. Returns a Series indexed by LSOA code.
+    """
+    import geopandas as gpd
+
+    points = gpd.GeoDataFrame(
+        {"lsoa_code": lsoas["code"].values},
+        geometry=lsoas.geometry.representative_point().values,
+        crs=lsoas.crs,
+    )
+    joined = gpd.sjoin(points, wards[["code", "geometry"]], how="left", predicate="within")
+    joined = joined.drop_duplicates(subset="lsoa_code")
+    return joined.set_index("lsoa_code")["code"].rename("ward_code")
+
+
+def assign_businesses_to_areas(
+    input_path="data/processed/businesses_with_boroughs.csv",
+    output_path="data/processed/businesses_with_areas.csv",
+):
+    """
+    Assigns every business to the finest boundary level (LSOA) and the ward that LSOA
+    belongs to, and writes the result with the projected coordinates next to the other
+    processed CSVs so the relationship, rollup and competition stages can read it
+    without repeating the spatial join.
+    """
+    import geopandas as gpd
+
+    report_progress("Assigning businesses to LSOAs and wards...")
+    df = pd.read_csv(input_path)
+    # businesses are merged on osm_id on import, so a duplicated row is still one business
+    df = df.dropna(subset=["area"]).drop_duplicates("osm_id")
+
+    points = gpd.GeoDataFrame(
+        df[["osm_id", "fclass", "area"]],
+        geometry=gpd.GeoSeries.from_wkt(df["geometry"].fillna("POINT EMPTY")),
+        crs="EPSG:4326",
+    ).to_crs(BRITISH_NATIONAL_GRID)
+
+    lsoas = load_boundary_layer("LSOA")
+    wards = load_boundary_layer("Ward")
+
+    joined = gpd.sjoin(points, lsoas[["code", "geometry"]], how="left", predicate="within")
+    # points on a shared boundary match two LSOAs, keep the first one
+    joined = joined[~joined.index.duplicated(keep="first")]
+    joined = joined.rename(columns={"code": "lsoa_code"})
+    joined["ward_code"] = joined["lsoa_code"].map(lsoa_ward_lookup(lsoas, wards))
+    # projected coordinates in metres, used for distances between businesses
+    joined["x"], joined["y"] = joined.geometry.x, joined.geometry.y
+
+    result = pd.DataFrame(joined[["osm_id", "fclass", "area", "lsoa_code", "ward_code", "x", "y"]])
+    result.to_csv(output_path, index=False)
+    report_progress(f"Assigned {result['lsoa_code'].notna().sum()} of {len(result)} businesses to an LSOA.")
+    return result
+
+
+def load_borough_shapes():
+    """Borough polygons with the shapefile's own columns (NAME, GSS_CODE, ...), as used by the map."""
+    import geopandas as gpd
+
+    return gpd.read_file(BOUNDARY_LAYERS["Borough"]["path"])
@@ -0,0 +1,186 @@
+from queries.queries import get_population_table, get_business_count_table, get_survival_table, get_area_neighbour_pairs
+from metrics.metrics import people_per_business, population_series, AGGREGATE_BOROUGHS
+from metrics.distributions import compute_ratio_distributions
+from metrics.ranks import compute_rank_table
+from metrics.similarity import compute_borough_similarity
+from metrics.graph_analytics import location_quotients, top_colocations, network_metrics
+from .progress import report_progress
+from .batching import write_in_batches
+from .adjacency import NODE_KEYS
+
+
+# Levels whose NEIGHBOURS graph gets centrality and community properties; LSOAs are left out
+# because no page reads them and sampled betweenness over ~5,000 areas adds about 10s to the build
+NETWORK_LEVELS = ["Borough", "Ward"]
+
+
+def load_population(conn):
+    return get_population_table(conn)
+
+
+def load_ratio_metrics(conn, population=None):
+    """
+    Reads population and rolled-up business counts back from the graph
+    and computes people-per-business for every borough x type x year.
+    """
+    if population is None:
+        population = load_population(conn)
+    counts = get_business_count_table(conn)
+    return people_per_business(population, counts)
+
+
+def store_ratio_distributions(conn):
+    """
+    Precomputes the people-per-business distribution of every business type and year
+    (quantiles, fixed-edge histogram, KDE curve) and stores it as RatioDistribution nodes,
+    with the shared grid on a single DistributionGrid node.
+    """
+    report_progress("Precomputing business density distributions...")
+    grid, rows = compute_ratio_distributions(load_ratio_metrics(conn))
+
+    grid_query = """
+    MERGE (g:DistributionGrid {name: 'people_per_business'})
+    SET g.quantile_levels = $quantile_levels,
+        g.hist_edges = $hist_edges,
+        g.kde_grid = $kde_grid
+    """
+    conn.query(grid_query, parameters={
+        "quantile_levels": list(grid["quantile_levels"]),
+        "hist_edges": grid["hist_edges"].tolist(),
+        "kde_grid": grid["kde_grid"].tolist(),
+    })
+
+    query = """
+    UNWIND $rows AS row
+    MATCH (bt:BusinessType {type: row.business_type})
+    MERGE (d:RatioDistribution {business_type: row.business_type, year: row.year})
+    SET d.count = row.count,
+        d.mean = row.mean,
+        d.quantiles = row.quantiles,
+        d.hist_counts = row.hist_counts,
+        d.kde_density = row.kde_density
+    MERGE (bt)-[:HAS_DISTRIBUTION]->(d)
+    """
+    write_in_batches(conn, query, rows)
+    report_progress(f"Stored {len(rows)} business density distributions.")
+
+
+def store_borough_ranks(conn):
+    """
+    Precomputes the dense rank and percentile of every borough on every metric and year
+    (survival rates, people per business of each type, population growth) and stores them
+    as BoroughRank nodes linked to their Borough.
+    """
+    report_progress("Precomputing borough ranks...")
+    population = load_population(conn)
+    survival = get_survival_table(conn)
+    ranks = compute_rank_table(population, survival, load_ratio_metrics(conn, population))
+
+    query = """
+    UNWIND $rows AS row
+    MATCH (b:Borough {name: row.borough})
+    CREATE (r:BoroughRank {
+        borough: row.borough,
+        metric: row.metric,
+        year: row.year,
+        value: row.value,
+        rank: row.rank,
+        percentile: row.percentile,
+        total: row.total
+    })
+    CREATE (b)-[:HAS_RANK]->(r)
+    """
+    write_in_batches(conn, query, ranks.to_dict(orient="records"))
+    report_progress(f"Stored {len(ranks)} borough ranks.")
+
+
+def store_population_series(conn):
+    """
+    Stores the population of every borough as one list aligned on consecutive years
+    (b.population_start_year, b.population_series), so get_growth_rates_for_boroughs
+    can compute growth between any two years with two index lookups.
+    """
+    report_progress("Storing population series...")
+    series = population_series(load_population(conn))
+    query = """
+    UNWIND $rows AS row
+    MATCH (b:Borough {name: row.borough})
+    SET b.population_start_year = row.start_year,
+        b.population_series = row.series
+    """
+    write_in_batches(conn, query, series.to_dict(orient="records"))
+    report_progress(f"Stored population series of {len(series)} boroughs.")
+
+
+def store_borough_similarity(conn):
+    """
+    Precomputes the similarity of every pair of boroughs on their business mix, population and
+    survival rates and stores it as (Borough)-[:SIMILAR_TO {score, rank}]->(Borough), one per
+    ordered pair, so the most similar boroughs of any borough are a single traversal.
+    """
+    report_progress("Precomputing borough similarity...")
+    pairs = compute_borough_similarity(load_population(conn), get_business_count_table(conn), get_survival_table(conn))
+
+    query = """
+    UNWIND $rows AS row
+    MATCH (b:Borough {name: row.borough})
+    MATCH (s:Borough {name: row.similar_borough})
+    MERGE (b)-[r:SIMILAR_TO]->(s)
+    SET r.score = row.score,
+        r.rank = row.rank
+    """
+    write_in_batches(conn, query, pairs.to_dict(orient="records"))
+    report_progress(f"Stored the similarity of {len(pairs)} borough pairs.")
+
+
+def store_colocation_analytics(conn):
+    """
+    Stores how business types are spread over the boroughs, from the rolled-up counts so the cost
+    does not grow with the number of businesses:
+    - (Borough)-[:HAS_BUSINESS_COUNT]->(BusinessType) gets the location_quotient of the type in the borough
+    - (BusinessType)-[:CO_LOCATED_WITH {lift, rank}]->(BusinessType) for the most co-located types
+    """
+    report_progress("Precomputing business co-location...")
+    counts = get_business_count_table(conn)
+    counts = counts[~counts["borough"].isin(AGGREGATE_BOROUGHS)]
+
+    quotient_query = """
+    UNWIND $rows AS row
+    MATCH (:Borough {name: row.borough})-[c:HAS_BUSINESS_COUNT]->(:BusinessType {type: row.business_type})
+    SET c.location_quotient = row.location_quotient
+    """
+    quotients = location_quotients(counts)[["borough", "business_type", "location_quotient"]]
+    write_in_batches(conn, quotient_query, quotients.to_dict(orient="records"))
+
+    colocation_query = """
+    UNWIND $rows AS row
+    MATCH (a:BusinessType {type: row.business_type})
+    MATCH (b:BusinessType {type: row.other_type})
+    MERGE (a)-[c:CO_LOCATED_WITH]->(b)
+    SET c.lift = row.lift,
+        c.rank = row.rank
+    """
+    colocations = top_colocations(counts)
+    write_in_batches(conn, colocation_query, colocations.to_dict(orient="records"))
+    report_progress(f"Stored {len(colocations)} co-located business type pairs.")
+
+
+def store_network_analytics(conn):
+    """
+    Computes the degree, closeness, betweenness and eigenvector centrality and the Louvain community
+    of every node in the NEIGHBOURS graph of each of NETWORK_LEVELS and stores them as node properties.
+    """
+    for level in NETWORK_LEVELS:
+        report_progress(f"Precomputing {level} centrality and communities...")
+        metrics = network_metrics(get_area_neighbour_pairs(conn, level))
+        query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{level} {{{NODE_KEYS[level]}: row.area}})
+        SET a.degree = row.degree,
+            a.closeness = row.closeness,
+            a.betweenness = row.betweenness,
+            a.eigenvector = row.eigenvector,
+            a.community = row.community
+        """
+        write_in_batches(conn, query, metrics.to_dict(orient="records"))
+        report_progress(f"Stored network metrics of {len(metrics)} {level} nodes.")
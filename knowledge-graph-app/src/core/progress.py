@@ -0,0 +1,28 @@
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+logger = logging.getLogger("knowledge_graph.build")
+
+# Receives every progress message of the build. The command line build keeps the default and
+# logs the messages, the Streamlit app passes st.info for the duration of a build. A context
+# variable, so builds started from different sessions (threads) never report to each other.
+_progress_callback = ContextVar("progress_callback", default=logger.info)
+
+
+@contextmanager
+def reporting_to(callback):
+    """Sends the progress messages reported inside the with block to callback; None keeps the current one."""
+    if callback is None:
+        yield
+        return
+    token = _progress_callback.set(callback)
+    try:
+        yield
+    finally:
+        _progress_callback.reset(token)
+
+
+def report_progress(message):
+    _progress_callback.get()(message)
@@ -0,0 +1,131 @@
+import pandas as pd
+from .progress import report_progress
+from .batching import write_in_batches
+from .data_importer import load_business_streets
+
+
+# Levels of the PART_OF hierarchy, from finest to coarsest.
+# (label, key property, column in the business-area frame)
+ROLLUP_LEVELS = [
+    ("LSOA", "code", "lsoa_code"),
+    ("Ward", "code", "ward_code"),
+    ("Borough", "name", "area"),
+    ("Borough", "name", "aggregate"),
+    ("Borough", "name", "region"),
+]
+
+
+def load_business_areas(test_boroughs=[]):
+    """
+    Returns one row per business with its LSOA, ward, borough and
+    Inner/Outer/Greater London aggregate, i.e. every level it rolls up into.
+    """
+    df = pd.read_csv("data/processed/businesses_with_areas.csv").drop_duplicates("osm_id")
+    if test_boroughs:
+        df = df[df["area"].isin(test_boroughs)]
+    containment = pd.read_csv("data/processed/boroughs_containment.csv")
+    df = df.merge(containment, how="left", left_on="area", right_on="borough")
+    df["region"] = "Greater London"
+    return df.dropna(subset=["fclass"])
+
+
+def compute_business_count_rollups(df):
+    """
+    Counts businesses per business type at every level of the hierarchy.
+    Each business contributes once to each of its ancestors, so a ward count equals
+    the sum of its LSOA counts and Greater London equals the sum of all boroughs.
+    Returns a DataFrame with columns: label, key, area, type, count.
+    """
+    frames = []
+    for label, key, column in ROLLUP_LEVELS:
+        counts = (
+            df.dropna(subset=[column])
+            .groupby([column, "fclass"])
+            .size()
+            .reset_index(name="count")
+            .rename(columns={column: "area", "fclass": "type"})
+        )
+        counts["label"] = label
+        counts["key"] = key
+        frames.append(counts)
+    return pd.concat(frames, ignore_index=True)
+
+
+def rollup_business_counts(conn, test_boroughs=[]):
+    """
+    Stores precomputed business counts on every level of the hierarchy:
+    - (area)-[:HAS_BUSINESS_COUNT {count}]->(BusinessType) per business type
+    - area.business_count for the total over all types
+    Density queries can then read a single relationship instead of traversing businesses.
+    """
+    report_progress("Rolling up business counts over LSOAs, wards and boroughs...")
+    rollups = compute_business_count_rollups(load_business_areas(test_boroughs))
+
+    for (label, key), group in rollups.groupby(["label", "key"], sort=False):
+        type_rows = group[["area", "type", "count"]].to_dict(orient="records")
+        type_query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{label} {{{key}: row.area}})
+        MATCH (bt:BusinessType {{type: row.type}})
+        MERGE (a)-[c:HAS_BUSINESS_COUNT]->(bt)
+        SET c.count = row.count
+        """
+        write_in_batches(conn, type_query, type_rows)
+
+        totals = group.groupby("area")["count"].sum().reset_index()
+        total_query = f"""
+        UNWIND $rows AS row
+        MATCH (a:{label} {{{key}: row.area}})
+        SET a.business_count = row.count
+        """
+        write_in_batches(conn, total_query, totals.to_dict(orient="records"))
+
+    # census residents are only published per LSOA, sum them up to wards
+    residents_query = """
+    MATCH (w:Ward)<-[:PART_OF]-(l:LSOA)
+    WITH w, sum(l.usual_residents) AS residents
+    SET w.usual_residents = residents
+    """
+    conn.query(residents_query)
+    report_progress("Business count rollups stored.")
+
+
+def compute_street_business_counts(df):
+    """
+    Counts businesses per business type on every street.
+    Returns a DataFrame with columns: street, borough, type, count.
+    """
+    return (
+        df.groupby(["street", "borough", "fclass"])
+        .size()
+        .reset_index(name="count")
+        .rename(columns={"fclass": "type"})
+    )
+
+
+def rollup_street_business_counts(conn, test_boroughs=[]):
+    """
+    Stores precomputed business counts on every street, like rollup_business_counts does for areas:
+    - (street)-[:HAS_BUSINESS_COUNT {count}]->(BusinessType) per business type
+    - street.business_count for the total over all types
+    """
+    report_progress("Rolling up business counts over streets...")
+    counts = compute_street_business_counts(load_business_streets(test_boroughs))
+
+    type_query = """
+    UNWIND $rows AS row
+    MATCH (s:Street {name: row.street, borough: row.borough})
+    MATCH (bt:BusinessType {type: row.type})
+    MERGE (s)-[c:HAS_BUSINESS_COUNT]->(bt)
+    SET c.count = row.count
+    """
+    write_in_batches(conn, type_query, counts.to_dict(orient="records"))
+
+    totals = counts.groupby(["street", "borough"])["count"].sum().reset_index()
+    total_query = """
+    UNWIND $rows AS row
+    MATCH (s:Street {name: row.street, borough: row.borough})
+    SET s.business_count = row.count
+    """
+    write_in_batches(conn, total_query, totals.to_dict(orient="records"))
+    report_progress("Street business counts stored.")
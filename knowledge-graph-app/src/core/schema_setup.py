@@ -1,4 +1,4 @@
-import streamlit as st
+from .progress import report_progress
 
 
 def create_constraints_and_indexes(conn):
@@ -6,17 +6,33 @@ def create_constraints_and_indexes(conn):
     Defines and creates constraints and indexes for the knowledge graph.
     This function should be idempotent (safe to run multiple times).
     """
-    st.info("Setting up constraints and indexes...")
+    report_progress("Setting up constraints and indexes...")
 
     # TODO: think of more constraints and indexes
     business_id_constraint = "CREATE CONSTRAINT business_unique_id IF NOT EXISTS FOR (b:Business) REQUIRE b.businessId IS UNIQUE"
+    ward_code_constraint = "CREATE CONSTRAINT ward_unique_code IF NOT EXISTS FOR (w:Ward) REQUIRE w.code IS UNIQUE"
+    lsoa_code_constraint = "CREATE CONSTRAINT lsoa_unique_code IF NOT EXISTS FOR (l:LSOA) REQUIRE l.code IS UNIQUE"
+    ratio_distribution_index = "CREATE INDEX ratio_distribution_type_year IF NOT EXISTS FOR (d:RatioDistribution) ON (d.business_type, d.year)"
+    borough_rank_index = "CREATE INDEX borough_rank_borough IF NOT EXISTS FOR (r:BoroughRank) ON (r.borough, r.metric)"
+    business_osm_id_index = "CREATE INDEX business_osm_id IF NOT EXISTS FOR (b:Business) ON (b.osmId)"
+    business_name_fulltext_index = "CREATE FULLTEXT INDEX business_name IF NOT EXISTS FOR (b:Business) ON EACH [b.name]"
+    street_name_borough_constraint = "CREATE CONSTRAINT street_unique_name_borough IF NOT EXISTS FOR (s:Street) REQUIRE (s.name, s.borough) IS UNIQUE"
+    street_borough_index = "CREATE INDEX street_borough IF NOT EXISTS FOR (s:Street) ON (s.borough)"
 
     queries = [
-        business_id_constraint
+        business_id_constraint,
+        ward_code_constraint,
+        lsoa_code_constraint,
+        ratio_distribution_index,
+        borough_rank_index,
+        business_osm_id_index,
+        business_name_fulltext_index,
+        street_name_borough_constraint,
+        street_borough_index
     ]
 
     for query in queries:
-        st.info(f"Executing: {query}")
+        report_progress(f"Executing: {query}")
         conn.query(query)
 
-    st.info("Constraints and indexes setup complete.")
+    report_progress("Constraints and indexes setup complete.")
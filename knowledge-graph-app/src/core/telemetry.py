@@ -0,0 +1,162 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import psutil
+
+
+BUILD_REPORT_PATH = "data/processed/build_report.json"
+
+# Update counters returned by Neo4j in the summary of every query
+COUNTER_NAMES = [
+    "nodes_created",
+    "nodes_deleted",
+    "relationships_created",
+    "relationships_deleted",
+    "properties_set",
+    "labels_added",
+    "indexes_added",
+    "indexes_removed",
+    "constraints_added",
+    "constraints_removed",
+]
+
+logger = logging.getLogger("knowledge_graph.build")
+
+
+class PeakMemorySampler:
+    """Samples the resident set size of this process in a background thread and keeps the maximum."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+class InstrumentedConnection:
+    """
+    Wraps a Neo4jConnection and adds up, per build stage, the number of queries, the rows sent
+    as list parameters (the UNWIND $rows batches) and the update counters of each query summary.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.stage = None
+
+    def start_stage(self):
+        self.stage = {"queries": 0, "failed_queries": 0, "rows_sent": 0, **{name: 0 for name in COUNTER_NAMES}}
+
+    def query(self, query, parameters=None, db=None):
+        result = self.conn.query(query, parameters, db)
+        if self.stage is not None:
+            self.stage["queries"] += 1
+            if parameters:
+                self.stage["rows_sent"] += sum(len(v) for v in parameters.values() if isinstance(v, list))
+            if result is None or result[0] is None:
+                self.stage["failed_queries"] += 1
+            elif result[1] is not None:
+                counters = result[1].counters
+                for name in COUNTER_NAMES:
+                    self.stage[name] += getattr(counters, name, 0)
+        return result
+
+    def query_df(self, query, parameters=None, db=None):
+        # the driver builds the DataFrame from the records and does not return the summary
+        df = self.conn.query_df(query, parameters, db)
+        if self.stage is not None:
+            self.stage["queries"] += 1
+            if df is None:
+                self.stage["failed_queries"] += 1
+        return df
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def run_stage(conn, name, stage, test_boroughs):
+    """
+    Runs one build stage on an InstrumentedConnection and returns (record, error): the stage's
+    wall time, rows sent, update counters, throughput and peak client memory, and the exception
+    raised by the stage (None when it succeeded), so failed stages still appear in the report.
+    """
+    conn.start_stage()
+    error = None
+    start = time.perf_counter()
+    with PeakMemorySampler() as memory:
+        try:
+            stage(conn, test_boroughs)
+        except Exception as e:
+            error = e
+    seconds = time.perf_counter() - start
+
+    record = {
+        "stage": name,
+        "seconds": round(seconds, 4),
+        **conn.stage,
+        "rows_per_second": round(conn.stage["rows_sent"] / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": round(memory.peak / 2 ** 20, 1),
+        "error": f"{type(error).__name__}: {error}" if error else None,
+    }
+    conn.stage = None
+    logger.log(logging.ERROR if error else logging.INFO, json.dumps({"event": "build_stage", **record}))
+    return record, error
+
+
+def summarize_build(stages, started_at, test_boroughs, skipped_stages=()):
+    """
+    Builds the report stored after each build: the stage records plus totals over all stages.
+    skipped_stages are the stages a resumed build did not have to run again.
+    """
+    totals = {
+        key: sum(s[key] for s in stages)
+        for key in ["seconds", "queries", "failed_queries", "rows_sent", *COUNTER_NAMES]
+    }
+    totals["seconds"] = round(totals["seconds"], 4)
+    totals["peak_rss_mb"] = max((s["peak_rss_mb"] or 0 for s in stages), default=None)
+    return {
+        "started_at": started_at,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "test_boroughs": list(test_boroughs),
+        "succeeded": all(s["error"] is None for s in stages),
+        "skipped_stages": list(skipped_stages),
+        "totals": totals,
+        "stages": stages,
+    }
+
+
+def save_build_report(report, path=BUILD_REPORT_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(json.dumps({"event": "build_report", "path": path, **report["totals"]}))
+
+
+def load_build_report(path=BUILD_REPORT_PATH):
+    """Returns the report of the last build, or None if no build has been run from this folder."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
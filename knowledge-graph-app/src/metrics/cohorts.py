@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from .ranks import SURVIVAL_RATE_COLUMNS
+
+
+# Aggregate every borough is compared against
+REFERENCE_AREA = "Greater London"
+
+
+def survival_cube(survival):
+    """
+    Turns the survival table into a dense borough x cohort year x survival period cube.
+    A cohort is the businesses started in one year, period k is the share (%) still active k years later.
+
+    Returns a dict with:
+        boroughs: sorted borough names
+        years: sorted cohort years
+        periods: survival periods in years (1..5)
+        births: borough x year array of businesses started
+        rates: borough x year x period array of survival rates, NaN where nothing was published
+    """
+    boroughs, borough_idx = np.unique(survival["borough"].to_numpy(dtype=str), return_inverse=True)
+    years, year_idx = np.unique(survival["year"].to_numpy(dtype=int), return_inverse=True)
+    births = np.full((len(boroughs), len(years)), np.nan)
+    births[borough_idx, year_idx] = survival["businesses_started"].to_numpy(dtype=float)
+    rates = np.full((len(boroughs), len(years), len(SURVIVAL_RATE_COLUMNS)), np.nan)
+    rates[borough_idx, year_idx] = survival[SURVIVAL_RATE_COLUMNS].to_numpy(dtype=float)
+    return {
+        "boroughs": boroughs,
+        "years": years,
+        "periods": np.arange(1, len(SURVIVAL_RATE_COLUMNS) + 1),
+        "births": births,
+        "rates": rates,
+    }
+
+
+def survival_curves(cube):
+    """
+    Survival curve of every cohort: the share (%) of businesses still active after 0..5 years,
+    starting at 100. Returns a borough x year x (period + 1) array.
+    """
+    rates = cube["rates"]
+    start = np.full(rates.shape[:2] + (1,), 100.0)
+    return np.concatenate([start, rates], axis=2)
+
+
+def conditional_survival(cube):
+    """
+    Share (%) of the businesses still active after k - 1 years that also survive year k,
+    i.e. the year-by-year survival hidden in the cumulative rates. Borough x year x period.
+    """
+    curves = survival_curves(cube)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return curves[:, :, 1:] / curves[:, :, :-1] * 100
+
+
+def year_over_year_changes(cube):
+    """
+    Change (percentage points) of every survival rate against the cohort of the previous year.
+    NaN for the first year and wherever the years are not consecutive. Borough x year x period.
+    """
+    rates = cube["rates"]
+    changes = np.full_like(rates, np.nan)
+    consecutive = np.diff(cube["years"]) == 1
+    changes[:, 1:][:, consecutive] = (rates[:, 1:] - rates[:, :-1])[:, consecutive]
+    return changes
+
+
+def reference_comparison(cube, reference=REFERENCE_AREA):
+    """
+    Difference (percentage points) between the survival rates of every borough and the reference area,
+    per cohort year and period. All NaN when the reference area is not in the cube.
+    """
+    rates = cube["rates"]
+    matches = np.flatnonzero(cube["boroughs"] == reference)
+    if len(matches) == 0:
+        return np.full_like(rates, np.nan)
+    return rates - rates[matches[0]]
+
+
+def cube_frame(cube, values, name, periods=None):
+    """
+    Long DataFrame with columns borough, year, period and <name> of a borough x year x period array,
+    e.g. for charts. Cells without a value are dropped.
+    """
+    periods = cube["periods"] if periods is None else np.asarray(periods)
+    borough_idx, year_idx, period_idx = np.indices(values.shape).reshape(3, -1)
+    df = pd.DataFrame({
+        "borough": cube["boroughs"][borough_idx],
+        "year": cube["years"][year_idx],
+        "period": periods[period_idx],
+        name: values.reshape(-1),
+    })
+    return df.dropna(subset=[name]).reset_index(drop=True)
+
+
+def survival_trend(cube, borough, reference=REFERENCE_AREA):
+    """
+    Survival rates of one borough and the reference area for every cohort year and period.
+    Returns a DataFrame with columns year, period, rate, reference_rate, difference, change
+    (change is against the previous cohort year).
+    """
+    columns = ["year", "period", "rate", "reference_rate", "difference", "change"]
+    matches = np.flatnonzero(cube["boroughs"] == borough)
+    if len(matches) == 0:
+        return pd.DataFrame(columns=columns)
+    selected = {**cube, "boroughs": cube["boroughs"][matches]}
+    df = cube_frame(selected, cube["rates"][matches], "rate")
+    year_idx = np.searchsorted(cube["years"], df["year"].to_numpy())
+    period_idx = df["period"].to_numpy() - cube["periods"][0]
+    df["difference"] = reference_comparison(cube, reference)[matches[0], year_idx, period_idx]
+    df["reference_rate"] = df["rate"] - df["difference"]
+    df["change"] = year_over_year_changes(cube)[matches[0], year_idx, period_idx]
+    return df[columns]
+
+
+def cohort_curves(cube, borough):
+    """
+    Survival curves (0..5 years) of every cohort of one borough.
+    Returns a DataFrame with columns year, period, rate.
+    """
+    matches = np.flatnonzero(cube["boroughs"] == borough)
+    if len(matches) == 0:
+        return pd.DataFrame(columns=["year", "period", "rate"])
+    selected = {**cube, "boroughs": cube["boroughs"][matches]}
+    curves = survival_curves(cube)[matches]
+    df = cube_frame(selected, curves, "rate", periods=np.arange(curves.shape[2]))
+    # cohorts without any published rate only have the starting 100
+    published = df.groupby("year")["rate"].transform("size") > 1
+    return df.loc[published, ["year", "period", "rate"]].reset_index(drop=True)
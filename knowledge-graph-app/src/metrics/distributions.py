@@ -0,0 +1,97 @@
+import numpy as np
+from .metrics import AGGREGATE_BOROUGHS
+
+
+QUANTILE_LEVELS = [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+N_HIST_BINS = 48
+N_KDE_POINTS = 128
+
+
+def make_grid(values):
+    """
+    Builds the grid shared by all business types and years: log-spaced histogram edges and
+    KDE evaluation points spanning whole decades around the observed ratios.
+    Ratios of different business types differ by orders of magnitude, so a log grid keeps
+    the resolution useful for every type without clipping the long tail.
+    """
+    positive = values[values > 0]
+    lo = np.floor(np.log10(positive.min())) if len(positive) else 0.0
+    hi = np.ceil(np.log10(positive.max())) if len(positive) else 1.0
+    hi = max(hi, lo + 1)
+    return {
+        "quantile_levels": QUANTILE_LEVELS,
+        "hist_edges": np.logspace(lo, hi, N_HIST_BINS + 1),
+        "kde_grid": np.logspace(lo, hi, N_KDE_POINTS),
+    }
+
+
+def gaussian_kde_log(values, grid):
+    """
+    Gaussian KDE of log10(values) with Scott's bandwidth, evaluated at log10(grid).
+    The result is a density per unit of log10, so curves of different types are comparable.
+    """
+    x = np.log10(values)
+    if len(x) < 2 or np.std(x, ddof=1) == 0:
+        return np.zeros(len(grid))
+    bandwidth = np.std(x, ddof=1) * len(x) ** (-1 / 5)
+    z = (np.log10(grid)[:, None] - x[None, :]) / bandwidth
+    return np.exp(-0.5 * z ** 2).sum(axis=1) / (len(x) * bandwidth * np.sqrt(2 * np.pi))
+
+
+def compute_ratio_distributions(metrics):
+    """
+    Computes quantiles, fixed-edge histogram counts and a KDE curve of the people-per-business
+    ratio over boroughs for every business type and year.
+    Boroughs without a business of the type (no finite ratio) and aggregate boroughs are excluded.
+    Returns (grid, rows) where rows is a list of dicts ready to be stored per (type, year).
+    """
+    df = metrics[~metrics["borough"].isin(AGGREGATE_BOROUGHS) & (metrics["people_per_business"] > 0)]
+    df = df[["business_type", "year", "people_per_business"]].copy()
+    grid = make_grid(df["people_per_business"].to_numpy())
+    if df.empty:
+        return grid, []
+    keys = ["business_type", "year"]
+
+    grouped = df.groupby(keys)["people_per_business"]
+    quantiles = grouped.quantile(QUANTILE_LEVELS).unstack()
+    summary = grouped.agg(["count", "mean"])
+
+    edges = grid["hist_edges"]
+    df["bin"] = np.clip(np.searchsorted(edges, df["people_per_business"], side="left") - 1, 0, N_HIST_BINS - 1)
+    hist = (
+        df.groupby([*keys, "bin"]).size()
+        .unstack(fill_value=0)
+        .reindex(columns=range(N_HIST_BINS), fill_value=0)
+    )
+
+    kde = grouped.apply(lambda v: gaussian_kde_log(v.to_numpy(), grid["kde_grid"]))
+
+    rows = []
+    for key in summary.index:
+        rows.append({
+            "business_type": key[0],
+            "year": int(key[1]),
+            "count": int(summary.loc[key, "count"]),
+            "mean": float(summary.loc[key, "mean"]),
+            "quantiles": quantiles.loc[key].astype(float).tolist(),
+            "hist_counts": hist.loc[key].astype(int).tolist(),
+            "kde_density": kde.loc[key].astype(float).tolist(),
+        })
+    return grid, rows
+
+
+def merge_bins(edges, counts, n_bins):
+    """
+    Trims empty bins at both ends and merges adjacent fixed-edge bins into about n_bins wider bins.
+    counts may be one histogram or a 2D array with one histogram per row (sharing the edges).
+    Returns (edges, counts) of the merged histogram, counts always 2D.
+    """
+    counts = np.atleast_2d(np.asarray(counts))
+    edges = np.asarray(edges)
+    nonzero = np.flatnonzero(counts.sum(axis=0))
+    if len(nonzero):
+        first, last = nonzero[0], nonzero[-1] + 1
+        counts, edges = counts[:, first:last], edges[first:last + 1]
+    n_bins = min(n_bins, counts.shape[1])
+    starts = np.unique(np.linspace(0, counts.shape[1], n_bins + 1).astype(int)[:-1])
+    return np.append(edges[starts], edges[-1]), np.add.reduceat(counts, starts, axis=1)
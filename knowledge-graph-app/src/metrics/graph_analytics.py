@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+
+# Number of most co-located business types kept per business type
+COLOCATION_TOP_K = 10
+
+# Graphs with more nodes than this estimate betweenness and closeness from this many sampled source nodes
+CENTRALITY_SAMPLE_SIZE = 500
+
+# Power iteration limits of eigenvector centrality; planar neighbour graphs converge slowly
+EIGENVECTOR_MAX_ITER = 100000
+EIGENVECTOR_TOLERANCE = 1e-10
+
+
+def count_matrix(counts, area_col="borough", type_col="business_type", value_col="business_count"):
+    """
+    Area x business type matrix of business counts, built from integer codes in one scatter-add.
+    Returns (areas, types, matrix).
+    """
+    areas, area_idx = np.unique(counts[area_col].to_numpy(dtype=str), return_inverse=True)
+    types, type_idx = np.unique(counts[type_col].to_numpy(dtype=str), return_inverse=True)
+    matrix = np.zeros((len(areas), len(types)))
+    np.add.at(matrix, (area_idx, type_idx), counts[value_col].to_numpy(dtype=float))
+    return areas, types, matrix
+
+
+def location_quotients(counts, area_col="borough"):
+    """
+    Adds a location_quotient column: the share of a business type among an area's businesses
+    divided by its share among all businesses (above 1 means the type is concentrated in the area).
+    """
+    df = counts.copy()
+    area_totals = df.groupby(area_col)["business_count"].transform("sum")
+    type_totals = df.groupby("business_type")["business_count"].transform("sum")
+    df["location_quotient"] = (df["business_count"] / area_totals) / (type_totals / df["business_count"].sum())
+    return df
+
+
+def colocation_lift(counts, area_col="borough"):
+    """
+    Co-location lift of every pair of business types over the areas: how much more likely a business
+    picked from the area of a business of type a is of type b, than a business picked anywhere.
+    lift(a, b) = N * sum_area(c[area, a] * c[area, b] / n[area]) / (c[a] * c[b]), symmetric, 1 = independent.
+    Returns (types, lift matrix).
+    """
+    _, types, matrix = count_matrix(counts, area_col)
+    area_totals = matrix.sum(axis=1)
+    type_totals = matrix.sum(axis=0)
+    shares = np.divide(matrix, area_totals[:, None], out=np.zeros_like(matrix), where=area_totals[:, None] > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lift = area_totals.sum() * (matrix.T @ shares) / np.outer(type_totals, type_totals)
+    return types, np.nan_to_num(lift)
+
+
+def top_colocations(counts, k=COLOCATION_TOP_K, area_col="borough"):
+    """
+    The k business types most co-located with every business type.
+    Returns a DataFrame with columns business_type, other_type, lift, rank (1 = highest lift).
+    """
+    columns = ["business_type", "other_type", "lift", "rank"]
+    if counts.empty:
+        return pd.DataFrame(columns=columns)
+    types, lift = colocation_lift(counts, area_col)
+    np.fill_diagonal(lift, -np.inf)
+    k = min(k, len(types) - 1)
+    # the k highest lifts of every row, without sorting the whole row
+    top = np.argpartition(-lift, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(types), 0), dtype=int)
+    rows = np.repeat(np.arange(len(types)), top.shape[1])
+    df = pd.DataFrame({
+        "business_type": types[rows],
+        "other_type": types[top.ravel()],
+        "lift": lift[rows, top.ravel()],
+    })
+    df["rank"] = df.groupby("business_type")["lift"].rank(method="first", ascending=False).astype(int)
+    return df.sort_values(["business_type", "rank"]).reset_index(drop=True)[columns]
+
+
+def eigenvector_centrality(graph, nodes, max_iter=EIGENVECTOR_MAX_ITER, tol=EIGENVECTOR_TOLERANCE):
+    """
+    Eigenvector centrality of nodes, unit length, by the power iteration of networkx.eigenvector_centrality
+    (on A + I, stopping when the values change by less than tol per node). The product with the adjacency
+    matrix is summed over the edge list, so each iteration costs time and memory in the number of edges.
+    """
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.array([(index[a], index[b]) for a, b in graph.edges], dtype=int).reshape(-1, 2)
+    sources = np.concatenate([edges[:, 0], edges[:, 1]])
+    targets = np.concatenate([edges[:, 1], edges[:, 0]])
+    n = len(nodes)
+    x = np.full(n, 1 / np.sqrt(n))
+    for _ in range(max_iter):
+        previous = x
+        x = x + np.bincount(sources, weights=x[targets], minlength=n)
+        x /= np.linalg.norm(x)
+        if np.abs(x - previous).sum() < n * tol:
+            return x
+    raise RuntimeError(f"Eigenvector centrality did not converge within {max_iter} iterations.")
+
+
+def sampled_closeness(graph, sample_size=CENTRALITY_SAMPLE_SIZE, seed=0):
+    """
+    Closeness centrality as networkx computes it (scaled by the share of nodes reachable), with the
+    mean distance of every node estimated from breadth-first searches out of sample_size random sources,
+    like sampled betweenness. Exact for graphs of at most sample_size nodes.
+    Returns a dict node -> closeness.
+    """
+    import networkx as nx
+
+    n = graph.number_of_nodes()
+    if n <= sample_size:
+        return nx.closeness_centrality(graph)
+    distance_sums = dict.fromkeys(graph, 0)
+    reached_by = dict.fromkeys(graph, 0)
+    sources = np.random.default_rng(seed).choice(np.array(list(graph), dtype=object), sample_size, replace=False)
+    for source in sources:
+        for node, distance in nx.single_source_shortest_path_length(graph, source).items():
+            distance_sums[node] += distance
+            reached_by[node] += 1
+    # a node is not at distance 0 from itself in the mean
+    for source in sources:
+        reached_by[source] -= 1
+
+    closeness = {}
+    for component in nx.connected_components(graph):
+        reachable = len(component) - 1
+        for node in component:
+            if reachable == 0:
+                closeness[node] = 0.0
+            elif reached_by[node] == 0:
+                # no sampled source in this (small) component
+                closeness[node] = nx.closeness_centrality(graph, u=node)
+            else:
+                mean_distance = distance_sums[node] / reached_by[node]
+                closeness[node] = reachable / (n - 1) / mean_distance
+    return closeness
+
+
+def network_metrics(pairs, sample_size=CENTRALITY_SAMPLE_SIZE, seed=0):
+    """
+    Centrality and community of every area in the NEIGHBOURS graph given by pairs (columns area, neighbour).
+    - degree: number of neighbours
+    - closeness, betweenness: networkx closeness and betweenness centrality, both estimated from
+      sample_size sampled source nodes on larger graphs
+    - eigenvector: eigenvector centrality by power iteration, unit length
+    - community: Louvain community, numbered from the largest (0)
+    Every step works on the adjacency lists, so the cost grows with the number of neighbour pairs
+    rather than with the square of the number of areas.
+    Returns a DataFrame with columns area, degree, closeness, betweenness, eigenvector, community.
+    """
+    import networkx as nx
+
+    columns = ["area", "degree", "closeness", "betweenness", "eigenvector", "community"]
+    if pairs.empty:
+        return pd.DataFrame(columns=columns)
+    graph = nx.from_pandas_edgelist(pairs, "area", "neighbour")
+    nodes = list(graph.nodes)
+    n = len(nodes)
+
+    eigenvector = eigenvector_centrality(graph, nodes)
+    betweenness = nx.betweenness_centrality(graph, k=sample_size if n > sample_size else None, seed=seed)
+    closeness = sampled_closeness(graph, sample_size, seed)
+    communities = sorted(nx.community.louvain_communities(graph, seed=seed), key=len, reverse=True)
+    community = {node: i for i, members in enumerate(communities) for node in members}
+
+    return pd.DataFrame({
+        "area": nodes,
+        "degree": [graph.degree[node] for node in nodes],
+        "closeness": [closeness[node] for node in nodes],
+        "betweenness": [betweenness[node] for node in nodes],
+        "eigenvector": eigenvector,
+        "community": [community[node] for node in nodes],
+    })[columns]
@@ -0,0 +1,62 @@
+import streamlit as st
+from queries.queries import (
+    get_graph_version,
+    get_population_table,
+    get_business_count_table,
+    get_neighbour_pairs,
+    get_distribution_grid,
+    get_ratio_distributions,
+    get_survival_table
+)
+from .metrics import compute_borough_metrics
+from .cohorts import survival_cube
+
+
+# Cached loaders used by the pages. The computations themselves live in the other metrics
+# modules, which do not import Streamlit so the headless build can use them.
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_metrics(_conn, graph_version):
+    population = get_population_table(_conn)
+    counts = get_business_count_table(_conn)
+    neighbours = get_neighbour_pairs(_conn)
+    return population, compute_borough_metrics(population, counts, neighbours)
+
+
+def load_metrics(conn):
+    """
+    Returns (population, metrics) DataFrames for the whole graph.
+    Computed once per graph version and shared by all pages and sessions.
+    """
+    return _load_metrics(conn, get_graph_version(conn))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_ratio_distributions(_conn, graph_version):
+    grid = get_distribution_grid(_conn)
+    rows = get_ratio_distributions(_conn)
+    if not rows.empty:
+        rows = rows.set_index(["business_type", "year"]).sort_index()
+    return grid, rows
+
+
+def load_ratio_distributions(conn):
+    """
+    Returns (grid, distributions) as stored by the build, cached per graph version.
+    distributions is indexed by (business_type, year).
+    """
+    return _load_ratio_distributions(conn, get_graph_version(conn))
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_survival_cube(_conn, graph_version):
+    return survival_cube(get_survival_table(_conn))
+
+
+def load_survival_cube(conn):
+    """
+    Returns the survival cube of all boroughs and cohort years, read in one query
+    and computed once per graph version.
+    """
+    return _load_survival_cube(conn, get_graph_version(conn))
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+
+AGGREGATE_BOROUGHS = ["Inner London", "Outer London", "Greater London"]
+
+
+def people_per_business(population, counts):
+    """
+    Computes the people-per-business ratio for every borough x business type x year.
+
+    Parameters:
+        population: DataFrame with columns borough, year, population
+        counts: DataFrame with columns borough, business_type, business_count
+
+    Returns:
+        DataFrame with columns borough, business_type, year, population, business_count,
+        people_per_business (NaN where a borough has no business of that type)
+    """
+    types = counts["business_type"].drop_duplicates()
+    grid = population.merge(types.to_frame(), how="cross")
+    df = grid.merge(counts, how="left", on=["borough", "business_type"])
+    df["business_count"] = df["business_count"].fillna(0).astype(int)
+    df["people_per_business"] = df["population"] / df["business_count"].replace(0, np.nan)
+    return df
+
+
+def population_series(population):
+    """
+    Aligns the population of every borough on consecutive years, so the population of a year is
+    at index year - start_year and growth between any two years is two list lookups.
+    Returns a DataFrame with columns borough, start_year, series (list, NaN for missing years).
+    """
+    pivot = population.pivot(index="borough", columns="year", values="population")
+    if pivot.empty:
+        return pd.DataFrame(columns=["borough", "start_year", "series"])
+    years = range(int(pivot.columns.min()), int(pivot.columns.max()) + 1)
+    values = pivot.reindex(columns=years).to_numpy(dtype=float)
+    return pd.DataFrame({
+        "borough": pivot.index,
+        "start_year": years.start,
+        "series": values.tolist(),
+    })
+
+
+def add_ranks(df, value_col, group_cols, ascending):
+    """
+    Ranks the rows within each group on value_col and adds the columns:
+    - rank        dense rank; 1 is the smallest value when ascending, the highest value otherwise
+    - percentile  share (%) of the group ranked at or behind the row, so rank 1 has percentile 100
+    - total       number of ranked rows in the group
+    Rows without a value get no rank. The direction is explicit so every caller states what counts as best.
+    """
+    grouped = df.groupby(list(group_cols))[value_col]
+    df["rank"] = grouped.rank(method="dense", ascending=ascending).astype("Int64")
+    df["percentile"] = grouped.rank(method="max", pct=True, ascending=not ascending) * 100
+    df["total"] = grouped.transform("count").astype(int)
+    return df
+
+
+def add_neighbour_comparison(df, neighbours, value_col, group_cols):
+    """
+    Adds the mean of value_col over each borough's neighbours ('<value_col>_neighbour_mean')
+    and the borough's difference to it ('<value_col>_vs_neighbours').
+
+    Parameters:
+        neighbours: DataFrame with columns borough, neighbour (one row per direction)
+        group_cols: columns identifying one comparison, e.g. ['business_type', 'year']
+    """
+    values = df[["borough", *group_cols, value_col]].rename(
+        columns={"borough": "neighbour", value_col: "neighbour_value"}
+    )
+    joined = neighbours.merge(values, on="neighbour")
+    means = (
+        joined.groupby(["borough", *group_cols])["neighbour_value"]
+        .mean()
+        .rename(f"{value_col}_neighbour_mean")
+        .reset_index()
+    )
+    df = df.merge(means, how="left", on=["borough", *group_cols])
+    df[f"{value_col}_vs_neighbours"] = df[value_col] - df[f"{value_col}_neighbour_mean"]
+    return df
+
+
+def compute_borough_metrics(population, counts, neighbours):
+    """
+    Computes ratios, ranks and neighbour comparisons for all boroughs x types x years.
+    Aggregate boroughs (Inner/Outer/Greater London) are kept in the frame but excluded from ranks.
+    """
+    df = people_per_business(population, counts)
+    is_borough = ~df["borough"].isin(AGGREGATE_BOROUGHS)
+    # ranked like the stored BoroughRank nodes: rank 1 has the most people per business, i.e. the least competition
+    boroughs = add_ranks(df[is_borough].copy(), "people_per_business", ["business_type", "year"], ascending=False)
+    df = pd.concat([boroughs, df[~is_borough]], ignore_index=True)
+    return add_neighbour_comparison(df, neighbours, "people_per_business", ["business_type", "year"])
+
+
+def ratio_table(metrics, business_type, year, boroughs=None):
+    """
+    Returns the rows of the metrics frame for one business type and year, optionally
+    restricted to (and ordered like) a list of boroughs.
+    """
+    df = metrics[(metrics["business_type"] == business_type) & (metrics["year"] == year)]
+    if boroughs is not None:
+        df = df.set_index("borough").reindex(list(boroughs)).reset_index()
+    return df
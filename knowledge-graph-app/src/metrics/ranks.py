@@ -0,0 +1,60 @@
+import pandas as pd
+from .metrics import AGGREGATE_BOROUGHS, add_ranks
+
+
+SURVIVAL_RATE_COLUMNS = [
+    "one_year_rate",
+    "two_year_rate",
+    "three_year_rate",
+    "four_year_rate",
+    "five_year_rate"
+]
+
+
+def population_growth(population):
+    """
+    Year-over-year population growth (%) of every borough, joined on the previous year
+    so gaps in the series never produce a multi-year change.
+    Returns a DataFrame with columns borough, year, value.
+    """
+    previous = population.assign(year=population["year"] + 1).rename(columns={"population": "previous"})
+    df = population.merge(previous, on=["borough", "year"])
+    df["value"] = (df["population"] - df["previous"]) / df["previous"] * 100
+    return df[["borough", "year", "value"]]
+
+
+def compute_rank_table(population, survival, ratios):
+    """
+    Computes the rank and percentile of every borough on every metric and year, rank 1 being the
+    highest value (see add_ranks):
+    - survival:<period>            survival rates per period (higher is better)
+    - people_per_business:<type>   people per business of a type (higher means less competition)
+    - population_growth            year-over-year population growth
+    Aggregate boroughs are not ranked.
+
+    Parameters:
+        population: DataFrame with columns borough, year, population
+        survival: DataFrame with columns borough, year and the survival rate columns
+        ratios: DataFrame with columns borough, business_type, year, people_per_business
+
+    Returns:
+        DataFrame with columns borough, metric, year, value, rank, percentile, total
+    """
+    survival_long = survival.melt(
+        id_vars=["borough", "year"], value_vars=SURVIVAL_RATE_COLUMNS,
+        var_name="metric", value_name="value"
+    )
+    survival_long["metric"] = "survival:" + survival_long["metric"]
+
+    ratio_long = ratios.rename(columns={"people_per_business": "value"})
+    ratio_long["metric"] = "people_per_business:" + ratio_long["business_type"]
+
+    growth = population_growth(population)
+    growth["metric"] = "population_growth"
+
+    columns = ["borough", "metric", "year", "value"]
+    df = pd.concat([survival_long[columns], ratio_long[columns], growth[columns]], ignore_index=True)
+    df = df[~df["borough"].isin(AGGREGATE_BOROUGHS)].dropna(subset=["value"])
+    df["year"] = df["year"].astype(int)
+    df = add_ranks(df.reset_index(drop=True), "value", ["metric", "year"], ascending=False)
+    return df.astype({"rank": int})
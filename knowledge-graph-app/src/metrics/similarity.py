@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from .metrics import AGGREGATE_BOROUGHS
+from .ranks import SURVIVAL_RATE_COLUMNS
+
+
+# Year of the population features; the business data is a snapshot of this year
+SIMILARITY_YEAR = 2025
+
+# Weight of the population and survival features relative to the business mix (which has weight 1)
+PROFILE_WEIGHT = 0.5
+
+# Number of most similar boroughs shown per borough
+SIMILARITY_TOP_K = 5
+
+
+def business_mix(counts):
+    """
+    Share of every business type among a borough's businesses.
+    Returns a borough x business type DataFrame whose rows sum to 1.
+    """
+    mix = counts.pivot_table(index="borough", columns="business_type", values="business_count", aggfunc="sum", fill_value=0)
+    return mix.div(mix.sum(axis=1).replace(0, np.nan), axis=0).fillna(0)
+
+
+def borough_profile(population, survival, year=SIMILARITY_YEAR):
+    """
+    Population and survival features of every borough, z-scored over the boroughs:
+    log population and 5-year population growth up to year (the last available year if year is missing),
+    and the mean of every survival rate over all cohorts.
+    Returns a borough x feature DataFrame, missing features are 0 (the mean).
+    """
+    pivot = population.pivot(index="borough", columns="year", values="population")
+    year = year if year in pivot.columns else pivot.columns.max()
+    features = pd.DataFrame({"log_population": np.log(pivot[year])})
+    if year - 5 in pivot.columns:
+        features["population_growth"] = (pivot[year] - pivot[year - 5]) / pivot[year - 5]
+    survival_means = survival.groupby("borough")[SURVIVAL_RATE_COLUMNS].mean()
+    features = features.join(survival_means, how="outer")
+    features = (features - features.mean()) / features.std(ddof=0).replace(0, np.nan)
+    return features.fillna(0)
+
+
+def similarity_matrix(mix, profile, profile_weight=PROFILE_WEIGHT):
+    """
+    Cosine similarity between the feature vectors of all boroughs. A vector is the business mix
+    scaled to unit length followed by the profile features scaled to profile_weight length,
+    so both parts count independently of their number of dimensions.
+    Returns a symmetric borough x borough DataFrame (1 on the diagonal).
+    """
+    boroughs = mix.index.intersection(profile.index)
+    parts = []
+    for frame, weight in ((mix, 1.0), (profile, profile_weight)):
+        values = frame.loc[boroughs].to_numpy(dtype=float)
+        norms = np.linalg.norm(values, axis=1, keepdims=True)
+        parts.append(np.divide(values, norms, out=np.zeros_like(values), where=norms > 0) * weight)
+    vectors = np.hstack(parts)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+    return pd.DataFrame(vectors @ vectors.T, index=boroughs, columns=boroughs)
+
+
+def compute_borough_similarity(population, counts, survival):
+    """
+    Similarity of every pair of boroughs, aggregate boroughs excluded.
+
+    Returns:
+        DataFrame with columns borough, similar_borough, score, rank (1 = most similar), one row per ordered pair
+    """
+    counts = counts[~counts["borough"].isin(AGGREGATE_BOROUGHS)]
+    population = population[~population["borough"].isin(AGGREGATE_BOROUGHS)]
+    survival = survival[~survival["borough"].isin(AGGREGATE_BOROUGHS)]
+    if counts.empty or population.empty:
+        return pd.DataFrame(columns=["borough", "similar_borough", "score", "rank"])
+    matrix = similarity_matrix(business_mix(counts), borough_profile(population, survival))
+
+    pairs = matrix.rename_axis(index="borough", columns="similar_borough").stack().rename("score").reset_index()
+    pairs = pairs[pairs["borough"] != pairs["similar_borough"]]
+    pairs["rank"] = pairs.groupby("borough")["score"].rank(method="first", ascending=False).astype(int)
+    return pairs.sort_values(["borough", "rank"]).reset_index(drop=True)
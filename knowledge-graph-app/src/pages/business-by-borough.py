@@ -1,11 +1,16 @@
 import streamlit as st
 from queries.queries import (
-    get_population_for_boroughs_in_range, get_years, get_borough_and_neighbours,
-    get_population_for_boroughs, get_business_count_for_boroughs,
-    get_business_survival_rates_for_boroughs, get_all_boroughs, get_all_business_types
+    get_years, get_borough_and_neighbours, get_graph_version,
+    get_business_survival_rates_for_boroughs, get_all_boroughs, get_all_business_types,
+    get_growth_rates_for_boroughs, get_saturated_businesses, get_similar_boroughs,
+    get_colocated_business_types, get_densest_streets, get_competition_radii
 )
+from metrics.metrics import ratio_table
+from metrics.loaders import load_metrics
+from metrics.similarity import SIMILARITY_TOP_K
 from visualizations.borough_business_graph import plot_borough_scatter
 from visualizations.bar_chart import plot_generic_barchart
+from visualizations.figure_cache import cached_figure
 from connect import get_connection
 import pandas as pd
 
@@ -26,37 +31,58 @@ all_borough_names = get_all_boroughs(conn)
 neighbour_borough_names = get_borough_and_neighbours(conn, borough)
 # filter the boroughs to not use 'City of London', 'Inner London', 'Outer London'
 all_borough_names = [b for b in all_borough_names if b not in ["City of London", "Inner London", "Outer London", "Greater London"]]
-populations = get_population_for_boroughs(conn, all_borough_names, year)
-business_counts = get_business_count_for_boroughs(conn, all_borough_names, business_type)
+_, metrics = load_metrics(conn)
+graph_version = get_graph_version(conn)
 
-data1 = []
-for b in all_borough_names:
-    pop = populations.get(b, 0)
-    bus = business_counts.get(b, 0)
-    ratio = (pop / bus) if bus else 0  # per 10,000 people
-    data1.append({
-        "borough": b,
-        "population": pop,
-        "business_count": bus,
-        "business_to_population_ratio": ratio,
-    })
 
-data2 = []
-for b in neighbour_borough_names:
-    pop = populations.get(b, 0)
-    bus = business_counts.get(b, 0)
-    ratio = (pop / bus) if bus else 0  # per 10,000 people
-    data2.append({
-        "borough": b,
-        "population": pop,
-        "business_count": bus,
-        "business_to_population_ratio": ratio,
-    })
+def to_chart_rows(df):
+    """Shapes metric rows for the borough charts, using 0 where population or businesses are missing."""
+    return pd.DataFrame({
+        "borough": df["borough"],
+        "population": df["population"].fillna(0),
+        "business_count": df["business_count"].fillna(0).astype(int),
+        "business_to_population_ratio": df["people_per_business"].fillna(0),
+    }).to_dict(orient="records")
+
+
+data1 = to_chart_rows(ratio_table(metrics, business_type, year, all_borough_names))
+data2 = to_chart_rows(ratio_table(metrics, business_type, year, neighbour_borough_names))
 
 st.subheader(f"Business Density and Population size ({year} - {business_type.capitalize()}s - {borough.capitalize()})")
-fig2 = plot_borough_scatter(data1, borough)
+fig2 = cached_figure(plot_borough_scatter, data1, borough, graph_version=graph_version)
 st.plotly_chart(fig2, use_container_width=True)
 
+# --- Rank among boroughs and comparison with neighbours ---
+st.subheader(f"How {borough} Compares ({year} - {business_type.capitalize()}s)")
+comparison_df = ratio_table(metrics, business_type, year, neighbour_borough_names).rename(columns={
+    "people_per_business": "people per business",
+    "people_per_business_neighbour_mean": "neighbours' average",
+    "people_per_business_vs_neighbours": "vs neighbours",
+})[["borough", "people per business", "rank", "total", "percentile", "neighbours' average", "vs neighbours"]]
+if comparison_df["people per business"].notna().any():
+    st.dataframe(comparison_df.set_index("borough"), use_container_width=True, column_config={
+        "people per business": st.column_config.NumberColumn(format="%.0f"),
+        "percentile": st.column_config.NumberColumn(format="%.0f"),
+        "neighbours' average": st.column_config.NumberColumn(format="%.0f"),
+        "vs neighbours": st.column_config.NumberColumn(format="%+.0f"),
+    })
+    st.caption(
+        f"Rank 1 has the most people per {business_type}, i.e. the least competition, out of the boroughs with one. "
+        "'vs neighbours' is the difference to the average of each borough's neighbouring boroughs."
+    )
+else:
+    st.info(f"No {business_type} data available for {borough} and its neighbours in {year}.")
+
+# --- Lookalike boroughs ---
+st.subheader(f"Boroughs Most Similar to {borough}")
+# Similarity on business mix, population and survival rates was precomputed at build time
+similar_df = get_similar_boroughs(conn, borough, k=SIMILARITY_TOP_K)
+if not similar_df.empty:
+    st.dataframe(similar_df.rename(columns={"score": "similarity"}).set_index("rank"), use_container_width=True)
+    st.caption("Boroughs are compared on the share of each business type among their businesses, their population and its growth, and their average business survival rates.")
+else:
+    st.info(f"No similarity data available for {borough}.")
+
 # --- Growth Rate and Survival Rate Visualizations ---
 
 # Get available years from the database
@@ -159,43 +185,19 @@ selected_years = [st.session_state.start_year, st.session_state.middle_year, st.
 if st.session_state.middle_year != middle_year_2:
     st.warning("The middle year must be the same in both sliders. Adjust the sliders so the end of the first matches the start of the second.")
 else:
-    pop_data = get_population_for_boroughs_in_range(conn, neighbour_borough_names, st.session_state.start_year, st.session_state.end_year)
-    pop_df = pd.DataFrame(pop_data, columns=['borough', 'year', 'population'])
-    if not pop_df.empty:
-        pop_df['year'] = pd.to_numeric(pop_df['year'], errors='coerce')
-        pop_df['population'] = pd.to_numeric(pop_df['population'], errors='coerce')
-        pop_df['borough'] = pop_df['borough'].astype(str)
-        pop_df = pop_df[pop_df['year'].isin(selected_years)]
-        pop_df = pop_df.dropna(subset=['year', 'population', 'borough'])
-        pivot = pop_df.pivot(index='borough', columns='year', values='population')
-        pivot = pivot.dropna(subset=selected_years, how='any')
-        pivot['past_growth_rate'] = ((pivot[st.session_state.middle_year] - pivot[st.session_state.start_year]) / pivot[st.session_state.start_year]) * 100
-        pivot['future_growth_rate'] = ((pivot[st.session_state.end_year] - pivot[st.session_state.middle_year]) / pivot[st.session_state.middle_year]) * 100
-        growth_df = pivot[['past_growth_rate', 'future_growth_rate']].reset_index().melt(
-            id_vars='borough',
-            value_vars=['past_growth_rate', 'future_growth_rate'],
-            var_name='period',
-            value_name='growth_rate'
-        )
-        period_labels = {
-            'past_growth_rate': f"{st.session_state.start_year}-{st.session_state.middle_year} (Past)",
-            'future_growth_rate': f"{st.session_state.middle_year}-{st.session_state.end_year} (Projected)"
-        }
-        growth_df['period'] = growth_df['period'].map(period_labels)
-    else:
-        growth_df = pd.DataFrame(columns=['borough', 'period', 'growth_rate'])
+    # Growth rates are read from the population series stored at build time
+    growth_df = get_growth_rates_for_boroughs(
+        conn, neighbour_borough_names, st.session_state.start_year, st.session_state.middle_year, st.session_state.end_year
+    )
+    # Only keep boroughs with both a past and a projected rate
+    growth_df = growth_df[growth_df.groupby('borough')['period'].transform('nunique') == 2]
+    period_labels = {
+        'past': f"{st.session_state.start_year}-{st.session_state.middle_year} (Past)",
+        'projected': f"{st.session_state.middle_year}-{st.session_state.end_year} (Projected)"
+    }
+    growth_df = growth_df.assign(period=growth_df['period'].map(period_labels))[['borough', 'period', 'growth_rate']]
 
-    survival_data = get_business_survival_rates_for_boroughs(conn, neighbour_borough_names, st.session_state.middle_year)
-    survival_df = pd.DataFrame(survival_data, columns=[
-        "borough",
-        "year",
-        "businesses_started",
-        "one_year_rate",
-        "two_year_rate",
-        "three_year_rate",
-        "four_year_rate",
-        "five_year_rate"
-    ])
+    survival_df = get_business_survival_rates_for_boroughs(conn, neighbour_borough_names, st.session_state.middle_year)
 
     # Ensure both dataframes are sorted by borough name for consistent y-axis
     borough_order = sorted(growth_df['borough'].unique()) if not growth_df.empty else []
@@ -210,7 +212,8 @@ else:
     with chart_col1:
         st.subheader(f"Population Growth Rate by Borough for {borough} and neighbouring boroughs")
         if not growth_df.empty:
-            fig_growth = plot_generic_barchart(
+            fig_growth = cached_figure(
+                plot_generic_barchart,
                 growth_df,
                 x_col="growth_rate",
                 y_col="borough",
@@ -220,6 +223,7 @@ else:
                 x_axis_label="Growth Rate (%)",
                 y_axis_label="Borough",
                 barmode="group",
+                graph_version=graph_version,
             )
             fig_growth.update_layout(yaxis={'categoryorder':'array', 'categoryarray': borough_order})
             fig_growth.update_traces(orientation='h')
@@ -257,7 +261,8 @@ else:
             # Ensure borough order is consistent
             survival_long['borough'] = pd.Categorical(survival_long['borough'], categories=borough_order, ordered=True)
             survival_long = survival_long.sort_values(['borough', 'period'])
-            fig_survival = plot_generic_barchart(
+            fig_survival = cached_figure(
+                plot_generic_barchart,
                 survival_long,
                 x_col="survival_rate",
                 y_col="borough",
@@ -267,9 +272,55 @@ else:
                 x_axis_label="Survival Rate (%)",
                 y_axis_label="Borough",
                 barmode="group",
+                graph_version=graph_version,
             )
             fig_survival.update_layout(yaxis={'categoryorder':'array', 'categoryarray': borough_order})
             fig_survival.update_traces(orientation='h')
             st.plotly_chart(fig_survival, use_container_width=True)
         else:
             st.info("No business survival rate data available for the selected boroughs and year.")
+
+# --- Co-location ---
+st.markdown("---")
+st.subheader(f"Business Types Found Together with {business_type.capitalize()}s")
+# Lift over the boroughs was precomputed at build time from the rolled-up counts
+colocated_df = get_colocated_business_types(conn, business_type)
+if not colocated_df.empty:
+    st.dataframe(colocated_df.set_index("rank"), use_container_width=True)
+    st.caption(f"A lift above 1 means that type is more common in the boroughs where {business_type}s are than in London overall.")
+else:
+    st.info(f"No co-location data available for {business_type}.")
+
+# --- Local competition ---
+st.markdown("---")
+st.subheader(f"Most Saturated Surroundings ({business_type.capitalize()}s)")
+# Only the radii the last build stored are offered, they can differ from the defaults (build_graph.py --radii)
+radii = get_competition_radii(conn)
+if radii:
+    radius = st.selectbox("Radius (metres)", options=radii, index=radii.index(500) if 500 in radii else 0)
+    min_competitors = st.number_input("Minimum number of competitors", min_value=0, value=0, step=1)
+    # Competitor counts were precomputed per business at build time and are indexed
+    saturated_df = get_saturated_businesses(conn, business_type, radius=radius, min_competitors=int(min_competitors))
+    if not saturated_df.empty:
+        st.dataframe(saturated_df.rename(columns={
+            "competitors": f"{business_type}s within {radius}m",
+            "businesses": f"businesses within {radius}m",
+        }), use_container_width=True)
+    else:
+        st.info("No businesses match the selected radius and minimum number of competitors.")
+else:
+    st.info("The graph has no competitor density yet, rebuild it to compute it.")
+
+# --- High streets ---
+st.markdown("---")
+st.subheader(f"Streets with the Most {business_type.capitalize()}s")
+street_scope = st.radio("Streets in", options=[borough, "All boroughs"], horizontal=True)
+# Business counts per street and type were precomputed at build time
+streets_df = get_densest_streets(conn, business_type, borough_name=None if street_scope == "All boroughs" else borough)
+if not streets_df.empty:
+    st.dataframe(streets_df.rename(columns={
+        "business_count": f"{business_type}s",
+        "total_businesses": "all businesses",
+    }), use_container_width=True)
+else:
+    st.info(f"No streets with {business_type}s found.")
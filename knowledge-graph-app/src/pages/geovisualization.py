@@ -1,7 +1,6 @@
 import streamlit as st
 from connect import get_connection
-from core.data_importer import import_borough_shapes
-from streamlit_folium import st_folium
+from core.geography import load_borough_shapes
 from queries.queries import (
     get_business_types, 
     get_years
@@ -45,7 +44,7 @@ st.header(f"Geographic View of People to {business_type} Business Ratio in {year
 # If business type or year input has changed, than the map is rendered again. 
 if inputs_changed:
     try:
-        gdf = import_borough_shapes()
+        gdf = load_borough_shapes()
         st.session_state.ratio_gdf = compute_ratio_dataframe(conn, gdf, business_type, year)
         st.session_state.map_data = plot_interactive_map(
             st.session_state.ratio_gdf, 
@@ -73,6 +72,8 @@ if st.session_state.ratio_gdf is not None:
 
 # Display the map
 if st.session_state.map_data is not None:
+    from streamlit_folium import st_folium
+
     st_folium(
         st.session_state.map_data, 
         width=None,  
@@ -1,22 +1,45 @@
 import streamlit as st
-from visualizations.knowledge_graph import show_graph_view
+from neo4j.exceptions import DriverError
+from visualizations.knowledge_graph import show_graph_view, to_plain_rows
+from queries.guard import run_guarded_query, QueryRejected, GUARD_ROW_LIMIT, GUARD_TIMEOUT_SECONDS
 
 
 def run_graph_query(query, parameters=None):
-    """Run a Cypher query with optional parameters and display the graph."""
+    """
+    Run a user's Cypher query with optional parameters through the query guard and keep its rows for the graph view.
+    Returns the guard's notes about changes made to the query.
+    """
     conn = st.session_state.conn
     if parameters is None:
         parameters = {}
-    records, _, _ = conn.query(query, parameters)
-    if records:
-        show_graph_view(records)
-    else:
-        st.warning("No relationships found to visualize.")
+    st.session_state.graph_rows = None
+    records, notes = run_guarded_query(conn, query, parameters)
+    # rows are kept in the session so expanding aggregate nodes doesn't rerun the query
+    st.session_state.graph_rows = to_plain_rows(records) if records else None
+    return notes
 
 
 st.title("Graph View")
 
 default_query = "MATCH (a)-[r]->(b) RETURN a AS source, type(r) AS relation, b AS target LIMIT 100"
 query = st.text_area("Enter Cypher query for graph visualization:", value=default_query)
+st.caption(
+    f"Queries run read-only, are stopped after {GUARD_TIMEOUT_SECONDS} seconds and return at most {GUARD_ROW_LIMIT} rows. "
+    "Queries with a cartesian product of unconnected patterns need a LIMIT."
+)
 if st.button("Run Graph Query"):
-    run_graph_query(query)
\ No newline at end of file
+    try:
+        for note in run_graph_query(query):
+            st.info(note)
+        if not st.session_state.graph_rows:
+            st.warning("No relationships found to visualize.")
+    except QueryRejected as e:
+        st.error(f"Query not run: {e}")
+    except RuntimeError as e:
+        st.error(str(e))
+    except DriverError as e:
+        # e.g. the database is unreachable or the session expired
+        st.error(f"The database could not be reached to run the query: {e}")
+
+if st.session_state.get("graph_rows"):
+    show_graph_view(st.session_state.graph_rows)
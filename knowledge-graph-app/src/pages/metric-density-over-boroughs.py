@@ -1,17 +1,22 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-import plotly.figure_factory as ff
 
 from queries.queries import (
     get_all_boroughs, get_all_business_types, get_years,
-    get_population_for_boroughs, get_business_count_for_boroughs,
     get_business_survival_rates_for_boroughs,
-    get_survival_years
+    get_survival_years, get_graph_version, get_borough_rank_profile
 )
+from metrics.metrics import ratio_table
+from metrics.distributions import merge_bins
+from metrics.cohorts import survival_trend, cohort_curves, REFERENCE_AREA
+from metrics.loaders import load_metrics, load_ratio_distributions, load_survival_cube
 from connect import get_connection
-from visualizations.bar_chart import plot_distribution_barchart
+from visualizations.bar_chart import plot_precomputed_histogram
+from visualizations.distribution_charts import (
+    plot_survival_ranking, plot_ratio_boxplot, plot_ratio_density, plot_ratio_histogram,
+    plot_survival_trend, plot_cohort_curves
+)
+from visualizations.figure_cache import cached_figure
 
 st.set_page_config(layout="wide")
 
@@ -26,6 +31,9 @@ all_boroughs = get_all_boroughs(conn)
 all_business_types = get_all_business_types(conn)
 all_years = get_years(conn)
 survival_years = get_survival_years(conn)
+population_table, metrics = load_metrics(conn)
+graph_version = get_graph_version(conn)
+grid, distributions = load_ratio_distributions(conn)
 
 st.sidebar.header("Visualization Settings")
 
@@ -44,89 +52,52 @@ if dist_type == "Business Density":
     n_bins = st.sidebar.slider("Number of Bins", min_value=5, max_value=20, value=15)
 
     # Get data
-    populations = get_population_for_boroughs(conn, all_boroughs, year)
-    business_counts = get_business_count_for_boroughs(conn, all_boroughs, business_type)
-    data = []
-    for b in all_boroughs:
-        pop = populations.get(b, 0)
-        bus = business_counts.get(b, 0)
-        ratio = pop / bus if bus else 0
-        data.append({"borough": b, "population_to_business_ratio": ratio})
-    ratios = [d["population_to_business_ratio"] for d in data]
-    highlight_value = next((d["population_to_business_ratio"] for d in data if d["borough"] == highlight_borough), None)
+    ratios_df = ratio_table(metrics, business_type, year, all_boroughs)
+    highlight_value = ratios_df.loc[ratios_df["borough"] == highlight_borough, "people_per_business"].iloc[0]
+    highlight_value = 0 if pd.isna(highlight_value) else highlight_value
     st.subheader(f"Distribution of People to Business Ratio ({business_type}, {year})")
-    
-    fig = plot_distribution_barchart(
-        ratios,
-        item_value=highlight_value,
-        n_bins=n_bins,
-        x_label="Numper of People per Business",
-        y_label="Number of Boroughs",
-        title=f"Distribution of People to {business_type} Business Ratio in {year}"
-    )
-    st.plotly_chart(fig, use_container_width=True)
+
+    if (business_type, year) in distributions.index:
+        edges, counts = merge_bins(grid["hist_edges"], distributions.loc[(business_type, year), "hist_counts"], n_bins)
+        fig = cached_figure(
+            plot_precomputed_histogram,
+            edges,
+            counts[0],
+            item_value=highlight_value,
+            x_label="Numper of People per Business",
+            y_label="Number of Boroughs",
+            title=f"Distribution of People to {business_type} Business Ratio in {year}",
+            graph_version=graph_version
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info(f"No borough has a {business_type} business in {year}.")
     st.caption(f"Highlighted: {highlight_borough} ({highlight_value:.2f} {business_type}s per 10,000 people)")
 else:
     year = st.sidebar.selectbox("Select Year", options=survival_years, index=survival_years.index(2016) if 2016 in survival_years else 0)
     highlight_borough = st.sidebar.selectbox("Highlight Borough", options=all_boroughs, 
                                              index=all_boroughs.index("Merton") if "Merton" in all_boroughs else 0)
     # Get data for all boroughs
-    survival_data = get_business_survival_rates_for_boroughs(conn, all_boroughs, year)
-    survival_df = pd.DataFrame(survival_data, columns=[
-        'borough', 'year', 'businesses_started', 'one_year_rate', 'two_year_rate', 'three_year_rate', 'four_year_rate', 'five_year_rate'
-    ])
-    
-    periods = [
-        ("one_year_rate", "1 Year Survival Rate"),
-        ("two_year_rate", "2 Year Survival Rate"),
-        ("three_year_rate", "3 Year Survival Rate"),
-        ("four_year_rate", "4 Year Survival Rate"),
-        ("five_year_rate", "5 Year Survival Rate")
-    ]
+    survival_df = get_business_survival_rates_for_boroughs(conn, all_boroughs, year)
     
     st.subheader(f"Survival Rate Ranges and Borough Ranking ({year})")
-    fig = go.Figure()
-    box_width = 0.5
-    marker_size = 12
-    for i, (period_key, period_label) in enumerate(periods):
-        rates = survival_df[period_key].dropna()
-        if len(rates) == 0:
-            continue
-        # Boxplot for all boroughs
-        fig.add_trace(go.Box(
-            y=rates,
-            x=[period_label]*len(rates),
-            name=period_label,
-            boxpoints=False,
-            marker_color='lightblue',
-            width=box_width,
-            showlegend=False
-        ))
-        # Mark selected borough
-        if period_key in survival_df and highlight_borough in survival_df['borough'].values:
-            borough_value = survival_df.loc[survival_df['borough'] == highlight_borough, period_key].values[0]
-            # Calculate ranking (1 = best)
-            rank = (rates > borough_value).sum() + 1
-            fig.add_trace(go.Scatter(
-                x=[period_label],
-                y=[borough_value],
-                mode='markers+text',
-                marker=dict(color='crimson', size=marker_size, symbol='diamond'),
-                text=[f"{highlight_borough}<br>Rank: {rank}/{len(rates)}"],
-                textposition="top center",
-                showlegend=False
-            ))
-    fig.update_layout(
-        yaxis_title="Survival Rate (%)",
-        xaxis_title="Survival Period",
-        title=f"Business Survival Rate Ranges and {highlight_borough} Ranking ({year})",
-        boxmode='group',
-        template='plotly_white',
-        xaxis=dict(type='category'),
-        height=500
-    )
+    # Ranks were precomputed at build time for every borough, period and year
+    rank_profile = get_borough_rank_profile(conn, highlight_borough, metric_prefix="survival:", year=year)
+    periods = rank_profile["metric"].str.split(":", n=1).str[1]
+    ranks = dict(zip(periods, zip(rank_profile["rank"], rank_profile["total"])))
+    fig = cached_figure(plot_survival_ranking, survival_df, highlight_borough, year, ranks, graph_version=graph_version)
     st.plotly_chart(fig, use_container_width=True)
 
+    # Trends over all start years come from the survival cube, loaded in one query
+    st.subheader(f"Survival Rate Trends ({highlight_borough})")
+    cube = load_survival_cube(conn)
+    trend = survival_trend(cube, highlight_borough)
+    fig_trend = cached_figure(plot_survival_trend, trend, highlight_borough, REFERENCE_AREA, graph_version=graph_version)
+    st.plotly_chart(fig_trend, use_container_width=True)
+    fig_curves = cached_figure(plot_cohort_curves, cohort_curves(cube, highlight_borough), highlight_borough, graph_version=graph_version)
+    st.plotly_chart(fig_curves, use_container_width=True)
+    st.caption(f"Each start year is a cohort: the businesses started that year. The dotted lines show {REFERENCE_AREA}, hover a point to see the gap to it and the change against the previous cohort.")
+
 # --- Visualisation 1: Comparison of Business Density Distributions ---
 st.markdown("---")
 st.subheader("Comparison of Business Density Distributions")
@@ -140,98 +111,36 @@ selected_business_types = st.sidebar.multiselect(
 )
 
 if selected_business_types:
-    # We can reuse the `populations` data fetched earlier for the same year
-    comparison_data = []
-    for b_type in selected_business_types:
-        business_counts_comp = get_business_count_for_boroughs(conn, all_boroughs, b_type)
-        for b in all_boroughs:
-            pop = populations.get(b, 0)
-            bus = business_counts_comp.get(b, 0)
-            # Only include valid ratios
-            if bus and pop:
-                ratio = pop / bus
-                comparison_data.append({"business_type": b_type, "ratio": ratio})
-
-    if comparison_data:
-        df_comparison = pd.DataFrame(comparison_data)
+    # Distributions of all selected types were precomputed at build time for every year
+    available_types = [b for b in selected_business_types if (b, year) in distributions.index]
+    selected_distributions = distributions.loc[[(b, year) for b in available_types]] if available_types else distributions
+
+    if available_types:
         # Create a box plot to show the distribution for each business type
-        fig_box = px.box(
-            df_comparison,
-            x="business_type",
-            y="ratio",
-            color="business_type",
-            title=f"Distribution of People-to-Business Ratios in {year}",
-            labels={
-                "business_type": "Business Type",
-                "ratio": "Number of People per Business"
-            },
-            notched=False # Adds a notch to show confidence interval around the median
-        )
-        fig_box.update_layout(showlegend=False)
+        fig_box = cached_figure(plot_ratio_boxplot, selected_distributions, available_types, year, graph_version=graph_version)
         st.plotly_chart(fig_box, use_container_width=True)
-        st.caption("The box plot shows the distribution of the people-to-business ratio across all boroughs for the selected business types. The line in the middle of each box is the median.")
+        st.caption("The box plot shows the distribution of the people-to-business ratio across all boroughs for the selected business types. The line in the middle of each box is the median, the whiskers span the lowest to the highest borough.")
 
         # --- Visualization 1: Density Plot ---
         st.markdown("---")
         st.subheader("Smoothed Distribution of Business Density")
 
-        # Clip the data at the 95th percentile to handle the long tail
-        p95 = df_comparison['ratio'].quantile(0.95)
-        df_clipped = df_comparison[df_comparison['ratio'] <= p95]
-
-        # Prepare data for the distplot
-        hist_data = [df_clipped[df_clipped['business_type'] == b_type]['ratio'] for b_type in selected_business_types]
-        group_labels = selected_business_types
-
-        # Create the density plot
-        fig_dist = ff.create_distplot(
-            hist_data,
-            group_labels,
-            show_hist=False,  # Only show the smoothed line
-            show_rug=False    # Hide the rug plot for a cleaner look
-        )
-        fig_dist.update_layout(
-            title_text='Density Plot of People-to-Business Ratios',
-            xaxis_title='People per Business Ratio',
-            yaxis_title='Density'
-        )
+        fig_dist = cached_figure(plot_ratio_density, grid, selected_distributions, available_types, year, graph_version=graph_version)
         st.plotly_chart(fig_dist, use_container_width=True)
-        st.caption("This plot shows the smoothed probability density of the people-to-business ratio. Peaks in the lines indicate where the ratio is most common for a given business type.")
+        st.caption("This plot shows the smoothed probability density of the people-to-business ratio on a logarithmic axis, so the long tail stays readable. Peaks in the lines indicate where the ratio is most common for a given business type.")
 
         # --- Visualization 2: Grouped Histogram ---
         st.markdown("---")
-        st.subheader("Histogram of Business Density (Focused View)")
-
-        # Clip the data at the 95th percentile to handle the long tail
-        p95 = df_comparison['ratio'].quantile(0.95)
-        df_clipped = df_comparison[df_comparison['ratio'] <= p95]
-
-        st.info(f"Note: To improve readability, the histogram below is focused on the data up to the 95th percentile (ratio ≤ {p95:,.0f}). The box plot above shows the full data range.")
+        st.subheader("Histogram of Business Density")
 
         # Add a slider to control the number of bins
-        n_bins_hist = st.slider("Number of Bins for Histogram", min_value=5, max_value=50, value=20)
-
-        if not df_clipped.empty:
-            fig_hist = go.Figure()
-            for b_type in selected_business_types:
-                ratios = df_clipped[df_clipped['business_type'] == b_type]['ratio']
-                if not ratios.empty:
-                    fig_hist.add_trace(go.Histogram(
-                        x=ratios,
-                        name=b_type,
-                        nbinsx=n_bins_hist
-                    ))
-
-            # Update layout for a grouped histogram
-            fig_hist.update_layout(
-                barmode='group',
-                title_text='Histogram of People-to-Business Ratios',
-                xaxis_title_text='Number of People per Business',
-                yaxis_title_text='Number of Boroughs',
-                legend_title_text='Business Type'
-            )
-            st.plotly_chart(fig_hist, use_container_width=True)
-            st.caption("This histogram shows the distribution of the people-to-business ratio, counting the number of boroughs in each ratio bin.")
+        n_bins_hist = st.slider("Number of Bins for Histogram", min_value=5, max_value=40, value=20)
+
+        fig_hist = cached_figure(
+            plot_ratio_histogram, grid, selected_distributions, available_types, year, n_bins_hist, graph_version=graph_version
+        )
+        st.plotly_chart(fig_hist, use_container_width=True)
+        st.caption("This histogram shows the distribution of the people-to-business ratio, counting the number of boroughs in each ratio bin. Bins are wider for higher ratios, following the shared logarithmic grid.")
     else:
         st.warning("No data available for the selected business types to create a comparison plot.")
 else:
@@ -0,0 +1,168 @@
+import re
+
+from neo4j.exceptions import Neo4jError
+
+
+# Limits for Cypher entered by users, who share one database
+GUARD_TIMEOUT_SECONDS = 10
+GUARD_ROW_LIMIT = 500
+
+# Plan operators that read all their input before producing a row, so a LIMIT above them
+# does not bound the work below them
+EAGER_OPERATORS = {"EagerAggregation", "OrderedAggregation", "Sort", "Eager", "Distinct", "NodeCountFromCountStore"}
+LIMIT_OPERATORS = {"Limit", "Top", "PartialTop", "ExhaustiveLimit"}
+
+
+class QueryRejected(ValueError):
+    """Raised for user queries that the guard will not run, with the reason as message."""
+
+
+def operator_name(operator):
+    """Plan operator type without the runtime suffix, e.g. 'CartesianProduct@neo4j' -> 'CartesianProduct'."""
+    return operator["operatorType"].split("@")[0]
+
+
+def top_limit(plan):
+    """
+    Returns the Limit operator that bounds the rows of the query, i.e. the first Limit or Top
+    on the chain from the result down, or None when the result is unbounded.
+    """
+    operator = plan
+    while operator is not None:
+        name = operator_name(operator)
+        if name in LIMIT_OPERATORS:
+            return operator
+        if name in EAGER_OPERATORS:
+            return None
+        children = operator.get("children", [])
+        operator = children[0] if len(children) == 1 else None
+    return None
+
+
+def limit_count(operator):
+    """
+    Row count of a Limit or Top operator when the plan shows it as a plain number, e.g. Details '100'
+    or 'n.name ASC LIMIT 100'. None for no operator or a count given as a parameter or expression.
+    """
+    if operator is None:
+        return None
+    match = re.fullmatch(r"(?:.* LIMIT )?(\d+)", str(operator["arguments"].get("Details", "")).strip())
+    return int(match.group(1)) if match else None
+
+
+def unbounded_cartesian_products(plan, bounded=False):
+    """
+    Returns the CartesianProduct operators of a plan that no LIMIT bounds: a LIMIT bounds the
+    operators below it up to the first eager operator, which reads its whole input anyway.
+    """
+    name = operator_name(plan)
+    if name in LIMIT_OPERATORS:
+        bounded = True
+    elif name in EAGER_OPERATORS:
+        bounded = False
+    found = [plan] if name == "CartesianProduct" and not bounded else []
+    for child in plan.get("children", []):
+        found.extend(unbounded_cartesian_products(child, bounded))
+    return found
+
+
+def strip_comments(query):
+    """Removes // and /* */ comments outside string literals and quoted names, keeping the line breaks."""
+    out = []
+    quote = None
+    i = 0
+    while i < len(query):
+        c = query[i]
+        if quote:
+            out.append(c)
+            if c == "\\" and quote != "`" and i + 1 < len(query):
+                out.append(query[i + 1])
+                i += 1
+            elif c == quote:
+                quote = None
+            i += 1
+        elif c in "'\"`":
+            quote = c
+            out.append(c)
+            i += 1
+        elif query.startswith("//", i):
+            end = query.find("\n", i)
+            i = len(query) if end == -1 else end
+        elif query.startswith("/*", i):
+            end = query.find("*/", i + 2)
+            i = len(query) if end == -1 else end + 2
+            out.append(" ")
+        else:
+            out.append(c)
+            i += 1
+    return "".join(out)
+
+
+def explain(conn, query, parameters=None, timeout=GUARD_TIMEOUT_SECONDS):
+    """Returns the summary of EXPLAIN query, which holds the plan and the query type without running it."""
+    try:
+        _, summary, _ = conn.read_query(f"EXPLAIN {query}", parameters, timeout=timeout)
+    except Neo4jError as e:
+        raise QueryRejected(f"The query is not valid Cypher: {e.message}") from e
+    return summary
+
+
+def guard_query(conn, query, parameters=None, row_limit=GUARD_ROW_LIMIT, timeout=GUARD_TIMEOUT_SECONDS):
+    """
+    Checks a user query against its EXPLAIN plan before it runs:
+    - it must only read (no writes, schema or admin commands)
+    - it must not contain a cartesian product that no LIMIT bounds
+    - its result is capped at row_limit rows: a query without a fixed LIMIT on its result is wrapped
+      in CALL { ... } RETURN * LIMIT row_limit, which also caps every branch of a UNION
+
+    Returns (query, notes): the query to run and messages for the user about changes made to it.
+    Raises QueryRejected with the reason when the query should not run.
+    """
+    query = strip_comments(query).strip().rstrip(";").strip()
+    if not query:
+        raise QueryRejected("The query is empty.")
+    summary = explain(conn, query, parameters, timeout)
+    if summary.query_type != "r":
+        raise QueryRejected("Only read queries can be run here, the query would write to the database or change its schema.")
+
+    products = unbounded_cartesian_products(summary.plan)
+    if products:
+        estimate = max(p["arguments"].get("EstimatedRows", 0) for p in products)
+        raise QueryRejected(
+            f"The query combines unconnected patterns into a cartesian product (about {estimate:,.0f} rows) that no LIMIT bounds. "
+            "Connect the patterns with a relationship or add a LIMIT."
+        )
+
+    notes = []
+    count = limit_count(top_limit(summary.plan))
+    if count is not None and count > row_limit:
+        raise QueryRejected(f"The LIMIT of {count:,} is above the maximum of {row_limit} rows.")
+    if count is None:
+        # no LIMIT, or one the plan does not show as a number (LIMIT $n, LIMIT 10 * 1000)
+        query = f"CALL {{\n{query}\n}}\nRETURN * LIMIT {int(row_limit)}"
+        try:
+            conn.read_query(f"EXPLAIN {query}", parameters, timeout=timeout)
+        except Neo4jError as e:
+            # e.g. returned expressions without an alias cannot leave a subquery
+            raise QueryRejected(
+                f"The query has no fixed LIMIT and could not be capped automatically ({e.message}). "
+                f"Add a LIMIT of at most {row_limit} rows."
+            ) from e
+        notes.append(f"The query has no fixed LIMIT, so at most {row_limit} rows are returned.")
+    return query, notes
+
+
+def run_guarded_query(conn, query, parameters=None, row_limit=GUARD_ROW_LIMIT, timeout=GUARD_TIMEOUT_SECONDS):
+    """
+    Runs a user query after guard_query, in a read transaction the server cancels after timeout seconds.
+    Returns (records, notes). Raises QueryRejected when the guard refuses the query or it times out,
+    and RuntimeError when it fails otherwise.
+    """
+    query, notes = guard_query(conn, query, parameters, row_limit, timeout)
+    try:
+        records, _, _ = conn.read_query(query, parameters, timeout=timeout)
+    except Neo4jError as e:
+        if "Timeout" in (e.code or "") or "TimedOut" in (e.code or ""):
+            raise QueryRejected(f"The query was stopped after {timeout} seconds. Narrow it down or lower its LIMIT.") from e
+        raise RuntimeError(f"The query failed: {e.message}") from e
+    return records[:row_limit], notes
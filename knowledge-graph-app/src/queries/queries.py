@@ -1,20 +1,65 @@
+import pandas as pd
+
+
+# Run a query and return its result as a typed DataFrame
+def query_frame(conn, query, columns, parameters=None):
+    """
+    Runs a query ending in a WITH that projects the given columns and returns them as a DataFrame
+    with the given dtypes ({column: dtype}). The driver builds the frame from the records
+    (Result.to_df), so no Python object is made per record.
+    Rows keep the order of the query. Missing properties become NaN, so nullable numbers are float64;
+    int64 columns that hold nulls (e.g. from an OPTIONAL MATCH) become the nullable Int64.
+    """
+    names = list(columns)
+    query += f"""
+    RETURN {", ".join(f"`{name}`" for name in names)}
+    """
+    df = conn.query_df(query, parameters)
+    df = (df if df is not None else pd.DataFrame()).reindex(columns=names)
+    dtypes = {
+        name: "Int64" if dtype == "int64" and df[name].isna().any() else dtype
+        for name, dtype in columns.items()
+    }
+    return df.astype(dtypes)
+
+# Run a query and return the single list it collects
+def query_list(conn, query, parameters=None):
+    """
+    Runs a query returning one record with one collected list and returns that list.
+    """
+    result = conn.query(query, parameters)
+    return list(result[0][0][0]) if result and result[0] else []
+
+# Columns of the population tables
+POPULATION_COLUMNS = {"borough": "object", "year": "int64", "population": "float64"}
+
+# Columns of the survival rate tables
+SURVIVAL_COLUMNS = {
+    "borough": "object",
+    "year": "int64",
+    "businesses_started": "float64",
+    "one_year_rate": "float64",
+    "two_year_rate": "float64",
+    "three_year_rate": "float64",
+    "four_year_rate": "float64",
+    "five_year_rate": "float64",
+}
+
 #  Get all boroughs in the graph
 def get_all_boroughs(conn):
     """
     Returns a list of all borough names in the dataset, sorted alphabetically.
     """
-    query = "MATCH (b:Borough) RETURN b.name AS name ORDER BY name"
-    records, _, _ = conn.query(query)
-    return [r["name"] for r in records]
+    query = "MATCH (b:Borough) WITH b.name AS name ORDER BY name RETURN collect(name) AS names"
+    return query_list(conn, query)
 
 # Get all business types in the graph
 def get_all_business_types(conn):
     """
     Returns a list of all business types in the dataset, sorted alphabetically.
     """
-    query = "MATCH (bt:BusinessType) RETURN bt.type AS type ORDER BY type"
-    records, _, _ = conn.query(query)
-    return [r["type"] for r in records]
+    query = "MATCH (bt:BusinessType) WITH bt.type AS type ORDER BY type RETURN collect(type) AS types"
+    return query_list(conn, query)
 
 # Get the selected borough and its neighbours
 def get_borough_and_neighbours(conn, borough_name):
@@ -23,28 +68,45 @@ def get_borough_and_neighbours(conn, borough_name):
     OPTIONAL MATCH (b)-[:NEIGHBOURS]-(n:Borough)
     RETURN collect(DISTINCT b.name) + collect(DISTINCT n.name) AS borough_names
     """
-    result = conn.query(query, parameters={"borough_name": borough_name})
-    return result[0][0]["borough_names"] if result and result[0] else []
+    return query_list(conn, query, parameters={"borough_name": borough_name})
+
+# Get the boroughs most similar to a borough (precomputed at build time)
+def get_similar_boroughs(conn, borough_name, k=5):
+    """
+    Returns a DataFrame with columns borough, score and rank of the k boroughs whose business mix,
+    population and survival rates are most similar to the given borough, most similar first.
+    score is the cosine similarity of their feature vectors (1 = identical).
+    """
+    query = """
+    MATCH (:Borough {name: $borough_name})-[r:SIMILAR_TO]->(s:Borough)
+    WHERE r.rank <= $k
+    WITH s.name AS borough, r.score AS score, r.rank AS rank
+    ORDER BY rank
+    """
+    columns = {"borough": "object", "score": "float64", "rank": "int64"}
+    return query_frame(conn, query, columns, parameters={"borough_name": borough_name, "k": k})
 
 # Get population for each borough in a given year
 def get_population_for_boroughs(conn, borough_names, year):
     query = """
     UNWIND $borough_names AS name
     MATCH (b:Borough {name: name})-[:HAS_POPULATION {year: $year}]->(p:Population)
-    RETURN b.name AS borough, p.population AS population
+    WITH b.name AS borough, p.population AS population
     """
-    result = conn.query(query, parameters={"borough_names": borough_names, "year": year})
-    return {row["borough"]: row["population"] for row in result[0]} if result and result[0] else {}
+    df = query_frame(conn, query, {"borough": "object", "population": "float64"},
+                     parameters={"borough_names": borough_names, "year": year})
+    return dict(zip(df["borough"], df["population"]))
 
 # Get number of businesses of a type in each borough
 def get_business_count_for_boroughs(conn, borough_names, business_type):
     query = """
     UNWIND $borough_names AS name
-    MATCH (b:Borough {name: name})<-[:LOCATED_IN]-(bus:Business)-[:OF_TYPE]->(bt:BusinessType {type: $business_type})
-    RETURN b.name AS borough, count(bus) AS business_count
+    MATCH (b:Borough {name: name})-[c:HAS_BUSINESS_COUNT]->(bt:BusinessType {type: $business_type})
+    WITH b.name AS borough, c.count AS business_count
     """
-    result = conn.query(query, parameters={"borough_names": borough_names, "business_type": business_type})
-    return {row["borough"]: row["business_count"] for row in result[0]} if result and result[0] else {}
+    df = query_frame(conn, query, {"borough": "object", "business_count": "int64"},
+                     parameters={"borough_names": borough_names, "business_type": business_type})
+    return dict(zip(df["borough"], df["business_count"]))
 
 # Get number of businesses of a type in each borough (all boroughs)
 def get_business_count_for_all_boroughs(conn, business_type):
@@ -53,60 +115,281 @@ def get_business_count_for_all_boroughs(conn, business_type):
     """
     query = """
     MATCH (b:Borough)
-    OPTIONAL MATCH (b)<-[:LOCATED_IN]-(bus:Business)-[:OF_TYPE]->(bt:BusinessType {type: $business_type})
-    RETURN b.name AS borough, count(bus) AS business_count
+    OPTIONAL MATCH (b)-[c:HAS_BUSINESS_COUNT]->(bt:BusinessType {type: $business_type})
+    WITH b.name AS borough, coalesce(c.count, 0) AS business_count
     ORDER BY borough
     """
-    result = conn.query(query, parameters={"business_type": business_type})
-    return {row["borough"]: row["business_count"] for row in result[0]} if result and result[0] else {}
+    df = query_frame(conn, query, {"borough": "object", "business_count": "int64"},
+                     parameters={"business_type": business_type})
+    return dict(zip(df["borough"], df["business_count"]))
+
+# Area levels below Borough and the property identifying their nodes
+AREA_LEVELS = {"Ward": "code", "LSOA": "code"}
+
+# Get the wards or LSOAs of a borough
+def get_areas_in_borough(conn, borough_name, level="Ward"):
+    """
+    Returns a DataFrame with columns code, name, usual_residents and business_count
+    for all areas of the given level ('Ward' or 'LSOA') inside a borough.
+    """
+    if level not in AREA_LEVELS:
+        raise ValueError(f"Unknown area level: {level}")
+    query = f"""
+    MATCH (a:{level} {{borough: $borough_name}})
+    WITH a.code AS code, a.name AS name,
+         a.usual_residents AS usual_residents,
+         coalesce(a.business_count, 0) AS business_count
+    ORDER BY name
+    """
+    columns = {"code": "object", "name": "object", "usual_residents": "float64", "business_count": "int64"}
+    return query_frame(conn, query, columns, parameters={"borough_name": borough_name})
+
+# Get number of businesses of a type in each ward or LSOA (precomputed rollups)
+def get_business_count_for_areas(conn, area_codes, business_type, level="Ward"):
+    """
+    Returns a dict {area_code: business_count} for the given wards or LSOAs.
+    Reads the counts rolled up at build time instead of traversing businesses.
+    """
+    if level not in AREA_LEVELS:
+        raise ValueError(f"Unknown area level: {level}")
+    query = f"""
+    UNWIND $area_codes AS code
+    MATCH (a:{level} {{code: code}})
+    OPTIONAL MATCH (a)-[c:HAS_BUSINESS_COUNT]->(:BusinessType {{type: $business_type}})
+    WITH a.code AS code, coalesce(c.count, 0) AS business_count
+    """
+    df = query_frame(conn, query, {"code": "object", "business_count": "int64"},
+                     parameters={"area_codes": list(area_codes), "business_type": business_type})
+    return dict(zip(df["code"], df["business_count"]))
+
+# Get the businesses of a type with the most competitors around them (precomputed at build time)
+def get_saturated_businesses(conn, business_type, radius=500, min_competitors=0, limit=25):
+    """
+    Returns a DataFrame with columns name, osm_id, borough, competitors and businesses: the businesses of a type
+    ranked by the number of same-type businesses (competitors) within radius metres, busiest first.
+    businesses counts all types. radius must be one of the radii stored by the build.
+    """
+    query = f"""
+    MATCH (b:Business)-[:OF_TYPE]->(:BusinessType {{type: $business_type}})
+    WHERE b.competitors_{int(radius)}m >= $min_competitors
+    OPTIONAL MATCH (b)-[:LOCATED_IN]->(br:Borough)
+    WITH b.name AS name, b.osmId AS osm_id, br.name AS borough,
+         b.competitors_{int(radius)}m AS competitors, b.businesses_{int(radius)}m AS businesses
+    ORDER BY competitors DESC, businesses DESC
+    LIMIT $limit
+    """
+    columns = {"name": "object", "osm_id": "object", "borough": "object", "competitors": "int64", "businesses": "int64"}
+    return query_frame(
+        conn,
+        query,
+        columns,
+        parameters={"business_type": business_type, "min_competitors": min_competitors, "limit": limit},
+    )
+
+# Get the streets with the most businesses of a type, in one borough or all (precomputed rollups)
+def get_densest_streets(conn, business_type=None, borough_name=None, limit=10):
+    """
+    Returns a DataFrame with columns street, borough, business_count and total_businesses: the streets ranked by
+    their number of businesses of business_type (of any type when it is None), busiest first.
+    total_businesses counts all types on the street.
+    """
+    # the borough is matched as a property so the street_borough index is used
+    street = "(s:Street)" if borough_name is None else "(s:Street {borough: $borough_name})"
+    if business_type is None:
+        match = f"MATCH {street}"
+        count = "s.business_count"
+    else:
+        match = f"MATCH {street}-[c:HAS_BUSINESS_COUNT]->(:BusinessType {{type: $business_type}})"
+        count = "c.count"
+    query = f"""
+    {match}
+    WITH s.name AS street, s.borough AS borough, {count} AS business_count, s.business_count AS total_businesses
+    ORDER BY business_count DESC, total_businesses DESC, street
+    LIMIT $limit
+    """
+    columns = {"street": "object", "borough": "object", "business_count": "int64", "total_businesses": "int64"}
+    return query_frame(
+        conn,
+        query,
+        columns,
+        parameters={"business_type": business_type, "borough_name": borough_name, "limit": limit},
+    )
+
+# Get all pairs of neighbouring boroughs, wards or LSOAs
+def get_area_neighbour_pairs(conn, level="Borough"):
+    """
+    Returns a DataFrame with columns area and neighbour (names for boroughs, codes for wards and LSOAs),
+    one row per direction.
+    """
+    keys = {"Borough": "name", **AREA_LEVELS}
+    if level not in keys:
+        raise ValueError(f"Unknown area level: {level}")
+    query = f"""
+    MATCH (a:{level})-[:NEIGHBOURS]->(n:{level})
+    WITH a.{keys[level]} AS area, n.{keys[level]} AS neighbour
+    """
+    return query_frame(conn, query, {"area": "object", "neighbour": "object"})
+
+# Get the business types most often found in the same boroughs as a type (precomputed at build time)
+def get_colocated_business_types(conn, business_type, k=10):
+    """
+    Returns a DataFrame with columns business_type, lift and rank of the k business types most co-located
+    with the given type. A lift of 2 means a business near one of the given type is twice as likely
+    to be of that type as a business anywhere.
+    """
+    query = """
+    MATCH (:BusinessType {type: $business_type})-[c:CO_LOCATED_WITH]->(o:BusinessType)
+    WHERE c.rank <= $k
+    WITH o.type AS business_type, c.lift AS lift, c.rank AS rank
+    ORDER BY rank
+    """
+    columns = {"business_type": "object", "lift": "float64", "rank": "int64"}
+    return query_frame(conn, query, columns, parameters={"business_type": business_type, "k": k})
+
+# Get the centrality and community of every borough, ward or LSOA in the NEIGHBOURS graph
+def get_network_metrics(conn, level="Borough"):
+    """
+    Returns a DataFrame with columns area, degree, closeness, betweenness, eigenvector and community,
+    as precomputed at build time, most central (betweenness) first.
+    """
+    keys = {"Borough": "name", **AREA_LEVELS}
+    if level not in keys:
+        raise ValueError(f"Unknown area level: {level}")
+    query = f"""
+    MATCH (a:{level})
+    WHERE a.community IS NOT NULL
+    WITH a.{keys[level]} AS area, a.degree AS degree, a.closeness AS closeness,
+         a.betweenness AS betweenness, a.eigenvector AS eigenvector, a.community AS community
+    ORDER BY betweenness DESC
+    """
+    columns = {
+        "area": "object", "degree": "int64", "closeness": "float64",
+        "betweenness": "float64", "eigenvector": "float64", "community": "int64",
+    }
+    return query_frame(conn, query, columns)
+
+# Characters with a meaning in Lucene query syntax, escaped in user input
+LUCENE_SPECIAL_CHARACTERS = set('+-&|!(){}[]^"~*?:\\/')
+
+def to_fulltext_query(text, fuzzy=True):
+    """
+    Turns free text into a Lucene query matching names that contain every word, where a word also
+    matches as a prefix and, with fuzzy, with one typo. Exact words rank above prefixes and typos.
+    """
+    clauses = []
+    for word in text.lower().split():
+        word = "".join(f"\\{c}" if c in LUCENE_SPECIAL_CHARACTERS else c for c in word)
+        options = [f"{word}^3", f"{word}*^2"] + ([f"{word}~1"] if fuzzy and len(word) > 2 else [])
+        clauses.append(f"({' OR '.join(options)})")
+    return " AND ".join(clauses)
+
+# Search businesses by name in the full-text index
+def search_businesses(conn, text, limit=20, fuzzy=True):
+    """
+    Returns a DataFrame with columns name, osm_id, business_type, borough and score of at most limit
+    businesses whose name matches text (prefix and, with fuzzy, typo-tolerant), best match first.
+    """
+    columns = {"name": "object", "osm_id": "object", "business_type": "object", "borough": "object", "score": "float64"}
+    query_text = to_fulltext_query(text, fuzzy)
+    if not query_text:
+        return pd.DataFrame(columns=list(columns)).astype(columns)
+    query = """
+    CALL db.index.fulltext.queryNodes('business_name', $query_text, {limit: $limit}) YIELD node, score
+    OPTIONAL MATCH (node)-[:OF_TYPE]->(bt:BusinessType)
+    OPTIONAL MATCH (node)-[:LOCATED_IN]->(br:Borough)
+    WITH node.name AS name, node.osmId AS osm_id, bt.type AS business_type, br.name AS borough, score
+    ORDER BY score DESC
+    """
+    return query_frame(conn, query, columns, parameters={"query_text": query_text, "limit": limit})
+
+# Get the name of every business, for the in-memory prefix index
+def get_business_names(conn):
+    """
+    Returns a DataFrame with columns name and osm_id of every business with a name.
+    """
+    query = """
+    MATCH (b:Business)
+    WHERE b.name IS NOT NULL
+    WITH b.name AS name, b.osmId AS osm_id
+    """
+    return query_frame(conn, query, {"name": "object", "osm_id": "object"})
 
 # Get all business types 
 def get_business_types(conn):
-    query = "MATCH (bt:BusinessType) RETURN bt.type AS type ORDER BY type"
-    records, _, _ = conn.query(query)
-    return [r["type"] for r in records]
+    query = "MATCH (bt:BusinessType) WITH bt.type AS type ORDER BY type RETURN collect(type) AS types"
+    return query_list(conn, query)
 
 # Get all years
 def get_years(conn):
-    query = "MATCH (p:Population) RETURN DISTINCT p.year AS year ORDER BY year"
-    records, _, _ = conn.query(query)
-    return [r["year"] for r in records]
+    query = "MATCH (p:Population) WITH DISTINCT p.year AS year ORDER BY year RETURN collect(year) AS years"
+    return query_list(conn, query)
 
 # Get population data for a list of boroughs over a range of years
 def get_population_for_boroughs_in_range(conn, borough_names, min_year=1999, max_year=2050):
     """
     Fetches all population data for a list of boroughs over a selected year range.
-    Returns a list of dicts: [{'borough': ..., 'year': ..., 'population': ...}, ...]
+    Returns a DataFrame with columns borough, year and population.
     """
     query = """
     UNWIND $borough_names AS name
     MATCH (b:Borough {name: name})-[:HAS_POPULATION]->(p:Population)
     WHERE p.year >= $min_year AND p.year <= $max_year
-    RETURN b.name AS borough, p.year AS year, p.population AS population
+    WITH b.name AS borough, p.year AS year, p.population AS population
     ORDER BY borough, year
     """
-    result = conn.query(
+    return query_frame(
+        conn,
         query,
+        POPULATION_COLUMNS,
         parameters={
             "borough_names": borough_names,
             "min_year": min_year,
             "max_year": max_year,
         },
     )
-    # result[0] is the list of records
-    return [row for row in result[0]] if result and result[0] else []
+
+# Get past and projected population growth of a list of boroughs
+def get_growth_rates_for_boroughs(conn, borough_names, start_year, middle_year, end_year):
+    """
+    Returns the population growth (%) of every borough from start_year to middle_year ('past')
+    and from middle_year to end_year ('projected') in one call, as a DataFrame with columns
+    borough, period, start_year, end_year and growth_rate.
+    Reads the population series aligned on years at build time, so each rate is two list lookups.
+    Boroughs missing either year of a period are left out of that period.
+    """
+    query = """
+    UNWIND $borough_names AS name
+    MATCH (b:Borough {name: name})
+    WHERE b.population_series IS NOT NULL
+    UNWIND $periods AS period
+    WITH b, period,
+         period.start_year - b.population_start_year AS start_index,
+         period.end_year - b.population_start_year AS end_index
+    WHERE 0 <= start_index < size(b.population_series) AND 0 <= end_index < size(b.population_series)
+    WITH b, period, b.population_series[start_index] AS start_population, b.population_series[end_index] AS end_population
+    WHERE start_population > 0 AND NOT isNaN(end_population)
+    WITH b.name AS borough, period.name AS period, period.start_year AS start_year, period.end_year AS end_year,
+         (end_population - start_population) / start_population * 100 AS growth_rate
+    ORDER BY borough, start_year
+    """
+    periods = [
+        {"name": "past", "start_year": start_year, "end_year": middle_year},
+        {"name": "projected", "start_year": middle_year, "end_year": end_year},
+    ]
+    columns = {"borough": "object", "period": "object", "start_year": "int64", "end_year": "int64", "growth_rate": "float64"}
+    return query_frame(conn, query, columns, parameters={"borough_names": borough_names, "periods": periods})
 
 # Get business survival rates for a list of boroughs and years
 def get_business_survival_rates_for_boroughs(conn, borough_names, year):
     """
     Fetches business survival rates for a list of boroughs for a single year.
-    Returns a list of dicts: [{'borough': ..., 'year': ..., 'one_year_rate': ..., ..., 'five_year_rate': ...}, ...]
+    Returns a DataFrame with columns borough, year, businesses_started and one_year_rate ... five_year_rate.
     """
     query = """
     UNWIND $borough_names AS name
     MATCH (b:Borough {name: name})-[:HAS_SURVIVAL_RATE]->(s:BusinessSurvival)
     WHERE s.year = $year
-    RETURN 
+    WITH 
         b.name AS borough, 
         s.year AS year, 
         s.births AS businesses_started,
@@ -117,11 +400,139 @@ def get_business_survival_rates_for_boroughs(conn, borough_names, year):
         s.five_year_rate AS five_year_rate
     ORDER BY borough
     """
-    result = conn.query(query, parameters={"borough_names": borough_names, "year": year})
-    return [row for row in result[0]] if result and result[0] else []
+    return query_frame(conn, query, SURVIVAL_COLUMNS, parameters={"borough_names": borough_names, "year": year})
 
 # Get distinct years for business survival rates
 def get_survival_years(conn):
-    query = "MATCH (s:BusinessSurvival) RETURN DISTINCT s.year AS year ORDER BY year"
-    records, _, _ = conn.query(query)
-    return [r["year"] for r in records]
+    query = "MATCH (s:BusinessSurvival) WITH DISTINCT s.year AS year ORDER BY year RETURN collect(year) AS years"
+    return query_list(conn, query)
+
+# Get the version stamp written at the end of every build
+def get_graph_version(conn):
+    """
+    Returns the version id of the current graph build, or None if the graph was never built.
+    Used as cache key so cached metrics and figures are invalidated by a rebuild.
+    """
+    query = "MATCH (v:GraphVersion) RETURN v.version AS version LIMIT 1"
+    result = conn.query(query)
+    return result[0][0]["version"] if result and result[0] else None
+
+# Get the radii competitor density was stored for by the last build
+def get_competition_radii(conn):
+    """
+    Returns the radii in metres with competitors_<r>m and businesses_<r>m properties, as recorded on
+    the GraphVersion node; empty when the graph was built without them.
+    """
+    query = "MATCH (v:GraphVersion) RETURN coalesce(v.competition_radii, []) AS radii LIMIT 1"
+    return sorted(query_list(conn, query))
+
+# Get population of all boroughs for all years
+def get_population_table(conn):
+    """
+    Returns a DataFrame with columns borough, year and population for all boroughs and years.
+    """
+    query = """
+    MATCH (b:Borough)-[:HAS_POPULATION]->(p:Population)
+    WITH b.name AS borough, p.year AS year, p.population AS population
+    ORDER BY borough, year
+    """
+    return query_frame(conn, query, POPULATION_COLUMNS)
+
+# Get business counts of all boroughs for all business types (precomputed rollups)
+def get_business_count_table(conn):
+    """
+    Returns a DataFrame with columns borough, business_type and business_count
+    for every borough and business type with at least one business.
+    """
+    query = """
+    MATCH (b:Borough)-[c:HAS_BUSINESS_COUNT]->(bt:BusinessType)
+    WITH b.name AS borough, bt.type AS business_type, c.count AS business_count
+    """
+    return query_frame(conn, query, {"borough": "object", "business_type": "object", "business_count": "int64"})
+
+# Get all pairs of neighbouring boroughs
+def get_neighbour_pairs(conn):
+    """
+    Returns a DataFrame with columns borough and neighbour, one row per direction.
+    """
+    query = """
+    MATCH (b:Borough)-[:NEIGHBOURS]->(n:Borough)
+    WITH b.name AS borough, n.name AS neighbour
+    """
+    return query_frame(conn, query, {"borough": "object", "neighbour": "object"})
+
+# Get the grid shared by all precomputed ratio distributions
+def get_distribution_grid(conn):
+    """
+    Returns {'quantile_levels': [...], 'hist_edges': [...], 'kde_grid': [...]} or None if not built.
+    """
+    query = """
+    MATCH (g:DistributionGrid {name: 'people_per_business'})
+    RETURN g.quantile_levels AS quantile_levels, g.hist_edges AS hist_edges, g.kde_grid AS kde_grid
+    """
+    result = conn.query(query)
+    return result[0][0].data() if result and result[0] else None
+
+# Get precomputed people-per-business distributions
+def get_ratio_distributions(conn, business_types=None, year=None):
+    """
+    Returns a DataFrame with columns business_type, year, count, mean, quantiles, hist_counts and kde_density,
+    optionally filtered to some business types and/or a single year. The last three hold one list per row.
+    """
+    query = """
+    MATCH (d:RatioDistribution)
+    WHERE ($business_types IS NULL OR d.business_type IN $business_types)
+      AND ($year IS NULL OR d.year = $year)
+    WITH d.business_type AS business_type, d.year AS year, d.count AS count, d.mean AS mean,
+         d.quantiles AS quantiles, d.hist_counts AS hist_counts, d.kde_density AS kde_density
+    """
+    columns = {
+        "business_type": "object", "year": "int64", "count": "int64", "mean": "float64",
+        "quantiles": "object", "hist_counts": "object", "kde_density": "object",
+    }
+    return query_frame(conn, query, columns, parameters={"business_types": business_types, "year": year})
+
+# Get business survival rates of all boroughs for all years
+def get_survival_table(conn, borough_names=None):
+    """
+    Returns a DataFrame with columns borough, year, businesses_started and one_year_rate ... five_year_rate
+    for all years of all boroughs, or of the given boroughs, in one call.
+    """
+    query = """
+    MATCH (b:Borough)-[:HAS_SURVIVAL_RATE]->(s:BusinessSurvival)
+    WHERE $borough_names IS NULL OR b.name IN $borough_names
+    WITH
+        b.name AS borough,
+        s.year AS year,
+        s.births AS businesses_started,
+        s.one_year_rate AS one_year_rate,
+        s.two_year_rate AS two_year_rate,
+        s.three_year_rate AS three_year_rate,
+        s.four_year_rate AS four_year_rate,
+        s.five_year_rate AS five_year_rate
+    ORDER BY borough, year
+    """
+    return query_frame(conn, query, SURVIVAL_COLUMNS, parameters={"borough_names": borough_names})
+
+# Get the full rank profile of a borough
+def get_borough_rank_profile(conn, borough_name, metric_prefix=None, year=None):
+    """
+    Returns the precomputed rank of a borough on every metric in one call, as a DataFrame with
+    columns metric, year, value, rank, percentile and total.
+    Rank 1 is the highest value. Optionally filtered by metric prefix (e.g. 'survival:') and year.
+    """
+    query = """
+    MATCH (b:Borough {name: $borough_name})-[:HAS_RANK]->(r:BoroughRank)
+    WHERE ($metric_prefix IS NULL OR r.metric STARTS WITH $metric_prefix)
+      AND ($year IS NULL OR r.year = $year)
+    WITH r.metric AS metric, r.year AS year, r.value AS value,
+         r.rank AS rank, r.percentile AS percentile, r.total AS total
+    ORDER BY metric, year
+    """
+    columns = {"metric": "object", "year": "int64", "value": "float64", "rank": "int64", "percentile": "float64", "total": "int64"}
+    return query_frame(
+        conn,
+        query,
+        columns,
+        parameters={"borough_name": borough_name, "metric_prefix": metric_prefix, "year": year},
+    )
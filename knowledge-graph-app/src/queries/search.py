@@ -0,0 +1,57 @@
+import bisect
+import heapq
+
+import streamlit as st
+from .queries import get_graph_version, get_business_names
+
+
+class PrefixIndex:
+    """
+    Sorted list of lower-cased name suffixes starting at each word, so every name whose words
+    start with a prefix is found with two binary searches, e.g. 'man' finds 'Pret A Manger'.
+    """
+
+    def __init__(self, names, ids):
+        entries = []
+        for name, item_id in zip(names, ids):
+            lowered = name.lower()
+            starts = [0] + [i + 1 for i, c in enumerate(lowered) if c == " "]
+            entries.extend((lowered[start:], start, name, item_id) for start in set(starts))
+        entries.sort()
+        self.keys = [entry[0] for entry in entries]
+        self.entries = [entry[1:] for entry in entries]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix, limit=10):
+        """
+        Returns up to limit (name, id) pairs with a word starting with prefix.
+        Names starting with the prefix come first, then shorter names, then alphabetical.
+        """
+        prefix = " ".join(prefix.lower().split())
+        if not prefix:
+            return []
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\uffff")
+        matches = {}
+        for start, name, item_id in self.entries[lo:hi]:
+            rank = (start > 0, len(name), name)
+            if item_id not in matches or rank < matches[item_id]:
+                matches[item_id] = rank
+        ranked = heapq.nsmallest(limit, matches.items(), key=lambda item: item[1])
+        return [(rank[2], item_id) for item_id, rank in ranked]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_name_index(_conn, graph_version):
+    names = get_business_names(_conn)
+    return PrefixIndex(names["name"].tolist(), names["osm_id"].tolist())
+
+
+def load_name_index(conn):
+    """
+    Returns the prefix index over all business names, built once per graph version
+    and shared by all sessions.
+    """
+    return _load_name_index(conn, get_graph_version(conn))
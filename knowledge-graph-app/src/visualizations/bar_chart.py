@@ -1,5 +1,6 @@
 import plotly.express as px
 import pandas as pd
+import numpy as np
 import streamlit as st
 
 def plot_generic_barchart(
@@ -109,4 +110,41 @@ def plot_distribution_barchart(
     # Use the new color list to set the marker colors
     fig.update_traces(marker_color=colors)
     fig.update_layout(xaxis_tickangle=-45, bargap=0.05)
-    return fig
\ No newline at end of file
+    return fig
+
+def format_bin_edge(value):
+    return f"{value:,.0f}" if value >= 10 else f"{value:.2f}"
+
+
+def plot_precomputed_histogram(
+    edges,
+    counts,
+    item_value=None,
+    x_label="Value",
+    y_label="Count",
+    title="Distribution",
+    highlight_color="crimson",
+    bar_color="steelblue"
+):
+    """
+    Plots a vertical bar chart from precomputed histogram edges and counts.
+    Highlights the bin containing item_value if provided, found with a binary search over the edges.
+    """
+    edges = np.asarray(edges)
+    counts = np.asarray(counts)
+    bin_labels = [f"({format_bin_edge(lo)}, {format_bin_edge(hi)}]" for lo, hi in zip(edges[:-1], edges[1:])]
+
+    colors = [bar_color] * len(counts)
+    if item_value is not None and edges[0] <= item_value <= edges[-1]:
+        highlight_index = min(max(np.searchsorted(edges, item_value, side="left") - 1, 0), len(counts) - 1)
+        colors[highlight_index] = highlight_color
+
+    fig = px.bar(
+        x=bin_labels,
+        y=counts,
+        labels={"x": x_label, "y": y_label},
+        title=title
+    )
+    fig.update_traces(marker_color=colors)
+    fig.update_layout(xaxis_tickangle=-45, bargap=0.05)
+    return fig
@@ -1,9 +1,42 @@
 import plotly.graph_objects as go
-import networkx as nx
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
-import plotly.express as px
+import numpy as np
 import pandas as pd
+import streamlit as st
+from core.geography import load_boundary_layer
+
+
+@st.cache_data(show_spinner=False)
+def get_borough_positions(node_names: Tuple[str, ...]) -> Dict[str, Tuple[float, float]]:
+    """
+    Returns fixed (x, y) positions for a set of boroughs, cached across reruns and sessions.
+
+    Boroughs with a boundary polygon are placed on their centroid (British National Grid),
+    so the graph looks like London. Nodes without a polygon (e.g. Inner/Outer London)
+    get a seeded spring layout around the fixed centroids.
+    """
+    centroids = load_boundary_layer("Borough")
+    centroids = dict(zip(centroids["name"], zip(centroids.geometry.centroid.x, centroids.geometry.centroid.y)))
+
+    pos = {n: centroids[n] for n in node_names if n in centroids}
+    missing = [n for n in node_names if n not in centroids]
+    if missing:
+        import networkx as nx
+
+        G = nx.Graph()
+        G.add_nodes_from(node_names)
+        if pos:
+            # scale fixed positions to the unit square spring_layout works in
+            xy = np.array(list(pos.values()))
+            center, span = xy.mean(axis=0), np.ptp(xy, axis=0).max() or 1.0
+            init = {n: tuple((np.array(p) - center) / span) for n, p in pos.items()}
+            layout = nx.spring_layout(G, pos={**init, **{n: (0.0, 0.0) for n in missing}},
+                                      fixed=list(init), seed=42)
+            pos.update({n: tuple(np.array(layout[n]) * span + center) for n in missing})
+        else:
+            pos = {n: tuple(p) for n, p in nx.spring_layout(G, seed=42).items()}
+    return pos
 
 
 def plot_borough_business_graph(data: List[Dict[str, Any]], selected_borough: str) -> go.Figure:
@@ -13,32 +46,17 @@ def plot_borough_business_graph(data: List[Dict[str, Any]], selected_borough: st
     Node size: Proportional to population
     Node color: Business-to-population ratio per 10,000 people
     """
-    # Build graph
-    G = nx.Graph()
-    
-    # Add nodes with attributes
-    for d in data:
-        G.add_node(d['borough'], 
-                   population=d['population'], 
-                   ratio=d['business_to_population_ratio'])
-
-    # Add edges from selected borough to others
-    for d in data:
-        b = d['borough']
-        if b != selected_borough:
-            G.add_edge(selected_borough, b)
-    
-    # Improve spacing to avoid overlaps
-    k_val = 1 / (len(G.nodes) ** 0.05)  # dynamic spacing based on node count
-    pos = nx.spring_layout(G, seed=42, k=k_val)
+    df = pd.DataFrame(data)
+    pos = get_borough_positions(tuple(sorted(df["borough"])))
+    xy = np.array([pos[b] for b in df["borough"]])
+    df["x"], df["y"] = xy[:, 0], xy[:, 1]
 
-    # Edges
-    edge_x, edge_y = [], []
-    for u, v in G.edges():
-        x0, y0 = pos[u]
-        x1, y1 = pos[v]
-        edge_x += [x0, x1, None]
-        edge_y += [y0, y1, None]
+    # Edges from the selected borough to all others, as one polyline separated by None
+    others = df[df["borough"] != selected_borough]
+    sel_x, sel_y = pos.get(selected_borough, (np.nan, np.nan))
+    gaps = np.full(len(others), np.nan)
+    edge_x = np.column_stack([np.full(len(others), sel_x), others["x"], gaps]).ravel()
+    edge_y = np.column_stack([np.full(len(others), sel_y), others["y"], gaps]).ravel()
 
     edge_trace = go.Scatter(
         x=edge_x, y=edge_y,
@@ -47,39 +65,27 @@ def plot_borough_business_graph(data: List[Dict[str, Any]], selected_borough: st
         mode='lines'
     )
 
-    # Get min/max ratio for color normalization
-    ratios = [G.nodes[n]['ratio'] for n in G.nodes]
-    ratio_min, ratio_max = min(ratios), max(ratios)
-
     # Nodes
-    node_x, node_y, sizes, colors, labels, hovers = [], [], [], [], [], []
-    for node in G.nodes():
-        x, y = pos[node]
-        attr = G.nodes[node]
-        population = attr['population']
-        ratio = attr['ratio']
-        business_count = int(population * ratio)
-
-        node_x.append(x)
-        node_y.append(y)
-        sizes.append(max(2, population / 2_500))
-        colors.append(ratio)
-        labels.append(node)
-        hovers.append(
-            f"{node}<br>Population: {population:,}<br>Businesses: {business_count:,}<br>Ratio: {ratio:.3f}"
-        )
+    population = df["population"].to_numpy()
+    ratio = df["business_to_population_ratio"].to_numpy()
+    business_count = (population * ratio).astype(int)
+    sizes = np.maximum(2, population / 2_500)
+    ratio_min, ratio_max = ratio.min(), ratio.max()
 
     node_trace = go.Scatter(
-        x=node_x, y=node_y,
+        x=df["x"], y=df["y"],
         mode='markers+text',
-        text=labels,
+        text=df["borough"],
         textposition='bottom center',
-        hoverinfo='text',
-        hovertext=hovers,
+        customdata=np.column_stack([population, business_count, ratio]),
+        hovertemplate=(
+            "%{text}<br>Population: %{customdata[0]:,}<br>Businesses: %{customdata[1]:,}"
+            "<br>Ratio: %{customdata[2]:.3f}<extra></extra>"
+        ),
         marker=dict(
             showscale=True,
             colorscale='Viridis',
-            color=colors,
+            color=ratio,
             cmin=ratio_min,
             cmax=ratio_max,
             size=sizes,
@@ -111,7 +117,7 @@ def plot_borough_business_graph(data: List[Dict[str, Any]], selected_borough: st
                 x=0.005, y=-0.002
             )],
             xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, scaleanchor='x')
         )
     )
     
@@ -271,6 +277,8 @@ def plot_borough_scatter(data: List[Dict[str, Any]], selected_borough: str) -> g
 
 
 def plot_borough_bubble_chart(data):
+    import plotly.express as px
+
     df = pd.DataFrame(data)
     fig = px.scatter(
         df,
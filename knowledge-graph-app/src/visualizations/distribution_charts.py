@@ -0,0 +1,205 @@
+import plotly.graph_objects as go
+from metrics.distributions import merge_bins
+from visualizations.bar_chart import format_bin_edge
+
+
+SURVIVAL_PERIODS = [
+    ("one_year_rate", "1 Year Survival Rate"),
+    ("two_year_rate", "2 Year Survival Rate"),
+    ("three_year_rate", "3 Year Survival Rate"),
+    ("four_year_rate", "4 Year Survival Rate"),
+    ("five_year_rate", "5 Year Survival Rate")
+]
+
+
+def plot_survival_ranking(survival_df, highlight_borough, year, ranks):
+    """
+    Box plot of survival rates over all boroughs per survival period,
+    with the highlighted borough marked and ranked (1 = best).
+    ranks maps each period key to the borough's precomputed (rank, total).
+    """
+    fig = go.Figure()
+    box_width = 0.5
+    marker_size = 12
+    for period_key, period_label in SURVIVAL_PERIODS:
+        rates = survival_df[period_key].dropna()
+        if len(rates) == 0:
+            continue
+        # Boxplot for all boroughs
+        fig.add_trace(go.Box(
+            y=rates,
+            x=[period_label]*len(rates),
+            name=period_label,
+            boxpoints=False,
+            marker_color='lightblue',
+            width=box_width,
+            showlegend=False
+        ))
+        # Mark selected borough
+        if period_key in ranks and highlight_borough in survival_df['borough'].values:
+            borough_value = survival_df.loc[survival_df['borough'] == highlight_borough, period_key].values[0]
+            rank, total = ranks[period_key]
+            fig.add_trace(go.Scatter(
+                x=[period_label],
+                y=[borough_value],
+                mode='markers+text',
+                marker=dict(color='crimson', size=marker_size, symbol='diamond'),
+                text=[f"{highlight_borough}<br>Rank: {rank}/{total}"],
+                textposition="top center",
+                showlegend=False
+            ))
+    fig.update_layout(
+        yaxis_title="Survival Rate (%)",
+        xaxis_title="Survival Period",
+        title=f"Business Survival Rate Ranges and {highlight_borough} Ranking ({year})",
+        boxmode='group',
+        template='plotly_white',
+        xaxis=dict(type='category'),
+        height=500
+    )
+    return fig
+
+
+def plot_ratio_boxplot(distributions, business_types, year):
+    """
+    Box plot of the people-to-business ratio over boroughs for each business type,
+    drawn from the precomputed quantiles (whiskers span the minimum to the maximum).
+    distributions is indexed by (business_type, year) with a 'quantiles' column.
+    """
+    fig = go.Figure()
+    for b_type in business_types:
+        if (b_type, year) not in distributions.index:
+            continue
+        row = distributions.loc[(b_type, year)]
+        q_min, _, q1, median, q3, _, q_max = row["quantiles"]
+        fig.add_trace(go.Box(
+            x=[b_type],
+            q1=[q1], median=[median], q3=[q3],
+            lowerfence=[q_min], upperfence=[q_max],
+            mean=[row["mean"]],
+            name=b_type
+        ))
+    fig.update_layout(
+        title=f"Distribution of People-to-Business Ratios in {year}",
+        xaxis_title="Business Type",
+        yaxis_title="Number of People per Business",
+        showlegend=False
+    )
+    return fig
+
+
+def plot_ratio_density(grid, distributions, business_types, year):
+    """
+    Smoothed (KDE) density of the people-to-business ratio, one line per business type,
+    drawn from the curves precomputed on the shared log-spaced grid.
+    """
+    fig = go.Figure()
+    for b_type in business_types:
+        if (b_type, year) not in distributions.index:
+            continue
+        fig.add_trace(go.Scatter(
+            x=grid["kde_grid"],
+            y=distributions.loc[(b_type, year), "kde_density"],
+            mode="lines",
+            name=b_type
+        ))
+    fig.update_layout(
+        title_text='Density Plot of People-to-Business Ratios',
+        xaxis_title='People per Business Ratio (log scale)',
+        yaxis_title='Density',
+        xaxis_type='log'
+    )
+    return fig
+
+
+def plot_ratio_histogram(grid, distributions, business_types, year, n_bins):
+    """
+    Grouped histogram of the people-to-business ratio, one trace per business type.
+    The precomputed fixed-edge counts are merged into about n_bins bars.
+    """
+    available = [b for b in business_types if (b, year) in distributions.index]
+    fig = go.Figure()
+    if available:
+        counts = [distributions.loc[(b, year), "hist_counts"] for b in available]
+        edges, merged = merge_bins(grid["hist_edges"], counts, n_bins)
+        labels = [f"({format_bin_edge(lo)}, {format_bin_edge(hi)}]" for lo, hi in zip(edges[:-1], edges[1:])]
+        for b_type, type_counts in zip(available, merged):
+            fig.add_trace(go.Bar(x=labels, y=type_counts, name=b_type))
+
+    # Update layout for a grouped histogram
+    fig.update_layout(
+        barmode='group',
+        title_text='Histogram of People-to-Business Ratios',
+        xaxis_title_text='Number of People per Business',
+        yaxis_title_text='Number of Boroughs',
+        legend_title_text='Business Type',
+        xaxis_tickangle=-45
+    )
+    return fig
+
+
+def plot_survival_trend(trend, borough, reference):
+    """
+    Survival rate of every cohort year, one line per survival period, for the borough (solid)
+    and the reference area (dotted). trend comes from metrics.cohorts.survival_trend.
+    """
+    fig = go.Figure()
+    colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd"]
+    for number, ((_, period_label), color) in enumerate(zip(SURVIVAL_PERIODS, colors), start=1):
+        period = trend[trend["period"] == number]
+        if period.empty:
+            continue
+        fig.add_trace(go.Scatter(
+            x=period["year"],
+            y=period["rate"],
+            customdata=period[["difference", "change"]].to_numpy(),
+            mode="lines+markers",
+            name=period_label,
+            line=dict(color=color),
+            hovertemplate=(
+                "%{x}: %{y:.1f}%<br>"
+                f"vs {reference}: " + "%{customdata[0]:+.1f} pts<br>"
+                "vs previous year: %{customdata[1]:+.1f} pts<extra></extra>"
+            )
+        ))
+        fig.add_trace(go.Scatter(
+            x=period["year"],
+            y=period["reference_rate"],
+            mode="lines",
+            name=f"{period_label} ({reference})",
+            line=dict(color=color, dash="dot"),
+            showlegend=False,
+            hovertemplate=f"{reference} %{{x}}: %{{y:.1f}}%<extra></extra>"
+        ))
+    fig.update_layout(
+        title=f"Business Survival Rates of {borough} by Start Year (dotted: {reference})",
+        xaxis_title="Year Businesses Started",
+        yaxis_title="Survival Rate (%)",
+        template="plotly_white",
+        height=500
+    )
+    return fig
+
+
+def plot_cohort_curves(curves, borough):
+    """
+    Survival curve of every cohort of a borough: the share of businesses still active
+    0..5 years after they started, one line per start year.
+    """
+    fig = go.Figure()
+    for year, cohort in curves.groupby("year"):
+        fig.add_trace(go.Scatter(
+            x=cohort["period"],
+            y=cohort["rate"],
+            mode="lines",
+            name=str(year)
+        ))
+    fig.update_layout(
+        title=f"Survival Curves of Businesses Started in {borough}",
+        xaxis_title="Years Since Start",
+        yaxis_title="Still Active (%)",
+        legend_title_text="Start Year",
+        template="plotly_white",
+        height=500
+    )
+    return fig
@@ -0,0 +1,124 @@
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+
+# Upper bound on the total size of the serialized figures kept in memory
+MAX_FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """
+    Least-recently-used store of serialized Plotly figures, bounded by the total JSON size.
+    Shared by all sessions, so access is guarded by a lock.
+    """
+
+    def __init__(self, max_bytes=MAX_FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            fig_json = self._entries.get(key)
+            if fig_json is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fig_json
+
+    def put(self, key, fig_json):
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            self._entries[key] = fig_json
+            self.size += len(fig_json)
+            # evict least recently used figures, but always keep the newest one
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+
+def _update_values_digest(h, values):
+    """Hashes a Series or Index by value, falling back to its pickled values when pandas cannot hash them."""
+    try:
+        h.update(pd.util.hash_pandas_object(values, index=False).values.tobytes())
+    except TypeError:
+        # cells holding lists (e.g. precomputed histograms or collected columns) are not hashable by pandas
+        h.update(pickle.dumps(values.tolist()))
+
+
+def _update_digest(h, obj):
+    """Feeds a stable representation of chart inputs (frames, lists, dicts, scalars) into a hash."""
+    if isinstance(obj, pd.DataFrame):
+        h.update(repr((list(obj.columns), [str(t) for t in obj.dtypes])).encode())
+        _update_values_digest(h, obj.index)
+        for _, column in obj.items():
+            _update_values_digest(h, column)
+    elif isinstance(obj, np.ndarray):
+        h.update(repr((obj.shape, str(obj.dtype))).encode())
+        h.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else pickle.dumps(obj.tolist()))
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        h.update(repr((obj.name, str(obj.dtype))).encode())
+        _update_values_digest(h, obj)
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj, key=repr):
+            _update_digest(h, key)
+            _update_digest(h, obj[key])
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _update_digest(h, item)
+        h.update(b"]")
+    else:
+        h.update(repr(obj).encode())
+        h.update(b"|")
+
+
+def figure_key(build_fn, args, kwargs, graph_version=None):
+    """Hash of the figure builder, its inputs and chart parameters, and the graph version."""
+    h = hashlib.sha256()
+    _update_digest(h, (build_fn.__module__, build_fn.__qualname__, graph_version))
+    _update_digest(h, list(args))
+    _update_digest(h, kwargs)
+    return h.hexdigest()
+
+
+def cached_figure(build_fn, *args, graph_version=None, **kwargs):
+    """
+    Returns build_fn(*args, **kwargs), reusing the stored figure JSON when the same
+    builder was called with the same inputs on the same graph version before.
+    A fresh Figure is returned every time, so callers can still update its layout.
+    """
+    cache = get_figure_cache()
+    key = figure_key(build_fn, args, kwargs, graph_version)
+    fig_json = cache.get(key)
+    if fig_json is None:
+        fig = build_fn(*args, **kwargs)
+        if fig is None:
+            return None
+        fig_json = fig.to_json()
+        cache.put(key, fig_json)
+    return pio.from_json(fig_json)
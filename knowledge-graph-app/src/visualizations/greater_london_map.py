@@ -1,23 +1,22 @@
-import folium
-from queries.queries import (
-    get_population_for_boroughs, 
-    get_business_count_for_boroughs
-)
+from metrics.metrics import ratio_table
+from metrics.loaders import load_metrics
 
 # Computes business per people metric
 def compute_ratio_dataframe(conn, gdf, business_type, year):
     gdf = gdf.rename(columns={"NAME": "borough"})
 
-    gdf["population"] = gdf["borough"].map(get_population_for_boroughs(conn, gdf["borough"], year))
-    gdf["business_count"] = gdf["borough"].map(get_business_count_for_boroughs(conn, gdf["borough"], business_type))
-    gdf["business_count"].replace(0, None, inplace=True)
-
-    gdf["people_per_business"] = (gdf["population"]/ gdf["business_count"]).round(3)
+    _, metrics = load_metrics(conn)
+    ratios = ratio_table(metrics, business_type, year, gdf["borough"]).set_index("borough")
+    gdf["population"] = gdf["borough"].map(ratios["population"])
+    gdf["business_count"] = gdf["borough"].map(ratios["business_count"].replace(0, None))
+    gdf["people_per_business"] = gdf["borough"].map(ratios["people_per_business"]).round(3)
     return gdf
 
 
 # Computes the geovisualization (e.g. the polygons for boroughs)
 def plot_interactive_map(gdf, business_type, year):
+    import folium
+
     gdf = gdf.to_crs(4326)                    
     gdf = gdf.dropna(subset=["people_per_business"])
     m = folium.Map(location=[51.509865, -0.118092], zoom_start=10)
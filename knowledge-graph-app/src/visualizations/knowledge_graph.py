@@ -1,99 +1,239 @@
-import networkx as nx
-from pyvis.network import Network
+import math
+import streamlit as st
 import streamlit.components.v1 as components
-import tempfile
 
 
-def show_graph_view(records):
+# Leaf nodes sharing the same neighbour and label are collapsed
+# into a single aggregate node once a group grows beyond this size.
+AGGREGATE_THRESHOLD = 25
 
-    def safe_label(entity):
-        return str(entity.get("name") or entity.get("id") or repr(entity))
+# Scale from networkx layout coordinates to vis.js canvas pixels
+LAYOUT_SCALE = 1000
 
-    def format_tooltip(entity):
-        return "\n".join([f"{k}: {v}" for k, v in entity.items()])
 
-    def get_node_color(entity):
-        if entity.get("type"):
-            return "#97C2FC"  # Borough color
-        else:
-            return "#32BF49"
+def safe_label(entity):
+    return str(entity.get("name") or entity.get("id") or entity.get("type") or repr(entity))
 
-    G = nx.DiGraph()
 
-    for record in records:
-        source = record["source"]
-        target = record["target"]
-        relation = record["relation"]
-
-        source_label = safe_label(source)
-        target_label = safe_label(target)
-
-        # Improved tooltip formatting
-        source_tooltip = format_tooltip(source)
-        target_tooltip = format_tooltip(target)
-
-        G.add_node(source_label, label=source_label, title=source_tooltip, color=get_node_color(source))
-        G.add_node(target_label, label=target_label, title=target_tooltip, color=get_node_color(target))
-        G.add_edge(source_label, target_label, title=relation, label=relation, arrows="to", font={"size": 14, "color": "white", "face": "arial", "strokeWidth": 0, "bold": False})
-
-    net = Network(height="600px", width="100%", bgcolor="#222222", font_color="white")
-    net.from_nx(G)
-    net.repulsion(node_distance=120, spring_length=200)
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".html", mode="w", encoding="utf-8") as tmp_file:
-        net.save_graph(tmp_file.name)
-
-        # Read, patch styles, and embed
-        with open(tmp_file.name, 'r', encoding='utf-8') as f:
-            html = f.read()
-
-        # … after saving `net.save_graph(tmp_file.name)` and reading it into `html` …
-        style_patch = """
-        <style>
-        html, body {
-            margin: 0 !important;
-            padding: 0 !important;
-            background-color: #222222 !important;
-            height: 100%;
-            width: 100%;
-        }
+def format_tooltip(entity):
+    return "\n".join([f"{k}: {v}" for k, v in entity.items()])
+
+
+def get_node_color(entity):
+    if entity.get("type"):
+        return "#97C2FC"  # Borough color
+    else:
+        return "#32BF49"
 
-        #mynetwork,
-        #mynetwork > div {
-            width: 100% !important;
-            height: 600px !important;
-            margin: 0 !important;
-            padding: 0 !important;
-            border: none !important;
-            outline: none !important;
-            box-shadow: none !important;
-            background-color: #222222 !important;
+
+def to_plain_rows(records):
+    """
+    Converts source/relation/target records into plain, hashable-by-pickle rows
+    so that layouts can be cached per result set.
+    """
+    def plain_node(entity):
+        props = dict(entity.items())
+        labels = sorted(getattr(entity, "labels", []))
+        return {
+            "id": getattr(entity, "element_id", None) or safe_label(props),
+            "label": safe_label(props),
+            "group": labels[0] if labels else "",
+            "title": format_tooltip(props),
+            "color": get_node_color(props),
         }
 
-        #mynetwork canvas {
-            display: block !important;
-            width: 100% !important;
-            height: 600px !important;
-            margin: 0 !important;
-            padding: 0 !important;
-            border: none !important;
-            outline: none !important;
-            background-color: #222222 !important;
+    return [
+        (plain_node(record["source"]), record["relation"], plain_node(record["target"]))
+        for record in records
+    ]
+
+
+def find_aggregate_groups(rows, threshold=AGGREGATE_THRESHOLD):
+    """
+    Groups leaf nodes by (neighbour, label). A leaf has a single distinct neighbour in the rows,
+    however many relationships join them (e.g. OF_TYPE and TYPE_FOR between a Business and its BusinessType).
+    Returns {group_id: {"hub": ..., "relation": ..., "group": ..., "members": {...}}}
+    for every group larger than the threshold, relation naming all relationship types to the hub.
+    """
+    neighbours = {}
+    for source, _, target in rows:
+        if source["id"] != target["id"]:
+            neighbours.setdefault(source["id"], set()).add(target["id"])
+            neighbours.setdefault(target["id"], set()).add(source["id"])
+
+    groups = {}
+    for source, relation, target in rows:
+        for leaf, hub in ((source, target), (target, source)):
+            if len(neighbours.get(leaf["id"], ())) != 1 or len(neighbours[hub["id"]]) == 1:
+                continue
+            group_id = f"agg:{hub['id']}:{leaf['group']}"
+            group = groups.setdefault(group_id, {
+                "hub": hub, "relations": set(), "group": leaf["group"], "members": {}
+            })
+            group["relations"].add(relation)
+            group["members"][leaf["id"]] = leaf
+    return {
+        gid: {"hub": g["hub"], "relation": "/".join(sorted(g["relations"])), "group": g["group"], "members": g["members"]}
+        for gid, g in groups.items()
+        if len(g["members"]) > threshold
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def build_graph_view(rows, expanded=()):
+    """
+    Builds the (collapsed) graph and computes its layout once per result set.
+    Aggregate nodes listed in `expanded` are replaced by their members,
+    which are placed on a ring around the aggregate's position.
+    Returns (nodes, edges, groups) as plain dicts ready for vis.js.
+    """
+    groups = find_aggregate_groups(rows)
+    member_of = {
+        member_id: gid
+        for gid, group in groups.items()
+        for member_id in group["members"]
+    }
+
+    import networkx as nx
+
+    G = nx.DiGraph()
+    for source, relation, target in rows:
+        source_id = member_of.get(source["id"], source["id"])
+        target_id = member_of.get(target["id"], target["id"])
+        for node_id, node in ((source_id, source), (target_id, target)):
+            if node_id in groups:
+                group = groups[node_id]
+                G.add_node(node_id, label=f"{len(group['members'])} {group['group']}",
+                           title=f"{len(group['members'])} {group['group']} nodes ({group['relation']})",
+                           color="#F0A30A", shape="box")
+            else:
+                G.add_node(node_id, label=node["label"], title=node["title"], color=node["color"])
+        G.add_edge(source_id, target_id)
+
+    # The layout is computed on the collapsed graph, which stays small however many leaves there are
+    pos = nx.spring_layout(G, seed=42) if len(G) > 1 else {n: (0.0, 0.0) for n in G}
+
+    nodes = []
+    for node_id, attrs in G.nodes(data=True):
+        x, y = pos[node_id]
+        if node_id in groups and node_id in expanded:
+            members = list(groups[node_id]["members"].values())
+            radius = 0.05 * math.sqrt(len(members))
+            for i, member in enumerate(members):
+                angle = 2 * math.pi * i / len(members)
+                nodes.append({
+                    "id": member["id"], "label": member["label"], "title": member["title"],
+                    "color": member["color"],
+                    "x": (x + radius * math.cos(angle)) * LAYOUT_SCALE,
+                    "y": (y + radius * math.sin(angle)) * LAYOUT_SCALE,
+                })
+        else:
+            nodes.append({"id": node_id, **attrs, "x": x * LAYOUT_SCALE, "y": y * LAYOUT_SCALE})
+
+    # edges are taken from the rows, so members of expanded groups keep their own relationships
+    edges = []
+    seen = set()
+    for source, relation, target in rows:
+        endpoints = []
+        for node in (source, target):
+            group_id = member_of.get(node["id"])
+            endpoints.append(group_id if group_id is not None and group_id not in expanded else node["id"])
+        edge = (*endpoints, relation)
+        if edge not in seen:
+            seen.add(edge)
+            edges.append({"source": endpoints[0], "target": endpoints[1], "label": relation, "title": relation})
+
+    group_labels = {
+        gid: f"{len(g['members'])} {g['group']} via {g['relation']} ({g['hub']['label']})"
+        for gid, g in groups.items()
+    }
+    return nodes, edges, group_labels
+
+
+def render_graph_html(nodes, edges):
+    """
+    Renders the positioned graph to an HTML string in memory, with physics disabled
+    so the browser only draws the precomputed layout.
+    """
+    from pyvis.network import Network
+
+    net = Network(height="600px", width="100%", bgcolor="#222222", font_color="white", directed=True)
+    for node in nodes:
+        node_id = node["id"]
+        attrs = {k: v for k, v in node.items() if k != "id"}
+        net.add_node(node_id, **attrs)
+    for edge in edges:
+        net.add_edge(
+            edge["source"], edge["target"], title=edge["title"], label=edge["label"],
+            font={"size": 14, "color": "white", "face": "arial", "strokeWidth": 0, "bold": False}
+        )
+    net.toggle_physics(False)
+    return net.generate_html()
+
+
+def show_graph_view(rows):
+    """
+    Displays source/relation/target rows (see to_plain_rows) as an interactive graph.
+    Large groups of leaf nodes are shown as aggregate nodes that can be expanded below the graph.
+    """
+    _, _, group_labels = build_graph_view(rows)
+    expanded = ()
+    if group_labels:
+        selected = st.multiselect(
+            "Expand aggregated nodes:",
+            options=list(group_labels.keys()),
+            format_func=lambda gid: group_labels[gid],
+        )
+        expanded = tuple(sorted(selected))
+
+    nodes, edges, _ = build_graph_view(rows, expanded)
+    html = render_graph_html(nodes, edges)
+
+    style_patch = """
+    <style>
+    html, body {
+        margin: 0 !important;
+        padding: 0 !important;
+        background-color: #222222 !important;
+        height: 100%;
+        width: 100%;
+    }
+
+    #mynetwork,
+    #mynetwork > div {
+        width: 100% !important;
+        height: 600px !important;
+        margin: 0 !important;
+        padding: 0 !important;
+        border: none !important;
+        outline: none !important;
+        box-shadow: none !important;
+        background-color: #222222 !important;
+    }
+
+    #mynetwork canvas {
+        display: block !important;
+        width: 100% !important;
+        height: 600px !important;
+        margin: 0 !important;
+        padding: 0 !important;
+        border: none !important;
+        outline: none !important;
+        background-color: #222222 !important;
+    }
+    </style>
+
+    <script>
+    window.addEventListener("load", () => {
+        const container = document.getElementById("mynetwork");
+        if (container && container.network) {
+        container.network.fit();
         }
-        </style>
-
-        <script>
-        window.addEventListener("load", () => {
-            const container = document.getElementById("mynetwork");
-            if (container && container.network) {
-            container.network.fit();
-            }
-        });
-        </script>
-        """
-        patched_html = html.replace("</head>", style_patch + "</head>")
-
-        # Finally embed with exactly 620px total height (600px for the canvas + 20px margin if you want a hair’s‐breadth),
-        # and turn off scrolling so no extra white shows up:
-        components.html(patched_html, height=620, scrolling=False)
-        
\ No newline at end of file
+    });
+    </script>
+    """
+    patched_html = html.replace("</head>", style_patch + "</head>")
+
+    # Embed with exactly 620px total height (600px for the canvas + 20px margin),
+    # and turn off scrolling so no extra white shows up:
+    components.html(patched_html, height=620, scrolling=False)
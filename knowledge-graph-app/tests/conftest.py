@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app imports its packages relative to src/, as streamlit run and build_graph.py do
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
@@ -0,0 +1,43 @@
+import geopandas as gpd
+import shapely
+
+from core.adjacency import compute_adjacency
+
+
+def grid(size=100.0, gap=0.0):
+    """3 x 3 squares named 'r<row>c<col>', gap metres apart."""
+    cells = [(r, c) for r in range(3) for c in range(3)]
+    return gpd.GeoDataFrame({
+        "code": [f"r{r}c{c}" for r, c in cells],
+        "geometry": [
+            shapely.box(c * (size + gap), r * (size + gap), c * (size + gap) + size, r * (size + gap) + size)
+            for r, c in cells
+        ],
+    }, crs="EPSG:27700")
+
+
+def pairs(df):
+    return set(zip(df["area1"], df["area2"]))
+
+
+def test_areas_sharing_an_edge_are_neighbours_but_corners_are_not():
+    result = pairs(compute_adjacency(grid(), "code"))
+    assert len(result) == 12
+    assert ("r0c0", "r0c1") in result and ("r0c0", "r1c0") in result
+    assert ("r0c0", "r1c1") not in result
+
+
+def test_exact_touching_also_counts_corners():
+    result = pairs(compute_adjacency(grid(), "code", tolerance=0, min_shared_length=0))
+    assert len(result) == 20 and ("r0c0", "r1c1") in result
+
+
+def test_gaps_within_the_tolerance_are_bridged():
+    assert len(compute_adjacency(grid(gap=0.05), "code", tolerance=0.1)) == 12
+    assert len(compute_adjacency(grid(gap=0.5), "code", tolerance=0.1)) == 0
+
+
+def test_pairs_are_unordered_and_unique_across_chunks():
+    df = compute_adjacency(grid(), "code", chunk_size=3, workers=2)
+    assert (df["area1"] < df["area2"]).all()
+    assert len(df) == len(pairs(df)) == 12
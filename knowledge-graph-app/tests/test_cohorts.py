@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from metrics.cohorts import survival_cube, survival_trend, year_over_year_changes
+from metrics.ranks import SURVIVAL_RATE_COLUMNS
+
+
+def survival(rows):
+    """rows of (borough, year, one year rate); the longer periods are the one year rate minus 10, 20, ..."""
+    return pd.DataFrame([
+        {"borough": borough, "year": year, "businesses_started": 100,
+         **{column: rate - 10 * i for i, column in enumerate(SURVIVAL_RATE_COLUMNS)}}
+        for borough, year, rate in rows
+    ])
+
+
+def test_cube_is_dense_and_sorted():
+    cube = survival_cube(survival([("Merton", 2016, 90.0), ("Camden", 2015, 80.0)]))
+    assert cube["boroughs"].tolist() == ["Camden", "Merton"]
+    assert cube["years"].tolist() == [2015, 2016]
+    assert cube["rates"][0, 0, 0] == 80.0 and np.isnan(cube["rates"][0, 1, 0])
+    assert cube["rates"][1, 1, 4] == 50.0
+
+
+def test_year_over_year_changes_skip_gaps_between_years():
+    cube = survival_cube(survival([
+        ("Merton", 2014, 90.0), ("Merton", 2015, 92.0), ("Merton", 2017, 85.0), ("Merton", 2018, 80.0),
+    ]))
+    changes = year_over_year_changes(cube)[0, :, 0]
+    # 2017 follows 2015, two years earlier, so it has no year-over-year change
+    assert np.isnan(changes[0]) and changes[1] == 2.0 and np.isnan(changes[2]) and changes[3] == -5.0
+
+
+def test_year_over_year_changes_need_the_previous_year_of_the_same_borough():
+    cube = survival_cube(survival([
+        ("Camden", 2015, 80.0), ("Camden", 2016, 81.0), ("Camden", 2017, 83.0),
+        ("Merton", 2015, 90.0), ("Merton", 2017, 85.0),
+    ]))
+    changes = year_over_year_changes(cube)[:, :, 0]
+    assert changes[0, 1:].tolist() == [1.0, 2.0]
+    assert np.isnan(changes[1]).all()
+
+
+def test_survival_trend_compares_with_the_reference_area():
+    cube = survival_cube(survival([
+        ("Merton", 2015, 90.0), ("Merton", 2016, 94.0),
+        ("Greater London", 2015, 85.0), ("Greater London", 2016, 88.0),
+    ]))
+    trend = survival_trend(cube, "Merton")
+    one_year = trend[trend["period"] == 1].set_index("year")
+    assert one_year["difference"].tolist() == [5.0, 6.0]
+    assert one_year["reference_rate"].tolist() == [85.0, 88.0]
+    assert np.isnan(one_year.loc[2015, "change"]) and one_year.loc[2016, "change"] == 4.0
+    assert survival_trend(cube, "Nowhere").empty
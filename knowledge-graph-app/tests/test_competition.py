@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from core.competition import count_neighbours, set_competition_radii
+from core import competition
+
+
+def brute_force(x, y, types, radii):
+    distance = np.hypot(x[:, None] - x[None, :], y[:, None] - y[None, :])
+    np.fill_diagonal(distance, np.inf)
+    same = types[:, None] == types[None, :]
+    return (
+        {r: ((distance <= r) & same).sum(axis=1) for r in radii},
+        {r: (distance <= r).sum(axis=1) for r in radii},
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [7, 1_000])
+def test_count_neighbours_matches_brute_force(chunk_size):
+    rng = np.random.default_rng(1)
+    # a dense cluster and scattered points, on whole metres so some pairs are exactly one radius apart
+    x = np.concatenate([rng.integers(0, 300, 150), rng.integers(-3000, 3000, 150)]).astype(float)
+    y = np.concatenate([rng.integers(0, 300, 150), rng.integers(-2000, 2000, 150)]).astype(float)
+    types = rng.choice(["cafe", "pub", "atm"], len(x))
+    radii = [50, 250, 1000]
+
+    same_type, any_type = count_neighbours(x, y, types, radii, chunk_size=chunk_size)
+    expected_same, expected_any = brute_force(x, y, types, radii)
+    for r in radii:
+        np.testing.assert_array_equal(same_type[r], expected_same[r])
+        np.testing.assert_array_equal(any_type[r], expected_any[r])
+
+
+def test_count_neighbours_counts_points_on_the_radius_and_duplicates():
+    x = np.array([0.0, 500.0, 500.0, 1001.0])
+    y = np.zeros(4)
+    types = np.array(["a", "a", "b", "a"])
+    same_type, any_type = count_neighbours(x, y, types, [500])
+    assert any_type[500].tolist() == [2, 2, 2, 0]
+    assert same_type[500].tolist() == [1, 1, 0, 0]
+
+
+def test_count_neighbours_without_points():
+    same_type, any_type = count_neighbours([], [], [], [250])
+    assert len(same_type[250]) == 0 and len(any_type[250]) == 0
+
+
+def test_set_competition_radii_sorts_and_validates(monkeypatch):
+    monkeypatch.setattr(competition, "COMPETITION_RADII", competition.COMPETITION_RADII)
+    set_competition_radii([1000, 250, 250.0])
+    assert competition.COMPETITION_RADII == [250, 1000]
+    with pytest.raises(ValueError):
+        set_competition_radii([0, 100])
@@ -0,0 +1,25 @@
+import numpy as np
+
+from metrics.distributions import merge_bins
+
+
+def test_merge_bins_trims_empty_ends_and_keeps_the_total():
+    edges = np.arange(11.0)
+    counts = [0, 0, 1, 2, 3, 4, 5, 6, 0, 0]
+    merged_edges, merged = merge_bins(edges, counts, 3)
+    assert merged_edges.tolist() == [2.0, 4.0, 6.0, 8.0]
+    assert merged.tolist() == [[3, 7, 11]]
+
+
+def test_merge_bins_merges_every_row_on_the_same_edges():
+    edges = np.arange(5.0)
+    counts = np.array([[1, 1, 1, 1], [0, 2, 0, 2]])
+    merged_edges, merged = merge_bins(edges, counts, 2)
+    assert merged_edges.tolist() == [0.0, 2.0, 4.0]
+    assert merged.tolist() == [[2, 2], [2, 2]]
+
+
+def test_merge_bins_never_makes_more_bins_than_there_are():
+    merged_edges, merged = merge_bins(np.arange(4.0), [1, 2, 3], 10)
+    assert merged_edges.tolist() == [0.0, 1.0, 2.0, 3.0]
+    assert merged.tolist() == [[1, 2, 3]]
@@ -0,0 +1,44 @@
+import pandas as pd
+
+from visualizations.figure_cache import FigureCache, figure_key
+
+
+def test_least_recently_used_figures_are_evicted_first():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"
+    cache.put("c", "cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == "aaaa" and cache.get("c") == "cccc"
+    assert cache.size == 8
+
+
+def test_the_newest_figure_is_kept_even_when_it_is_too_large():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", "aaaa")
+    cache.put("big", "x" * 20)
+    assert cache.get("a") is None and cache.get("big") == "x" * 20
+    assert cache.size == 20
+
+
+def test_replacing_a_figure_counts_its_size_once():
+    cache = FigureCache(max_bytes=100)
+    cache.put("a", "aaaa")
+    cache.put("a", "aa")
+    assert cache.size == 2 and cache.hits == 0
+    cache.clear()
+    assert cache.size == 0 and cache.get("a") is None and cache.misses == 1
+
+
+def plot(df, title=""):
+    return None
+
+
+def test_figure_keys_depend_on_data_parameters_and_graph_version():
+    df = pd.DataFrame({"borough": ["Merton"], "value": [1.0]})
+    key = figure_key(plot, (df,), {"title": "x"}, graph_version="v1")
+    assert key == figure_key(plot, (df.copy(),), {"title": "x"}, graph_version="v1")
+    assert key != figure_key(plot, (df.assign(value=2.0),), {"title": "x"}, graph_version="v1")
+    assert key != figure_key(plot, (df,), {"title": "y"}, graph_version="v1")
+    assert key != figure_key(plot, (df,), {"title": "x"}, graph_version="v2")
@@ -0,0 +1,62 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics.graph_analytics import (
+    colocation_lift, eigenvector_centrality, location_quotients, network_metrics, sampled_closeness
+)
+
+
+def counts():
+    return pd.DataFrame({
+        "borough": ["A", "A", "B", "B"],
+        "business_type": ["atm", "cafe", "atm", "pub"],
+        "business_count": [2, 2, 1, 3],
+    })
+
+
+def test_location_quotient_is_the_share_in_the_area_over_the_share_overall():
+    lq = location_quotients(counts()).set_index(["borough", "business_type"])["location_quotient"]
+    # atm: 2 of 4 businesses in A, 3 of 8 overall
+    assert lq["A", "atm"] == pytest.approx((2 / 4) / (3 / 8))
+    assert lq["B", "pub"] == pytest.approx((3 / 4) / (3 / 8))
+
+
+def test_lift_matches_its_definition_and_is_symmetric():
+    types, lift = colocation_lift(counts())
+    i = {t: k for k, t in enumerate(types)}
+    # N * sum_area(c[area, a] * c[area, b] / n[area]) / (c[a] * c[b])
+    assert lift[i["atm"], i["cafe"]] == pytest.approx(8 * (2 * 2 / 4) / (3 * 2))
+    assert lift[i["cafe"], i["pub"]] == 0
+    np.testing.assert_allclose(lift, lift.T)
+
+
+def test_eigenvector_centrality_matches_the_dense_leading_eigenvector():
+    graph = nx.relabel_nodes(nx.karate_club_graph(), str)
+    nodes = list(graph)
+    dense = np.abs(np.linalg.eigh(nx.to_numpy_array(graph, nodelist=nodes, weight=None))[1][:, -1])
+    np.testing.assert_allclose(eigenvector_centrality(graph, nodes), dense, atol=1e-6)
+
+
+def test_sampled_closeness_is_exact_on_small_graphs():
+    graph = nx.path_graph(10)
+    assert sampled_closeness(graph, sample_size=10) == pytest.approx(nx.closeness_centrality(graph))
+
+
+def test_sampled_closeness_estimates_closeness_with_several_components():
+    graph = nx.disjoint_union(nx.grid_2d_graph(20, 20), nx.path_graph(3))
+    exact = nx.closeness_centrality(graph)
+    estimate = sampled_closeness(graph, sample_size=100)
+    assert estimate.keys() == exact.keys()
+    for node, value in exact.items():
+        assert estimate[node] == pytest.approx(value, rel=0.1)
+
+
+def test_network_metrics_on_a_path():
+    pairs = pd.DataFrame({"area": ["a", "b", "b", "c"], "neighbour": ["b", "a", "c", "b"]})
+    metrics = network_metrics(pairs).set_index("area")
+    assert metrics["degree"].to_dict() == {"a": 1, "b": 2, "c": 1}
+    assert metrics.loc["b", "betweenness"] == 1.0
+    assert metrics.loc["b", "closeness"] == 1.0 and metrics.loc["a", "closeness"] == pytest.approx(2 / 3)
+    assert metrics.loc["b", "eigenvector"] > metrics.loc["a", "eigenvector"]
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import pytest
+
+from queries.guard import (
+    QueryRejected, guard_query, limit_count, strip_comments, top_limit, unbounded_cartesian_products
+)
+
+
+def op(name, children=(), **arguments):
+    return {"operatorType": f"{name}@neo4j", "arguments": arguments, "children": list(children)}
+
+
+SCAN = op("AllNodesScan")
+
+
+class ExplainConnection:
+    """Answers EXPLAIN with the given plans in order and records the queries it was sent."""
+
+    def __init__(self, *plans, query_type="r"):
+        self.plans = list(plans)
+        self.query_type = query_type
+        self.queries = []
+
+    def read_query(self, query, parameters=None, timeout=None):
+        self.queries.append(query)
+        return [], SimpleNamespace(query_type=self.query_type, plan=self.plans.pop(0)), []
+
+
+def test_top_limit_follows_the_single_child_chain():
+    limit = op("Limit", [op("Expand", [SCAN])], Details="10")
+    assert top_limit(op("ProduceResults", [op("Projection", [limit])])) is limit
+    assert top_limit(op("ProduceResults", [op("Expand", [SCAN])])) is None
+
+
+def test_top_limit_stops_at_eager_operators():
+    plan = op("ProduceResults", [op("EagerAggregation", [op("Limit", [SCAN], Details="10")])])
+    assert top_limit(plan) is None
+
+
+def test_limit_count_reads_only_plain_numbers():
+    assert limit_count(op("Limit", Details="100")) == 100
+    assert limit_count(op("Top", Details="n.name ASC LIMIT 20")) == 20
+    assert limit_count(op("Limit", Details="$n")) is None
+    assert limit_count(op("Limit", Details="10 * 1000")) is None
+    assert limit_count(None) is None
+
+
+def test_cartesian_product_bounded_by_limit_above_it():
+    product = op("CartesianProduct", [SCAN, SCAN])
+    assert unbounded_cartesian_products(op("ProduceResults", [op("Limit", [product], Details="5")])) == []
+    assert unbounded_cartesian_products(op("ProduceResults", [product])) == [product]
+
+
+def test_eager_operator_between_limit_and_cartesian_product_unbounds_it():
+    product = op("CartesianProduct", [SCAN, SCAN])
+    plan = op("ProduceResults", [op("Limit", [op("Sort", [product])], Details="5")])
+    assert unbounded_cartesian_products(plan) == [product]
+
+
+def test_strip_comments_keeps_strings_and_quoted_names():
+    query = "MATCH (n) WHERE n.url = 'http://x' /* block */ RETURN n.`a//b` AS x // trailing"
+    assert strip_comments(query) == "MATCH (n) WHERE n.url = 'http://x'   RETURN n.`a//b` AS x "
+    assert strip_comments("RETURN 'it\\'s // here' AS s") == "RETURN 'it\\'s // here' AS s"
+
+
+def test_guard_wraps_queries_without_a_fixed_limit():
+    conn = ExplainConnection(
+        op("ProduceResults", [op("Limit", [SCAN], Details="$n")]),
+        op("ProduceResults", [op("Limit", [SCAN], Details="500")]),
+    )
+    query, notes = guard_query(conn, "MATCH (n) RETURN n LIMIT $n // all", row_limit=500)
+    assert query == "CALL {\nMATCH (n) RETURN n LIMIT $n\n}\nRETURN * LIMIT 500"
+    assert len(notes) == 1
+
+
+def test_guard_keeps_a_small_literal_limit():
+    conn = ExplainConnection(op("ProduceResults", [op("Limit", [SCAN], Details="10")]))
+    assert guard_query(conn, "MATCH (n) RETURN n LIMIT 10;") == ("MATCH (n) RETURN n LIMIT 10", [])
+
+
+@pytest.mark.parametrize("plan, query_type", [
+    (op("ProduceResults", [op("Limit", [SCAN], Details="10000")]), "r"),
+    (op("ProduceResults", [op("CartesianProduct", [SCAN, SCAN], EstimatedRows=1e6)]), "r"),
+    (op("ProduceResults"), "w"),
+])
+def test_guard_rejects(plan, query_type):
+    with pytest.raises(QueryRejected):
+        guard_query(ExplainConnection(plan, query_type=query_type), "MATCH (n) RETURN n", row_limit=500)
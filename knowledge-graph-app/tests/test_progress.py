@@ -0,0 +1,28 @@
+from core.progress import report_progress, reporting_to
+
+
+def test_reporting_to_restores_logging_after_the_block():
+    messages = []
+    with reporting_to(messages.append):
+        report_progress("inside")
+    report_progress("outside")
+    assert messages == ["inside"]
+
+
+def test_reporting_to_restores_logging_when_the_build_fails():
+    messages = []
+    try:
+        with reporting_to(messages.append):
+            raise RuntimeError("stage failed")
+    except RuntimeError:
+        pass
+    report_progress("after")
+    assert messages == []
+
+
+def test_reporting_to_none_keeps_the_outer_callback():
+    outer = []
+    with reporting_to(outer.append):
+        with reporting_to(None):
+            report_progress("nested")
+    assert outer == ["nested"]
@@ -0,0 +1,53 @@
+import pandas as pd
+from neo4j import Result
+
+from connect import Neo4jConnection
+from queries.queries import query_frame
+
+
+class FrameConnection:
+    """Returns a fixed DataFrame, as the driver's Result.to_df would, and keeps the query."""
+
+    def __init__(self, df):
+        self.df = df
+        self.queries = []
+
+    def query_df(self, query, parameters=None, db=None):
+        self.queries.append(query)
+        return self.df
+
+
+def test_query_frame_returns_the_columns_in_order_with_their_dtypes():
+    conn = FrameConnection(pd.DataFrame([[2020, "Camden", 1.5]], columns=["year", "borough", "value"]))
+    df = query_frame(conn, "MATCH (n) WITH n.borough AS borough, n.year AS year, n.value AS value",
+                     {"borough": "object", "year": "int64", "value": "float64"})
+    assert list(df.columns) == ["borough", "year", "value"]
+    assert df.dtypes.astype(str).tolist() == ["object", "int64", "float64"]
+    assert conn.queries[0].strip().endswith("RETURN `borough`, `year`, `value`")
+
+
+def test_query_frame_keeps_integer_columns_with_nulls_as_integers():
+    conn = FrameConnection(pd.DataFrame([["a", 1], ["b", None]], columns=["name", "rank"]))
+    df = query_frame(conn, "WITH 1 AS name, 2 AS rank", {"name": "object", "rank": "int64"})
+    assert str(df["rank"].dtype) == "Int64"
+    assert df["rank"].tolist()[0] == 1 and pd.isna(df["rank"].tolist()[1])
+
+
+def test_query_frame_returns_an_empty_typed_frame_when_the_query_fails():
+    df = query_frame(FrameConnection(None), "WITH 1 AS year", {"year": "int64"})
+    assert df.empty and list(df.columns) == ["year"] and str(df["year"].dtype) == "int64"
+
+
+def test_query_df_lets_the_driver_build_the_frame():
+    calls = []
+
+    class Driver:
+        def execute_query(self, query, parameters, **kwargs):
+            calls.append(kwargs)
+            return pd.DataFrame()
+
+    conn = Neo4jConnection.__new__(Neo4jConnection)
+    conn._Neo4jConnection__driver = Driver()
+    conn.database = "neo4j"
+    conn.query_df("RETURN 1 AS x")
+    assert calls == [{"database_": "neo4j", "result_transformer_": Result.to_df}]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics.metrics import add_ranks
+from metrics.ranks import compute_rank_table
+
+
+def frame():
+    return pd.DataFrame({
+        "group": ["a", "a", "a", "a", "b", "b"],
+        "value": [10.0, 30.0, 30.0, np.nan, 5.0, 1.0],
+    })
+
+
+def test_descending_ranks_put_the_highest_value_first():
+    df = add_ranks(frame(), "value", ["group"], ascending=False)
+    assert df["rank"].tolist()[:3] == [2, 1, 1]
+    assert df["percentile"].tolist()[:3] == pytest.approx([100 / 3, 100.0, 100.0])
+    assert df["total"].tolist() == [3, 3, 3, 3, 2, 2]
+
+
+def test_ascending_ranks_put_the_smallest_value_first():
+    df = add_ranks(frame(), "value", ["group"], ascending=True)
+    assert df["rank"].tolist()[4:] == [2, 1]
+    # rank 1 always has percentile 100, whatever the direction
+    assert df["percentile"].tolist()[4:] == [50.0, 100.0]
+
+
+def test_rows_without_a_value_get_no_rank():
+    df = add_ranks(frame(), "value", ["group"], ascending=False)
+    assert pd.isna(df.loc[3, "rank"]) and pd.isna(df.loc[3, "percentile"])
+
+
+def test_rank_table_ranks_each_metric_and_year_separately():
+    population = pd.DataFrame({
+        "borough": ["Camden", "Camden", "Merton", "Merton", "Inner London", "Inner London"],
+        "year": [2019, 2020, 2019, 2020, 2019, 2020],
+        "population": [100.0, 110.0, 100.0, 105.0, 1000.0, 2000.0],
+    })
+    survival = pd.DataFrame({
+        "borough": ["Camden", "Merton"], "year": [2020, 2020],
+        "one_year_rate": [90.0, 95.0], "two_year_rate": [80.0, 70.0], "three_year_rate": [np.nan, 60.0],
+        "four_year_rate": [50.0, 50.0], "five_year_rate": [40.0, 45.0],
+    })
+    ratios = pd.DataFrame({
+        "borough": ["Camden", "Merton"], "business_type": ["atm", "atm"], "year": [2020, 2020],
+        "people_per_business": [20.0, 10.0],
+    })
+    ranks = compute_rank_table(population, survival, ratios).set_index(["metric", "borough"])["rank"]
+    # aggregate boroughs are not ranked, population growth only exists from the second year
+    assert set(ranks.index.get_level_values("borough")) == {"Camden", "Merton"}
+    assert ranks["population_growth"].to_dict() == {"Camden": 1, "Merton": 2}
+    assert ranks["survival:one_year_rate"].to_dict() == {"Camden": 2, "Merton": 1}
+    assert ranks["survival:three_year_rate"].to_dict() == {"Merton": 1}
+    assert ranks["survival:four_year_rate"].to_dict() == {"Camden": 1, "Merton": 1}
+    assert ranks["people_per_business:atm"].to_dict() == {"Camden": 1, "Merton": 2}
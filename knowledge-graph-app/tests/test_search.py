@@ -0,0 +1,28 @@
+from queries.search import PrefixIndex
+
+
+def index():
+    names = ["Pret A Manger", "Manhattan Cafe", "Man Cave", "Mango", "The Mango Tree", "Costa Coffee", "Mango"]
+    return PrefixIndex(names, [1, 2, 3, 4, 5, 6, 7])
+
+
+def test_names_starting_with_the_prefix_come_first_then_shorter_then_alphabetical():
+    assert index().search("man") == [
+        ("Mango", 4), ("Mango", 7), ("Man Cave", 3), ("Manhattan Cafe", 2), ("Pret A Manger", 1), ("The Mango Tree", 5)
+    ]
+
+
+def test_prefix_matches_any_word_and_ignores_case_and_spacing():
+    assert index().search("  MANGO   tr") == [("The Mango Tree", 5)]
+    assert index().search("coffee") == [("Costa Coffee", 6)]
+
+
+def test_a_name_matching_on_several_words_is_returned_once():
+    index = PrefixIndex(["Man Man Burgers"], [1])
+    assert index.search("man") == [("Man Man Burgers", 1)]
+
+
+def test_search_respects_the_limit_and_empty_prefixes():
+    assert len(index().search("m", limit=2)) == 2
+    assert index().search("   ") == []
+    assert index().search("zzz") == []